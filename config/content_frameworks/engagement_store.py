@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Engagement Store - Columnar store over the Airtable influencer post exports
+Normalizes the post tables in airtable_data/ into typed column files plus a
+string table per text column, so analysis jobs read only the columns they need
+instead of parsing every export and walking nested `fields` dicts.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("engagement_store")
+
+STORE_VERSION = 1
+DEFAULT_SOURCE_DIR = Path(__file__).parent / "airtable_data"
+DEFAULT_STORE_DIR = DEFAULT_SOURCE_DIR / ".cache" / "engagement_store"
+
+# The same tables were exported from several Airtable bases
+EXPORT_PREFIXES = ("influencers_db_", "influencers_posts_", "linkedin_posts_")
+
+# Export table (file stem without base prefix) -> how its fields map onto columns
+POST_SOURCES = {
+    "imported_table": {
+        "platform": "x",
+        "content": "Content",
+        "creator": "Screen Name",
+        "url": "URL",
+        "created": "Created At",
+        "views": ["Views Count"],
+        "likes": ["Favorite Count"],
+        "comments": ["Reply Count"],
+        "shares": ["Retweet Count", "Quote Count"],
+        "bookmarks": ["Bookmark Count"]
+    },
+    "table_1": {
+        "platform": "linkedin",
+        "content": "LinkedIn post",
+        "creator": "Creator",
+        "url": "LinkedIn post url",
+        "created": "Date",
+        "likes": ["Likes"],
+        "comments": ["Comments"]
+    },
+    "1.templates_trigger_taplio_-_100_i_-_linkedin_posts": {
+        "platform": "linkedin",
+        "content": "LI Template",
+        "creator": "author",
+        "url": "Post Link",
+        "created": "Post Date"
+    }
+}
+
+# Column name -> array typecode; 'I' columns are indexes into that column's string table
+COLUMNS = {
+    "platform": "I",
+    "creator": "I",
+    "content": "I",
+    "url": "I",
+    "source": "I",
+    "created_at": "q",
+    "views": "q",
+    "likes": "q",
+    "comments": "q",
+    "shares": "q",
+    "bookmarks": "q"
+}
+STRING_COLUMNS = [name for name, typecode in COLUMNS.items() if typecode == "I"]
+METRICS = ["views", "likes", "comments", "shares", "bookmarks"]
+
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%dT%H:%M:%S.%fZ"]
+LINKEDIN_PROFILE = re.compile(r"linkedin\.com/in/([^/?#]+)")
+
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(float(str(value).replace(",", "")))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_timestamp(value: Any) -> int:
+    """Parse epoch seconds or one of the export date formats; 0 if unknown"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    value = str(value or "").strip()
+    if value.isdigit():
+        return int(value)
+    for fmt in DATE_FORMATS:
+        try:
+            return int(datetime.strptime(value, fmt).timestamp())
+        except ValueError:
+            continue
+    return 0
+
+
+def _normalize_creator(value: Any) -> str:
+    value = str(value or "").strip()
+    match = LINKEDIN_PROFILE.search(value)
+    return match.group(1) if match else value
+
+
+def _post_key(platform: str, url: str, content: str) -> str:
+    """Natural key used to deduplicate posts exported into several bases"""
+    if url:
+        return f"{platform}|{url.rstrip('/')}"
+    return f"{platform}|" + hashlib.md5(content.strip().encode()).hexdigest()
+
+
+def _source_table(stem: str) -> Optional[str]:
+    for prefix in EXPORT_PREFIXES:
+        if stem.startswith(prefix):
+            table = stem[len(prefix):]
+            return table if table in POST_SOURCES else None
+    return None
+
+
+def ingest(source_dir: Path = DEFAULT_SOURCE_DIR, store_dir: Path = DEFAULT_STORE_DIR) -> Dict:
+    """
+    Normalize the Airtable post exports into the columnar store
+
+    Posts that appear in more than one export are stored once, keeping the
+    copy with the highest total engagement.
+
+    Returns:
+        Store metadata (row count, sources, columns)
+    """
+    source_dir, store_dir = Path(source_dir), Path(store_dir)
+    posts = {}
+    sources = {}
+
+    for export_file in sorted(source_dir.glob("*.json")):
+        table = _source_table(export_file.stem)
+        if not table:
+            continue
+
+        mapping = POST_SOURCES[table]
+        with open(export_file, 'r') as f:
+            records = json.load(f)
+
+        stat = export_file.stat()
+        sources[export_file.name] = {"mtime": stat.st_mtime, "size": stat.st_size}
+
+        for record in records:
+            fields = record.get("fields", {})
+            content = str(fields.get(mapping["content"]) or "")
+            if not content:
+                continue
+
+            url = str(fields.get(mapping["url"]) or "")
+            row = {
+                "platform": mapping["platform"],
+                "creator": _normalize_creator(fields.get(mapping["creator"])),
+                "content": content,
+                "url": url,
+                "source": export_file.stem,
+                "created_at": _to_timestamp(fields.get(mapping["created"]))
+            }
+            for metric in METRICS:
+                row[metric] = sum(_to_int(fields.get(name)) for name in mapping.get(metric, []))
+
+            key = _post_key(row["platform"], url, content)
+            existing = posts.get(key)
+            if existing is None or _engagement(row) > _engagement(existing):
+                posts[key] = row
+
+    rows = list(posts.values())
+    strings = {name: [] for name in STRING_COLUMNS}
+    string_ids = {name: {} for name in STRING_COLUMNS}
+    columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+
+    for row in rows:
+        for name in STRING_COLUMNS:
+            value, ids = row[name], string_ids[name]
+            if value not in ids:
+                ids[value] = len(strings[name])
+                strings[name].append(value)
+            columns[name].append(ids[value])
+        for name in COLUMNS:
+            if name not in STRING_COLUMNS:
+                columns[name].append(row[name])
+
+    store_dir.mkdir(parents=True, exist_ok=True)
+    for name, column in columns.items():
+        with open(store_dir / f"{name}.col", 'wb') as f:
+            column.tofile(f)
+    for name, table in strings.items():
+        with open(store_dir / f"{name}.strings.json", 'w') as f:
+            json.dump(table, f)
+
+    meta = {
+        "version": STORE_VERSION,
+        "rows": len(rows),
+        "columns": COLUMNS,
+        "sources": sources,
+        "ingested_at": datetime.now().isoformat()
+    }
+    with open(store_dir / "meta.json", 'w') as f:
+        json.dump(meta, f, indent=2)
+
+    logger.info(f"Ingested {len(rows)} unique posts from {len(sources)} exports into {store_dir}")
+    return meta
+
+
+def _engagement(row: Dict) -> int:
+    return row["likes"] + row["comments"] + row["shares"] + row["bookmarks"]
+
+
+class EngagementStore:
+    """Read-only view over the columnar store; columns load on first use"""
+
+    def __init__(self, store_dir: Path = DEFAULT_STORE_DIR):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / "meta.json", 'r') as f:
+            self.meta = json.load(f)
+        self.rows = self.meta["rows"]
+        self._columns = {}
+        self._strings = {}
+        self._string_ids = {}
+
+    @classmethod
+    def open(cls, source_dir: Path = DEFAULT_SOURCE_DIR,
+             store_dir: Path = DEFAULT_STORE_DIR) -> "EngagementStore":
+        """Open the store, re-ingesting first if any export changed"""
+        if cls.is_stale(source_dir, store_dir):
+            ingest(source_dir, store_dir)
+        return cls(store_dir)
+
+    @staticmethod
+    def is_stale(source_dir: Path = DEFAULT_SOURCE_DIR, store_dir: Path = DEFAULT_STORE_DIR) -> bool:
+        meta_file = Path(store_dir) / "meta.json"
+        if not meta_file.exists():
+            return True
+        with open(meta_file, 'r') as f:
+            meta = json.load(f)
+        if meta.get("version") != STORE_VERSION:
+            return True
+
+        current = {}
+        for export_file in Path(source_dir).glob("*.json"):
+            if _source_table(export_file.stem):
+                stat = export_file.stat()
+                current[export_file.name] = {"mtime": stat.st_mtime, "size": stat.st_size}
+        return current != meta.get("sources")
+
+    def column(self, name: str) -> array:
+        """Load a single column from disk"""
+        if name not in self._columns:
+            column = array(COLUMNS[name])
+            with open(self.store_dir / f"{name}.col", 'rb') as f:
+                column.fromfile(f, self.rows)
+            self._columns[name] = column
+        return self._columns[name]
+
+    def strings(self, column: str) -> List[str]:
+        """Load the string table for a text column"""
+        if column not in self._strings:
+            with open(self.store_dir / f"{column}.strings.json", 'r') as f:
+                self._strings[column] = json.load(f)
+        return self._strings[column]
+
+    def string_value(self, column: str, row: int) -> str:
+        return self.strings(column)[self.column(column)[row]]
+
+    def engagement(self) -> List[int]:
+        """Per-row total engagement (likes + comments + shares + bookmarks)"""
+        likes, comments = self.column("likes"), self.column("comments")
+        shares, bookmarks = self.column("shares"), self.column("bookmarks")
+        return [likes[i] + comments[i] + shares[i] + bookmarks[i] for i in range(self.rows)]
+
+    def engagement_rate(self) -> List[float]:
+        """Per-row engagement / views; 0.0 where views were not exported"""
+        views = self.column("views")
+        return [e / views[i] if views[i] else 0.0 for i, e in enumerate(self.engagement())]
+
+    def metric(self, name: str) -> Any:
+        """Per-row values of 'engagement', 'engagement_rate' or a numeric column"""
+        if name == "engagement":
+            return self.engagement()
+        if name == "engagement_rate":
+            return self.engagement_rate()
+        return self.column(name)
+
+    def where(self, platform: Optional[str] = None, creator: Optional[str] = None,
+              since: Optional[datetime] = None, min_views: int = 0) -> List[int]:
+        """Row ids matching all the given filters"""
+        rows = range(self.rows)
+        if platform is not None:
+            rows = self._match_string("platform", platform, rows)
+        if creator is not None:
+            rows = self._match_string("creator", creator, rows)
+        if since is not None:
+            created = self.column("created_at")
+            cutoff = int(since.timestamp())
+            rows = [i for i in rows if created[i] >= cutoff]
+        if min_views:
+            views = self.column("views")
+            rows = [i for i in rows if views[i] >= min_views]
+        return list(rows)
+
+    def _match_string(self, column: str, value: str, rows) -> List[int]:
+        if column not in self._string_ids:
+            self._string_ids[column] = {v: i for i, v in enumerate(self.strings(column))}
+        string_id = self._string_ids[column].get(value)
+        if string_id is None:
+            return []
+        values = self.column(column)
+        return [i for i in rows if values[i] == string_id]
+
+    def top_n(self, n: int = 10, metric: str = "engagement", rows: Optional[List[int]] = None,
+              per_creator: bool = False) -> Any:
+        """
+        Top-N posts by a metric
+
+        Args:
+            n: Number of posts to return (per creator when per_creator is set)
+            metric: 'engagement', 'engagement_rate' or a numeric column name
+            rows: Optional row ids from where() to restrict the ranking
+            per_creator: Return {creator: [posts]} instead of a flat list
+        """
+        scores = self.metric(metric)
+        ranked = sorted(range(self.rows) if rows is None else rows,
+                        key=lambda i: scores[i], reverse=True)
+
+        if not per_creator:
+            return [self.post(i, **{metric: scores[i]}) for i in ranked[:n]]
+
+        creators, names = self.column("creator"), self.strings("creator")
+        grouped = {}
+        for i in ranked:
+            posts = grouped.setdefault(names[creators[i]], [])
+            if len(posts) < n:
+                posts.append(self.post(i, **{metric: scores[i]}))
+        return grouped
+
+    def aggregate_by_creator(self, metric: str = "engagement") -> Dict[str, Dict]:
+        """Post count, total and mean of a metric per creator (same metrics as top_n)"""
+        scores = self.metric(metric)
+        creators, names = self.column("creator"), self.strings("creator")
+        totals = {}
+        for i in range(self.rows):
+            stats = totals.setdefault(creators[i], [0, 0])
+            stats[0] += 1
+            stats[1] += scores[i]
+        return {
+            names[creator]: {"posts": count, "total": total, "mean": total / count}
+            for creator, (count, total) in totals.items()
+        }
+
+    def post(self, row: int, **extra) -> Dict:
+        """Materialize one row as a dictionary"""
+        post = {name: self.string_value(name, row) for name in STRING_COLUMNS}
+        post.update({name: self.column(name)[row] for name in ["created_at"] + METRICS})
+        post.update(extra)
+        return post
+
+
+def main():
+    """CLI interface for the engagement store"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Airtable Engagement Store")
+    parser.add_argument("command", choices=["ingest", "top"], help="Command to execute")
+    parser.add_argument("--metric", default="engagement", help="Ranking metric for 'top'")
+    parser.add_argument("--platform", help="Filter by platform (x, linkedin)")
+    parser.add_argument("-n", type=int, default=5, help="Posts per creator for 'top'")
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        meta = ingest()
+        print(f"\n✅ Stored {meta['rows']} posts from {len(meta['sources'])} exports")
+        return
+
+    store = EngagementStore.open()
+    rows = store.where(platform=args.platform) if args.platform else None
+    top = store.top_n(args.n, metric=args.metric, rows=rows, per_creator=True)
+
+    print(f"\n🏆 Top {args.n} posts per creator by {args.metric}:\n")
+    for creator, posts in top.items():
+        print(f"✨ {creator}")
+        for post in posts:
+            print(f"   {post[args.metric]:>10.4g}  {post['content'][:70].replace(chr(10), ' ')}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,16 +4,425 @@ Framework Manager - Loads and manages content generation frameworks
 Supports local files and Google Drive sync
 """
 
+import atexit
+import fcntl
 import json
 import random
+import re
+import sys
+import weakref
+from collections import deque
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.json_snapshot import load_json
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("framework_manager")
 
+INDEX_VERSION = 1
+CACHE_DIRNAME = ".cache"
+INDEX_FILENAME = "framework_index.json"
+SELECTION_STATE_FILENAME = "hook_selection_state.json"
+SELECTION_STATE_VERSION = 2
+
+# About the median engagement rate of the Airtable post exports; a hook
+# performing at this rate earns the same reward as an untried one's prior
+BASELINE_ENGAGEMENT_RATE = 0.01
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{([^{}]+)\}")
+
+
+class CompiledTemplate:
+    """
+    A template parsed once into literal and slot segments
+
+    Rendering is a single join over the segments. Slots without a value are
+    left as their original `{placeholder}` and reported as missing.
+    """
+
+    __slots__ = ("source", "literals", "slots")
+
+    def __init__(self, source: str):
+        self.source = source
+        # re.split with one group alternates literal, slot, literal, ... literal
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self.literals = parts[0::2]
+        self.slots = parts[1::2]
+
+    def render(self, variables: Dict[str, Any]) -> Tuple[str, List[str]]:
+        """Fill the template, returning (text, missing variable names)"""
+        out = [self.literals[0]]
+        missing = []
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            if slot in variables:
+                out.append(str(variables[slot]))
+            else:
+                out.append("{" + slot + "}")
+                missing.append(slot)
+            out.append(literal)
+        return "".join(out), missing
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a template string, caching the compiled form"""
+    return CompiledTemplate(source)
+
+
+class LazyFrameworks(Mapping):
+    """Framework name -> framework body, parsed from disk on first access"""
+
+    def __init__(self, files: Dict[str, Path]):
+        self._files = files
+        self._loaded = {}
+
+    def __getitem__(self, name: str) -> Dict:
+        if name not in self._loaded:
+            self._loaded[name] = load_json(self._files[name])
+            logger.debug(f"Loaded framework body: {name}")
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self._files)
+
+    def __len__(self):
+        return len(self._files)
+
+    def __contains__(self, name) -> bool:
+        return name in self._files
+
+
+class FrameworkIndex:
+    """
+    Persistent index over the framework JSON files
+
+    Stores category -> frameworks, platform -> frameworks and
+    hook_type -> templates maps. Each source file is keyed on its mtime and
+    size, so only new or changed files are re-parsed when the index is stale.
+    """
+
+    ALL_PLATFORMS = "*"
+
+    def __init__(self, frameworks_dir: Path, index_file: Optional[Path] = None):
+        self.frameworks_dir = Path(frameworks_dir)
+        self.index_file = index_file or self.frameworks_dir / CACHE_DIRNAME / INDEX_FILENAME
+        self.data = {}
+
+    def load(self) -> Dict:
+        """Load the persisted index, refreshing entries for changed files"""
+        cached = self._read_index()
+        cached_files = cached.get("files", {})
+
+        files = {}
+        changed = False
+        for framework_file in sorted(self.frameworks_dir.glob("*.json")):
+            stat = framework_file.stat()
+            entry = cached_files.get(framework_file.name)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                files[framework_file.name] = entry
+                continue
+
+            files[framework_file.name] = self._index_file(framework_file, stat)
+            changed = True
+
+        if changed or set(files) != set(cached_files) or "categories" not in cached:
+            self.data = self._build(files)
+            self._write_index()
+        else:
+            self.data = cached
+
+        return self.data
+
+    def _index_file(self, framework_file: Path, stat) -> Dict:
+        """Parse one framework file and extract its index entry"""
+        entry = {"mtime": stat.st_mtime, "size": stat.st_size, "framework_name": None}
+        try:
+            framework_data = load_json(framework_file)
+            applies_to = framework_data.get("applies_to", {})
+            entry.update({
+                "framework_name": framework_data.get("framework_name", framework_file.stem),
+                "description": framework_data.get("description", ""),
+                "type": framework_data.get("framework_type", ""),
+                "categories": applies_to.get("categories", []),
+                "platforms": applies_to.get("platforms", []),
+                "hook_types": {
+                    hook_type: info.get("templates", [])
+                    for hook_type, info in framework_data.get("hook_types", {}).items()
+                }
+            })
+            logger.info(f"Indexed framework: {entry['framework_name']}")
+        except Exception as e:
+            logger.error(f"Error loading {framework_file}: {e}")
+        return entry
+
+    def _build(self, files: Dict[str, Dict]) -> Dict:
+        """Build the lookup maps from per-file entries"""
+        frameworks = {}
+        for filename, entry in files.items():
+            if entry.get("framework_name"):
+                # Later files win on duplicate names, matching glob load order
+                frameworks[entry["framework_name"]] = filename
+
+        categories, platforms, hook_types = {}, {}, {}
+        for name, filename in frameworks.items():
+            entry = files[filename]
+            for category in entry["categories"]:
+                categories.setdefault(category, []).append(name)
+            for platform in entry["platforms"] or [self.ALL_PLATFORMS]:
+                platforms.setdefault(platform, []).append(name)
+            for hook_type, templates in entry["hook_types"].items():
+                hook_types.setdefault(hook_type, {})[name] = templates
+
+        return {
+            "version": INDEX_VERSION,
+            "files": files,
+            "frameworks": frameworks,
+            "categories": categories,
+            "platforms": platforms,
+            "hook_types": hook_types
+        }
+
+    def _read_index(self) -> Dict:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, 'r') as f:
+                cached = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable framework index {self.index_file}: {e}")
+            return {}
+        return cached if cached.get("version") == INDEX_VERSION else {}
+
+    def _write_index(self):
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.index_file.with_suffix(".tmp")
+            with open(tmp_file, 'w') as f:
+                json.dump(self.data, f)
+            tmp_file.replace(self.index_file)
+        except OSError as e:
+            logger.warning(f"Could not persist framework index: {e}")
+
+    def entry(self, framework_name: str) -> Dict:
+        return self.data["files"][self.data["frameworks"][framework_name]]
+
+
+class WeightTree:
+    """Fenwick tree over candidate weights: O(log n) updates and weighted draws"""
+
+    def __init__(self, weights: List[float]):
+        self.size = len(weights)
+        self.weights = [0.0] * self.size
+        self.tree = [0.0] * (self.size + 1)
+        for i, weight in enumerate(weights):
+            self.update(i, weight)
+
+    def update(self, i: int, weight: float):
+        delta = weight - self.weights[i]
+        self.weights[i] = weight
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def total(self) -> float:
+        total, i = 0.0, self.size
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, target: float) -> int:
+        """Index of the candidate whose cumulative weight range contains target"""
+        pos, step = 0, 1 << self.size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.size - 1)
+
+
+# Selectors with unsaved draws; weak, so discarded managers are not kept alive until exit
+_live_selectors = weakref.WeakSet()
+
+
+@atexit.register
+def _save_live_selectors():
+    for selector in list(_live_selectors):
+        selector.save()
+
+
+class HookSelector:
+    """
+    Scored hook template selection
+
+    Candidates are (framework, hook_type, template) triples, grouped into a
+    table per framework/category/hook_type. Each candidate is weighted by a
+    Beta-style mean of the engagement rewards it has received. A reward is
+    the engagement rate scaled against a baseline rate, rate / (rate +
+    baseline): a hook at the baseline scores like an untried one (0.5),
+    better hooks score above it and weaker ones below. Candidates
+    in the recency ring buffer are weighted to zero until they age out, so a
+    draw never repeats a recent template while an alternative exists.
+    Stats and the ring buffer are persisted between runs: feedback is saved
+    as soon as it is recorded, and draws since the last save are written by a
+    single exit hook for every selector still alive at shutdown. A save
+    re-reads the state file under a lock and adds only this selector's new
+    feedback, so selectors sharing the file never drop each other's stats;
+    the recency buffer is last-writer-wins.
+    """
+
+    PRIOR_REWARD = 1.0
+    PRIOR_PULLS = 2.0
+
+    def __init__(self, state_file: Path, recency_size: int = 20, rng: Optional[random.Random] = None,
+                 baseline_rate: float = BASELINE_ENGAGEMENT_RATE):
+        self.state_file = Path(state_file)
+        self.baseline_rate = baseline_rate
+        self.rng = rng or random.Random()
+        self.tables = {}       # table key -> (candidate keys, WeightTree)
+        self.positions = {}    # candidate key -> [(table key, position)]
+        self.stats = {}        # candidate key -> [feedback count, reward sum]
+        self.unsaved = {}      # feedback not yet merged into the state file
+        self.recent = deque(maxlen=recency_size)
+        self.recent_counts = {}
+        self.dirty = False
+        self._load_state()
+        _live_selectors.add(self)
+
+    @staticmethod
+    def candidate_key(framework_name: str, hook_type: str, template: Dict) -> str:
+        return f"{framework_name}|{hook_type}|{template.get('pattern', '')}"
+
+    def score(self, key: str) -> float:
+        pulls, reward = self.stats.get(key, (0, 0.0))
+        return (reward + self.PRIOR_REWARD) / (pulls + self.PRIOR_PULLS)
+
+    def _weight(self, key: str) -> float:
+        return 0.0 if self.recent_counts.get(key) else self.score(key)
+
+    def table(self, table_key: tuple, candidates: List[str]):
+        """Get or build the candidate table for a framework/category/hook_type"""
+        if table_key not in self.tables:
+            tree = WeightTree([self._weight(key) for key in candidates])
+            self.tables[table_key] = (candidates, tree)
+            for i, key in enumerate(candidates):
+                self.positions.setdefault(key, []).append((table_key, i))
+        return self.tables[table_key]
+
+    def draw(self, table_key: tuple) -> Optional[str]:
+        """Draw a candidate from a table, proportional to its weight"""
+        candidates, tree = self.tables[table_key]
+        if not candidates:
+            return None
+
+        total = tree.total()
+        if total > 1e-12:
+            key = candidates[tree.find(self.rng.random() * total)]
+        else:
+            # Every candidate was used recently: reuse the least recently used
+            in_table = set(candidates)
+            by_recency = list(dict.fromkeys(k for k in reversed(self.recent) if k in in_table))
+            key = by_recency[-1] if by_recency else candidates[0]
+
+        self._mark_used(key)
+        return key
+
+    def _mark_used(self, key: str):
+        if self.recent.maxlen and len(self.recent) == self.recent.maxlen:
+            evicted = self.recent[0]
+            self.recent_counts[evicted] -= 1
+            self._refresh(evicted)
+        self.recent.append(key)
+        self.recent_counts[key] = self.recent_counts.get(key, 0) + 1
+        self._refresh(key)
+        self.dirty = True
+
+    def _refresh(self, key: str):
+        weight = self._weight(key)
+        for table_key, i in self.positions.get(key, []):
+            self.tables[table_key][1].update(i, weight)
+
+    def reward(self, engagement_rate: float) -> float:
+        """Engagement rate scaled against the baseline rate, in [0, 1)"""
+        rate = max(float(engagement_rate), 0.0)
+        return rate / (rate + self.baseline_rate)
+
+    def record_feedback(self, key: str, engagement_rate: float):
+        """
+        Update a candidate's score from engagement feedback
+
+        Args:
+            key: Candidate key returned with the selected template
+            engagement_rate: Observed engagement rate (e.g. 0.02 for 2%)
+        """
+        reward = self.reward(engagement_rate)
+        for stats in (self.stats, self.unsaved):
+            pulls, total = stats.get(key, (0, 0.0))
+            stats[key] = [pulls + 1, total + reward]
+        self._refresh(key)
+        self.dirty = True
+        self.save()
+
+    def _read_state(self) -> Dict:
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable hook selection state {self.state_file}: {e}")
+            return {}
+
+    @staticmethod
+    def _stats_of(state: Dict) -> Dict:
+        # Earlier versions summed raw engagement rates, which are not comparable
+        return state.get("stats", {}) if state.get("version") == SELECTION_STATE_VERSION else {}
+
+    def _load_state(self):
+        state = self._read_state()
+        self.stats = self._stats_of(state)
+        for key in state.get("recent", [])[-self.recent.maxlen:] if self.recent.maxlen else []:
+            self.recent.append(key)
+            self.recent_counts[key] = self.recent_counts.get(key, 0) + 1
+
+    def save(self):
+        """Merge new feedback into the state file and write the recency buffer"""
+        if not self.dirty:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file.with_suffix(".lock"), 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                # Other selectors may have saved since this one loaded
+                stats = self._stats_of(self._read_state())
+                for key, (pulls, total) in self.unsaved.items():
+                    saved_pulls, saved_total = stats.get(key, (0, 0.0))
+                    stats[key] = [saved_pulls + pulls, saved_total + total]
+
+                tmp_file = self.state_file.with_suffix(".tmp")
+                with open(tmp_file, 'w') as f:
+                    json.dump({"version": SELECTION_STATE_VERSION, "stats": stats, "recent": list(self.recent)}, f)
+                tmp_file.replace(self.state_file)
+
+            changed = [key for key in set(stats) | set(self.stats) if stats.get(key) != self.stats.get(key)]
+            self.stats = stats
+            for key in changed:
+                self._refresh(key)
+            self.unsaved = {}
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Could not persist hook selection state: {e}")
+
 
 class FrameworkManager:
     """Manages content generation frameworks from local and Google Drive sources"""
@@ -29,27 +438,27 @@ class FrameworkManager:
             frameworks_dir = Path(__file__).parent
 
         self.frameworks_dir = Path(frameworks_dir)
-        self.frameworks = {}
+        self.index = FrameworkIndex(self.frameworks_dir)
+        self.frameworks = LazyFrameworks({})
+        self._hook_search = None
+        self._candidates = {}  # selection table key -> {candidate key: (hook_type, template)}
+        self.hook_selector = HookSelector(self.frameworks_dir / CACHE_DIRNAME / SELECTION_STATE_FILENAME)
         self.gdrive_folder_id = None  # Set this for Google Drive sync
 
         # Load all local frameworks
         self.load_local_frameworks()
 
     def load_local_frameworks(self):
-        """Load all JSON frameworks from the local directory"""
+        """Index all JSON frameworks in the local directory; bodies load on first use"""
         logger.info(f"Loading frameworks from {self.frameworks_dir}")
 
-        for framework_file in self.frameworks_dir.glob("*.json"):
-            try:
-                with open(framework_file, 'r') as f:
-                    framework_data = json.load(f)
-                    framework_name = framework_data.get("framework_name", framework_file.stem)
-                    self.frameworks[framework_name] = framework_data
-                    logger.info(f"Loaded framework: {framework_name}")
-            except Exception as e:
-                logger.error(f"Error loading {framework_file}: {e}")
+        index = self.index.load()
+        self.frameworks = LazyFrameworks({
+            name: self.frameworks_dir / filename
+            for name, filename in index["frameworks"].items()
+        })
 
-        logger.info(f"Total frameworks loaded: {len(self.frameworks)}")
+        logger.info(f"Total frameworks indexed: {len(self.frameworks)}")
 
     def get_applicable_frameworks(self, category: str, platform: str = None) -> List[Dict]:
         """
@@ -62,25 +471,43 @@ class FrameworkManager:
         Returns:
             List of applicable framework dictionaries
         """
-        applicable = []
+        names = self.index.data["categories"].get(category, [])
 
-        for framework_name, framework in self.frameworks.items():
-            applies_to = framework.get("applies_to", {})
+        if platform:
+            platforms = self.index.data["platforms"]
+            allowed = set(platforms.get(platform, [])) | set(platforms.get(FrameworkIndex.ALL_PLATFORMS, []))
+            names = [name for name in names if name in allowed]
 
-            # Check category match
-            categories = applies_to.get("categories", [])
-            if category not in categories:
-                continue
+        return [self.frameworks[name] for name in names]
 
-            # Check platform match (if specified)
-            if platform:
-                platforms = applies_to.get("platforms", [])
-                if platforms and platform not in platforms:
-                    continue
+    def search_hooks(self, query: str, k: int = 5, sources: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Find the proven hooks most similar to a query (e.g. an RSS idea title)
+
+        Uses the on-disk BM25 index from hook_search, built on first use and
+        refreshed per corpus when a source file changes.
+
+        Args:
+            query: Free text to match against hooks and high-performing posts
+            k: Number of hooks to return
+            sources: Optional subset of hook_search.HOOK_SOURCES to search
 
-            applicable.append(framework)
+        Returns:
+            List of hook dictionaries ranked by BM25 score
+        """
+        if self._hook_search is None:
+            from hook_search import HookSearchIndex
+            self._hook_search = HookSearchIndex(self.frameworks_dir)
+        return self._hook_search.search(query, k, sources)
+
+    def get_hook_templates(self, hook_type: str) -> Dict[str, List[Dict]]:
+        """
+        Get templates for a hook type across all frameworks, without loading bodies
 
-        return applicable
+        Returns:
+            Dictionary of framework name -> list of templates
+        """
+        return self.index.data["hook_types"].get(hook_type, {})
 
     def select_hook_template(self,
                             framework_name: str,
@@ -89,6 +516,10 @@ class FrameworkManager:
         """
         Select the best hook template based on category and context
 
+        Context triggers pick the hook type; the template is then drawn by
+        HookSelector, weighted by engagement feedback and skipping recently
+        used templates.
+
         Args:
             framework_name: Name of the framework to use
             category: Content category
@@ -118,30 +549,48 @@ class FrameworkManager:
                 selected_hook_type = hook_type
                 break
 
-        # If no specific trigger, randomly choose from preferred hooks
-        if not selected_hook_type:
-            selected_hook_type = random.choice(preferred_hooks) if preferred_hooks else None
-
-        if not selected_hook_type or selected_hook_type not in hook_types_data:
-            return None
-
-        # Get templates for the selected hook type
-        hook_type_info = hook_types_data[selected_hook_type]
-        templates = hook_type_info.get("templates", [])
+        if selected_hook_type:
+            if selected_hook_type not in hook_types_data:
+                return None
+            hook_types = [selected_hook_type]
+        else:
+            # No specific trigger: score across every preferred hook's templates
+            hook_types = [h for h in preferred_hooks if h in hook_types_data]
+
+        table_key = (framework_name, category, selected_hook_type)
+        if table_key not in self.hook_selector.tables:
+            self._candidates[table_key] = {
+                self.hook_selector.candidate_key(framework_name, hook_type, template): (hook_type, template)
+                for hook_type in hook_types
+                for template in hook_types_data[hook_type].get("templates", [])
+            }
+            self.hook_selector.table(table_key, list(self._candidates[table_key]))
 
-        if not templates:
+        candidate_key = self.hook_selector.draw(table_key)
+        if not candidate_key:
             return None
 
-        # Randomly select a template
-        template = random.choice(templates)
+        hook_type, template = self._candidates[table_key][candidate_key]
+        hook_type_info = hook_types_data[hook_type]
 
         return {
-            "hook_type": selected_hook_type,
+            "hook_type": hook_type,
             "template": template,
+            "template_key": candidate_key,
             "power_words": hook_type_info.get("power_words", []),
             "description": hook_type_info.get("description", "")
         }
 
+    def record_hook_feedback(self, template_key: str, engagement_rate: float):
+        """
+        Feed engagement results back into hook selection
+
+        Args:
+            template_key: 'template_key' from select_hook_template / generate_hook
+            engagement_rate: Observed engagement rate (e.g. 0.02 for 2%)
+        """
+        self.hook_selector.record_feedback(template_key, engagement_rate)
+
     def generate_hook(self,
                      framework_name: str,
                      category: str,
@@ -157,7 +606,9 @@ class FrameworkManager:
             variables: Variables to fill in the template
 
         Returns:
-            Dictionary with 'title', 'description', 'hook_type' or None
+            Dictionary with 'title', 'description', 'hook_type', 'template_key'
+            (for record_hook_feedback) and 'missing_variables' (placeholders
+            left unfilled), or None
         """
         # Select appropriate template
         hook_data = self.select_hook_template(framework_name, category, context)
@@ -168,26 +619,19 @@ class FrameworkManager:
         template = hook_data["template"]
         hook_type = hook_data["hook_type"]
 
-        # Fill in the title template
-        title_pattern = template.get("pattern", "")
-        title = title_pattern
-        for var_name, var_value in variables.items():
-            placeholder = f"{{{var_name}}}"
-            if placeholder in title:
-                title = title.replace(placeholder, str(var_value))
-
-        # Fill in the description template
-        desc_pattern = template.get("description_pattern", "")
-        description = desc_pattern
-        for var_name, var_value in variables.items():
-            placeholder = f"{{{var_name}}}"
-            if placeholder in description:
-                description = description.replace(placeholder, str(var_value))
+        title, missing_title = compile_template(template.get("pattern", "")).render(variables)
+        description, missing_desc = compile_template(template.get("description_pattern", "")).render(variables)
+
+        missing = sorted(set(missing_title) | set(missing_desc))
+        if missing:
+            logger.warning(f"Hook template '{hook_type}' missing variables: {', '.join(missing)}")
 
         return {
             "title": title,
             "description": description,
-            "hook_type": hook_type
+            "hook_type": hook_type,
+            "template_key": hook_data["template_key"],
+            "missing_variables": missing
         }
 
     def sync_from_gdrive(self):
@@ -204,15 +648,16 @@ class FrameworkManager:
         return False
 
     def list_frameworks(self) -> Dict[str, Any]:
-        """Get summary of all loaded frameworks"""
+        """Get summary of all indexed frameworks"""
         summary = {}
-        for name, framework in self.frameworks.items():
+        for name in self.frameworks:
+            entry = self.index.entry(name)
             summary[name] = {
-                "description": framework.get("description", ""),
-                "type": framework.get("framework_type", ""),
-                "categories": framework.get("applies_to", {}).get("categories", []),
-                "platforms": framework.get("applies_to", {}).get("platforms", []),
-                "hook_types": list(framework.get("hook_types", {}).keys())
+                "description": entry["description"],
+                "type": entry["type"],
+                "categories": entry["categories"],
+                "platforms": entry["platforms"],
+                "hook_types": list(entry["hook_types"].keys())
             }
         return summary
 
@@ -222,11 +667,12 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Content Framework Manager")
-    parser.add_argument("command", choices=["list", "test", "sync"],
+    parser.add_argument("command", choices=["list", "test", "sync", "search"],
                        help="Command to execute")
     parser.add_argument("--framework", help="Framework name for testing")
     parser.add_argument("--category", default="progress_updates",
                        help="Content category for testing")
+    parser.add_argument("--query", help="Idea title for hook search")
 
     args = parser.parse_args()
 
@@ -277,9 +723,21 @@ def main():
             print(f"   Title: {hook['title']}")
             print(f"   Description: {hook['description']}")
             print(f"   Hook Type: {hook['hook_type']}")
+            if hook['missing_variables']:
+                print(f"   ⚠️  Missing variables: {', '.join(hook['missing_variables'])}")
         else:
             print("❌ Failed to generate hook")
 
+    elif args.command == "search":
+        if not args.query:
+            print("❌ --query required for search")
+            return
+
+        print(f"\n🔎 Proven hooks for: {args.query}\n")
+        for i, hook in enumerate(manager.search_hooks(args.query, k=10), 1):
+            print(f"{i:2}. [{hook['score']:.2f}] {hook['hook'][:90]}")
+            print(f"    Source: {hook['source']}")
+
     elif args.command == "sync":
         print("\n🔄 Syncing frameworks from Google Drive...")
         success = manager.sync_from_gdrive()
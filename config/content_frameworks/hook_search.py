@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Hook Search - BM25 retrieval over proven hooks and high-performing posts
+Builds an on-disk inverted index with one segment per source corpus, so a
+changed corpus only rebuilds its own segment. Given an idea title, returns
+the most similar proven hooks without loading the corpora themselves.
+"""
+
+import heapq
+import logging
+import math
+import os
+import pickle
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.json_snapshot import load_json
+
+logger = logging.getLogger("hook_search")
+
+SEGMENT_VERSION = 2
+# Segments live under each frameworks directory, so separate roots never share them
+INDEX_DIRNAME = Path(".cache") / "hook_search"
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "how",
+    "i", "in", "is", "it", "its", "my", "of", "on", "or", "so", "that", "the",
+    "this", "to", "was", "we", "what", "when", "why", "with", "you", "your"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def _framework_hooks(data: Dict) -> List[Dict]:
+    docs = []
+    for hook_type, info in data.get("hook_types", {}).items():
+        for template in info.get("templates", []):
+            pattern = template.get("pattern", "")
+            docs.append({
+                "hook": pattern,
+                "text": f"{pattern} {template.get('description_pattern', '')} {hook_type.replace('_', ' ')}",
+                "hook_type": hook_type
+            })
+    return docs
+
+
+def _viral_hooks(data: List[Dict]) -> List[Dict]:
+    return [{
+        "hook": item.get("pattern", ""),
+        "text": f"{item.get('pattern', '')} {item.get('example', '')} {item.get('use_case', '')}",
+        "example": item.get("example", ""),
+        "category": item.get("category", "")
+    } for item in data]
+
+
+def _youtube_titles(data: List[Dict]) -> List[Dict]:
+    return [{
+        "hook": item.get("template", ""),
+        "text": f"{item.get('original_title', '')} {item.get('template', '')}",
+        "example": item.get("original_title", ""),
+        "creator": item.get("source", "")
+    } for item in data]
+
+
+def _opening_line(text: str) -> str:
+    return next((line.strip() for line in text.splitlines() if line.strip()), "")
+
+
+def _high_performing_posts(data: List[Dict]) -> List[Dict]:
+    # Only the hook is indexed; post bodies would let their closing lines
+    # ("Agree?") outrank the proven openers this search is for
+    docs = []
+    for item in data:
+        hook = item.get("hook") or _opening_line(item.get("full_content", ""))
+        docs.append({
+            "hook": hook,
+            "text": hook,
+            "creator": item.get("creator", ""),
+            "engagement_score": item.get("engagement", {}).get("score", 0)
+        })
+    return docs
+
+
+def _creator_top_hooks(data: List[Dict]) -> List[Dict]:
+    return [{
+        "hook": hook,
+        "text": hook,
+        "creator": creator.get("name", "")
+    } for creator in data for hook in creator.get("top_hooks", [])]
+
+
+# Source file (relative to the frameworks directory) -> document extractor
+HOOK_SOURCES: Dict[str, Callable] = {
+    "kallaway_hooks.json": _framework_hooks,
+    "youtube_hooks.json": _framework_hooks,
+    "json/viral_hooks.json": _viral_hooks,
+    "json/youtube_title_patterns.json": _youtube_titles,
+    "json/airtable_high_performing_posts.json": _high_performing_posts,
+    "json/airtable_creator_styles.json": _creator_top_hooks
+}
+
+
+class Segment:
+    """Inverted index over the documents of one source corpus"""
+
+    def __init__(self, source: str, key: tuple):
+        self.source = source
+        self.key = key
+        self.docs = []        # stored fields, without the indexed text
+        self.lengths = []     # token count per doc
+        self.postings = {}    # term -> [(doc id, term frequency)]
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "Segment":
+        segment = cls(state["source"], state["key"])
+        segment.docs, segment.lengths, segment.postings = state["docs"], state["lengths"], state["postings"]
+        return segment
+
+    def add(self, doc: Dict):
+        tokens = tokenize(doc.pop("text"))
+        if not tokens or not doc.get("hook"):
+            return
+        doc_id = len(self.docs)
+        doc["source"] = self.source
+        self.docs.append(doc)
+        self.lengths.append(len(tokens))
+
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, tf in counts.items():
+            self.postings.setdefault(token, []).append((doc_id, tf))
+
+
+class HookSearchIndex:
+    """BM25 search across all hook segments"""
+
+    def __init__(self, frameworks_dir: Optional[Path] = None, index_dir: Optional[Path] = None):
+        self.frameworks_dir = Path(frameworks_dir) if frameworks_dir else Path(__file__).parent
+        self.index_dir = Path(index_dir) if index_dir else self.frameworks_dir / INDEX_DIRNAME
+        self.segments = []
+        self.refresh()
+
+    def refresh(self):
+        """Load segments, rebuilding only those whose source changed"""
+        segments = []
+        for source, extractor in HOOK_SOURCES.items():
+            source_file = self.frameworks_dir / source
+            if not source_file.exists():
+                continue
+            stat = source_file.stat()
+            key = (SEGMENT_VERSION, stat.st_mtime_ns, stat.st_size)
+
+            segment = self._read_segment(source, key)
+            if segment is None:
+                segment = Segment(source, key)
+                for doc in extractor(load_json(source_file)):
+                    segment.add(doc)
+                self._write_segment(segment)
+                logger.info(f"Indexed {len(segment.docs)} hooks from {source}")
+            segments.append(segment)
+
+        self.segments = segments
+        self.total_docs = sum(len(s.docs) for s in segments)
+        total_length = sum(sum(s.lengths) for s in segments)
+        self.avg_length = total_length / self.total_docs if self.total_docs else 0.0
+
+    def search(self, query: str, k: int = 5, sources: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Top-k hooks most similar to the query
+
+        Args:
+            query: Free text, typically an RSS idea title
+            k: Number of hooks to return
+            sources: Optional subset of HOOK_SOURCES keys to search
+
+        Returns:
+            Hook dictionaries with 'hook', 'source', 'score' and source metadata
+        """
+        terms = set(tokenize(query))
+        if not terms or not self.total_docs:
+            return []
+
+        segments = [s for s in self.segments if not sources or s.source in sources]
+
+        scores = {}
+        for term in terms:
+            df = sum(len(s.postings.get(term, ())) for s in self.segments)
+            if not df:
+                continue
+            idf = math.log(1 + (self.total_docs - df + 0.5) / (df + 0.5))
+            for seg_no, segment in enumerate(segments):
+                for doc_id, tf in segment.postings.get(term, ()):
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * segment.lengths[doc_id] / self.avg_length)
+                    score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+                    scores[(seg_no, doc_id)] = scores.get((seg_no, doc_id), 0.0) + score
+
+        # Several corpora share templates, so over-fetch and drop repeated hooks
+        results, seen = [], set()
+        ranked = heapq.nlargest(k * 4, scores.items(), key=lambda item: item[1])
+        for (seg_no, doc_id), score in ranked:
+            result = dict(segments[seg_no].docs[doc_id])
+            if result["hook"] in seen:
+                continue
+            seen.add(result["hook"])
+            result["score"] = round(score, 4)
+            results.append(result)
+            if len(results) == k:
+                break
+        return results
+
+    def _segment_file(self, source: str) -> Path:
+        return self.index_dir / (source.replace("/", "__") + ".segment")
+
+    def _read_segment(self, source: str, key: tuple) -> Optional[Segment]:
+        segment_file = self._segment_file(source)
+        if not segment_file.exists():
+            return None
+        try:
+            with open(segment_file, 'rb') as f:
+                if pickle.load(f) != key:
+                    return None
+                return Segment.from_state(pickle.load(f))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable hook segment {segment_file}: {e}")
+            return None
+
+    def _write_segment(self, segment: Segment):
+        segment_file = self._segment_file(segment.source)
+        try:
+            segment_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = segment_file.with_name(f"{segment_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(segment.key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                # Plain state rather than the Segment object, so the pickle
+                # does not depend on how this module was imported
+                pickle.dump(vars(segment), f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_file.replace(segment_file)
+        except OSError as e:
+            logger.warning(f"Could not write hook segment {segment_file}: {e}")
@@ -13,10 +13,13 @@ Outputs final content ready for Google Sheets
 
 import json
 import subprocess
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'config' / 'content_frameworks'))
+
 class ContentOrchestrator:
     """Orchestrate multi-agent content generation pipeline"""
 
@@ -38,6 +41,9 @@ class ContentOrchestrator:
         self.research_file = self.agents_dir.parent / 'data' / 'research_results_quick.json'
         self.angles_file = self.agents_dir.parent / 'data' / 'contrarian_angles.json'
 
+        # Proven hook retrieval (loaded on first use)
+        self.framework_manager = None
+
     def run_pipeline(self, mode='balanced', auto_approve=True):
         """
         Run complete content generation pipeline
@@ -242,12 +248,30 @@ class ContentOrchestrator:
                     piece_index=piece_index  # Add index for variation
                 )
 
+                fusion['proven_hooks'] = self._find_proven_hooks(rss_idea)
+
                 fusion_pieces.append(fusion)
 
         print(f"\n   ✅ Created {len(fusion_pieces)} fusion content pieces")
 
         return fusion_pieces
 
+    def _find_proven_hooks(self, rss_idea: Dict, k: int = 3) -> List[Dict]:
+        """Pull the proven hooks most similar to an RSS idea from the hook search index"""
+
+        if self.framework_manager is None:
+            try:
+                from framework_loader import FrameworkManager
+                self.framework_manager = FrameworkManager()
+            except Exception as e:
+                print(f"   ⚠️  Hook search unavailable: {e}")
+                self.framework_manager = False
+
+        if not self.framework_manager:
+            return []
+
+        return self.framework_manager.search_hooks(rss_idea.get('title', ''), k=k)
+
     def _find_related_pillar(self, rss_idea: Dict, pillars: List[Dict]) -> Optional[Dict]:
         """Find personal pillar related to RSS idea - with rotation"""
 
@@ -6,9 +6,10 @@ Generates unique perspectives and tension points
 """
 
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 class ContrarianAngleGenerator:
     """Generate contrarian and unique angles for content"""
@@ -247,7 +248,8 @@ class ContrarianAngleGenerator:
         words = title_lower.split()[:5]
         return ' '.join(words).strip()
 
-    def generate_all_angles(self, idea: Dict, research: Dict = None) -> Dict:
+    def generate_all_angles(self, idea: Dict, research: Dict = None,
+                            generated_at: Optional[str] = None) -> Dict:
         """Generate all angle variations for an idea"""
 
         return {
@@ -257,14 +259,33 @@ class ContrarianAngleGenerator:
             'spicy': self.generate_spicy(idea, research),
             'balanced': self.generate_balanced(idea, research),
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': generated_at or datetime.now().isoformat(),
                 'total_angles': 3,  # professional, spicy, balanced
                 'has_research': research is not None
             }
         }
 
-    def batch_generate(self, ideas: List[Dict], research_data: Dict = None) -> Dict:
-        """Generate angles for multiple ideas"""
+    @staticmethod
+    def index_research(research_data: Dict = None) -> Dict:
+        """Map idea_id -> research, keeping the first result for each idea"""
+
+        index = {}
+        if research_data:
+            for r in research_data.get('results', []):
+                index.setdefault(r.get('idea_id'), r.get('research'))
+        return index
+
+    def batch_generate(self, ideas: List[Dict], research_data: Dict = None,
+                       workers: int = 1) -> Dict:
+        """
+        Generate angles for multiple ideas
+
+        Args:
+            ideas: Ideas to generate angles for
+            research_data: Research results keyed by idea_id
+            workers: Process pool size; 1 runs serially. Output is identical
+                     either way - results keep the order of `ideas`.
+        """
 
         print("\n" + "="*100)
         print("🎭 CONTRARIAN ANGLE GENERATOR")
@@ -272,28 +293,24 @@ class ContrarianAngleGenerator:
 
         print(f"\n🔄 Generating angles for {len(ideas)} ideas...")
 
-        results = []
-
-        for i, idea in enumerate(ideas, 1):
-            print(f"\n   [{i}/{len(ideas)}] {idea.get('title', '')[:60]}...")
-
-            # Find matching research
-            research = None
-            if research_data:
-                for r in research_data.get('results', []):
-                    if r.get('idea_id') == idea.get('id'):
-                        research = r.get('research')
-                        break
+        research_index = self.index_research(research_data)
+        generated_at = datetime.now().isoformat()
 
-            angles = self.generate_all_angles(idea, research)
-            results.append(angles)
+        if workers > 1 and len(ideas) > 1:
+            results = self._batch_generate_parallel(ideas, research_index, generated_at, workers)
+        else:
+            results = []
+            for i, idea in enumerate(ideas, 1):
+                print(f"\n   [{i}/{len(ideas)}] {idea.get('title', '')[:60]}...")
+                research = research_index.get(idea.get('id'))
+                results.append(self.generate_all_angles(idea, research, generated_at))
 
         # Save results
         output_file = self.agents_dir / 'contrarian_angles.json'
 
         output = {
             'metadata': {
-                'generated_at': datetime.now().isoformat(),
+                'generated_at': generated_at,
                 'ideas_processed': len(ideas),
                 'total_variations': len(results) * 3
             },
@@ -326,6 +343,37 @@ class ContrarianAngleGenerator:
 
         return output
 
+    def _batch_generate_parallel(self, ideas: List[Dict], research_index: Dict,
+                                 generated_at: str, workers: int) -> List[Dict]:
+        """Shard ideas across a process pool and merge results in input order"""
+
+        chunk_size = max(1, -(-len(ideas) // (workers * 4)))
+        shards = []
+        for start in range(0, len(ideas), chunk_size):
+            chunk = ideas[start:start + chunk_size]
+            shards.append([
+                (idea, research_index.get(idea.get('id'))) for idea in chunk
+            ])
+
+        print(f"   ⚡ Parallel mode: {len(shards)} shards across {workers} workers")
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # executor.map yields in submission order, so merging is deterministic
+            for i, shard_results in enumerate(
+                    executor.map(_generate_shard, shards, [generated_at] * len(shards)), 1):
+                results.extend(shard_results)
+                print(f"   [{i}/{len(shards)}] shard done ({len(results)}/{len(ideas)} ideas)")
+
+        return results
+
+
+def _generate_shard(shard: List, generated_at: str) -> List[Dict]:
+    """Process pool worker: generate angles for one shard of (idea, research) pairs"""
+
+    generator = ContrarianAngleGenerator()
+    return [generator.generate_all_angles(idea, research, generated_at) for idea, research in shard]
+
 
 def main():
     import sys
@@ -352,7 +400,9 @@ def main():
             with open(research_file, 'r') as f:
                 research_data = json.load(f)
 
-        generator.batch_generate(ideas, research_data)
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+
+        generator.batch_generate(ideas, research_data, workers=workers)
 
     elif len(sys.argv) > 1 and sys.argv[1] == '--help':
         print("""
@@ -360,6 +410,7 @@ Contrarian Angle Generator
 
 Usage:
   python3 contrarian_angle_generator.py batch    # Generate angles for RSS ideas
+  python3 contrarian_angle_generator.py batch 8  # Same, sharded across 8 processes
 
 Generates:
   • Professional angles (data-driven, educational)
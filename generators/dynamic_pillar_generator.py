@@ -8,10 +8,14 @@ Generates NEW pillar ideas by combining:
 """
 
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 import hashlib
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.json_snapshot import load_json
+
 class DynamicPillarGenerator:
     """Generates pillar content dynamically from trends + projects"""
 
@@ -40,8 +44,7 @@ class DynamicPillarGenerator:
     def load_frameworks(self):
         """Load Kallaway frameworks"""
         framework_file = self.base_dir / "config" / "content_frameworks" / "kallaway_hooks.json"
-        with open(framework_file, 'r') as f:
-            return json.load(f)
+        return load_json(framework_file)
 
     def generate_new_pillar_ideas(self, count=3):
         """Generate NEW pillar ideas from trends + projects"""
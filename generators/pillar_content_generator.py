@@ -4,9 +4,13 @@ Generate pillar content using Kallaway frameworks + real project data
 """
 
 import json
+import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.json_snapshot import load_json
+
 class PillarContentGenerator:
     """Creates pillar content from frameworks and real data"""
 
@@ -18,8 +22,7 @@ class PillarContentGenerator:
     def load_kallaway_frameworks(self):
         """Load Kallaway hook frameworks"""
         framework_file = Path(__file__).parent.parent / "config" / "content_frameworks" / "kallaway_hooks.json"
-        with open(framework_file, 'r') as f:
-            return json.load(f)
+        return load_json(framework_file)
 
     def load_project_data(self):
         """Load real project analysis"""
@@ -7,16 +7,24 @@ Usage:
     python upload_to_gdrive.py  # Uploads all *_2025-*.md files
 """
 
+import hashlib
+import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaFileUpload
 import pickle
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sync.google_api import GoogleAPIPool
+from sync.outbox import Outbox, OutboxContext, flush
+
 # If modifying these scopes, delete token.pickle
 SCOPES = ['https://www.googleapis.com/auth/drive.file']
 
@@ -28,9 +36,17 @@ CREDENTIALS_DIR = Path.home() / 'Documents/claudec/systems/skills-main/boring-bu
 CREDENTIALS_FILE = CREDENTIALS_DIR / 'google-drive-credentials.json'
 TOKEN_FILE = CREDENTIALS_DIR / 'token.pickle'
 
+# Uploads are journaled here first (separate account from the Sheets syncers)
+OUTBOX_FILE = Path(__file__).parent / '.cache' / 'drive_outbox.jsonl'
+
+# Content hash + Drive file ID of every uploaded script
+MANIFEST_FILE = Path(__file__).parent / '.cache' / 'gdrive_manifest.json'
+
+UPLOAD_WORKERS = 4
+
 
 def authenticate():
-    """Authenticate and return Google Drive service."""
+    """Authenticate and return the shared, rate-limited Google Drive service."""
     creds = None
 
     # Load existing token
@@ -63,30 +79,97 @@ def authenticate():
         with open(TOKEN_FILE, 'wb') as token:
             pickle.dump(creds, token)
 
-    return build('drive', 'v3', credentials=creds)
+    return GoogleAPIPool(credentials=creds, token_file=TOKEN_FILE).service('drive')
+
+
+def file_sha256(file_path):
+    """Content hash used to detect changed scripts."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class UploadManifest:
+    """Local record of each uploaded file's content hash and Drive file ID, per folder."""
+
+    def __init__(self, manifest_file=MANIFEST_FILE):
+        self.manifest_file = Path(manifest_file)
+        self.lock = threading.Lock()
+        self.entries = {}
+        if self.manifest_file.exists():
+            try:
+                with open(self.manifest_file, 'r') as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️  Ignoring unreadable upload manifest: {e}")
 
+    def get(self, folder_id, name):
+        return self.entries.get(folder_id, {}).get(name)
 
-def upload_file(service, file_path, folder_id=FOLDER_ID):
-    """Upload a file to Google Drive folder."""
+    def is_current(self, folder_id, file_path, sha256=None):
+        """True if this exact content was already uploaded (no API call needed)."""
+        entry = self.get(folder_id, Path(file_path).name)
+        return bool(entry and entry.get('file_id') and entry.get('sha256') == (sha256 or file_sha256(file_path)))
+
+    def record(self, folder_id, name, sha256, file_id, link=None):
+        with self.lock:
+            self.entries.setdefault(folder_id, {})[name] = {
+                'sha256': sha256,
+                'file_id': file_id,
+                'link': link,
+                'uploaded_at': datetime.now().isoformat()
+            }
+
+    def forget(self, folder_id, name):
+        with self.lock:
+            self.entries.get(folder_id, {}).pop(name, None)
+
+    def save(self):
+        with self.lock:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.manifest_file.with_suffix('.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            tmp_file.replace(self.manifest_file)
+
+
+def list_folder(service, folder_id=FOLDER_ID):
+    """Map file name -> Drive file ID for a folder, in one paginated listing."""
+    files = {}
+    page_token = None
+    while True:
+        results = service.files().list(
+            q=f"'{folder_id}' in parents and trashed=false",
+            fields="nextPageToken, files(id, name)",
+            pageSize=1000,
+            pageToken=page_token
+        ).execute()
+        for item in results.get('files', []):
+            files.setdefault(item['name'], item['id'])
+        page_token = results.get('nextPageToken')
+        if not page_token:
+            return files
+
+
+def upload_file(service, file_path, folder_id=FOLDER_ID, file_id=None):
+    """Upload a file to a Google Drive folder, updating file_id in place if given."""
     file_path = Path(file_path)
 
     if not file_path.exists():
         print(f"Error: File not found: {file_path}")
         return None
 
-    # Check if file already exists in folder
     file_name = file_path.name
-    query = f"name='{file_name}' and '{folder_id}' in parents and trashed=false"
-    results = service.files().list(q=query, fields="files(id, name)").execute()
-    existing_files = results.get('files', [])
+    media = MediaFileUpload(str(file_path), mimetype='text/markdown', resumable=True)
 
-    if existing_files:
+    if file_id:
         # Update existing file
-        file_id = existing_files[0]['id']
-        media = MediaFileUpload(str(file_path), mimetype='text/markdown')
         file = service.files().update(
             fileId=file_id,
-            media_body=media
+            media_body=media,
+            fields='id, name, webViewLink'
         ).execute()
         print(f"✅ Updated: {file_name} (ID: {file.get('id')})")
         return file
@@ -96,7 +179,6 @@ def upload_file(service, file_path, folder_id=FOLDER_ID):
             'name': file_name,
             'parents': [folder_id]
         }
-        media = MediaFileUpload(str(file_path), mimetype='text/markdown')
         file = service.files().create(
             body=file_metadata,
             media_body=media,
@@ -107,6 +189,57 @@ def upload_file(service, file_path, folder_id=FOLDER_ID):
         return file
 
 
+def upload_files(service, file_paths, folder_id=FOLDER_ID, manifest=None, workers=UPLOAD_WORKERS):
+    """
+    Upload changed files concurrently, skipping those the manifest says are current.
+
+    Existing Drive files are found with a single folder listing, and only
+    when some file is missing from the manifest.
+
+    Returns:
+        Dict mapping each path to its Drive file dict, 'unchanged', or the exception raised
+    """
+    manifest = manifest or UploadManifest()
+    hashes = {Path(p): file_sha256(p) for p in file_paths if Path(p).exists()}
+    results = {Path(p): FileNotFoundError(str(p)) for p in file_paths if Path(p) not in hashes}
+
+    changed = []
+    for path, sha256 in hashes.items():
+        if manifest.is_current(folder_id, path, sha256):
+            results[path] = 'unchanged'
+        else:
+            changed.append(path)
+    if not changed:
+        return results
+
+    existing = {}
+    if any(manifest.get(folder_id, path.name) is None for path in changed):
+        existing = list_folder(service, folder_id)
+
+    def upload(path):
+        entry = manifest.get(folder_id, path.name)
+        file_id = entry['file_id'] if entry else existing.get(path.name)
+        try:
+            file = upload_file(service, path, folder_id, file_id)
+        except Exception as e:
+            if file_id and entry and getattr(getattr(e, 'resp', None), 'status', None) == 404:
+                # Deleted in Drive since the manifest was written: upload as new
+                manifest.forget(folder_id, path.name)
+                file = upload_file(service, path, folder_id)
+            else:
+                return e
+        manifest.record(folder_id, path.name, hashes[path], file.get('id'), file.get('webViewLink'))
+        return file
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(workers, len(changed))) as executor:
+            for path, result in zip(changed, executor.map(upload, changed)):
+                results[path] = result
+    finally:
+        manifest.save()
+    return results
+
+
 def main():
     """Main upload function."""
     # Get files to upload
@@ -127,20 +260,45 @@ def main():
         print(f"Usage: {sys.argv[0]} [file1.md file2.md ...]")
         sys.exit(1)
 
+    # Unchanged files are skipped without any API call; changed ones are journaled
+    manifest = UploadManifest()
+    outbox = Outbox(OUTBOX_FILE)
+    upload_ops = []
+    unchanged = 0
+    for file_path in files_to_upload:
+        if not file_path.exists():
+            print(f"⚠️  Skipped (not found): {file_path.name}")
+            continue
+        sha256 = file_sha256(file_path)
+        if manifest.is_current(FOLDER_ID, file_path, sha256):
+            unchanged += 1
+            continue
+        upload_ops.append(outbox.enqueue('drive.upload_file', {
+            'path': str(file_path.resolve()),
+            'folder_id': FOLDER_ID,
+            'sha256': sha256
+        }))
+
+    if unchanged:
+        print(f"⏭️  {unchanged} file(s) unchanged since last upload")
+    if not outbox.pending():
+        print(f"\n✅ Nothing to upload.")
+        print(f"View folder: https://drive.google.com/drive/folders/{FOLDER_ID}")
+        return
+
     # Authenticate
     print("Authenticating with Google Drive...")
-    service = authenticate()
+    try:
+        service = authenticate()
+    except Exception as e:
+        print(f"📮 Could not reach Google Drive ({e}); {len(outbox.pending())} upload(s) stay queued")
+        print(f"   Re-run this script (or: python sync/outbox.py flush --journal {OUTBOX_FILE} --token {TOKEN_FILE}) when online")
+        return
     print(f"Uploading to folder ID: {FOLDER_ID}\n")
 
     # Upload files
-    uploaded_count = 0
-    for file_path in files_to_upload:
-        if file_path.exists():
-            result = upload_file(service, file_path)
-            if result:
-                uploaded_count += 1
-        else:
-            print(f"⚠️  Skipped (not found): {file_path.name}")
+    flush(outbox, OutboxContext(token_file=TOKEN_FILE, drive=service))
+    uploaded_count = sum(1 for op_id in upload_ops if (outbox.get(op_id) or {}).get('status') == 'done')
 
     print(f"\n✅ Upload complete! {uploaded_count} file(s) uploaded.")
     print(f"View folder: https://drive.google.com/drive/folders/{FOLDER_ID}")
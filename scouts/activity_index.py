@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Activity Index - Persistent daily buckets of file activity per project
+Every non-hidden file under the active-projects root is remembered with its
+last seen mtime/ctime. Refreshing from a filesystem snapshot (or feeding
+live watcher events) turns differences into 'created', 'modified' and
+'deleted' events, counted in (day, project, extension, kind) buckets. Weekly
+metrics and multi-week trends are then range aggregations over the buckets
+instead of comparisons against every file's timestamps.
+
+A file is counted at most once per day and kind, so a bucket holds the
+number of distinct files touched that day.
+
+While a ChangeWatcher (change_watcher.py) feeds the index it writes a
+heartbeat; agents seeing a live index skip their own rescans.
+
+Usage:
+    python activity_index.py [days]
+"""
+
+import sqlite3
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scouts.fs_snapshot import ACTIVE_DIR, FileSnapshot
+
+ACTIVITY_DB = Path(__file__).parent.parent / "data" / "activity_index.db"
+
+# Seconds since the watcher's last heartbeat for the index to count as live
+LIVE_MAX_AGE = 30
+
+EVENT_KINDS = ('created', 'modified', 'deleted')
+
+
+def day_of(timestamp: float) -> str:
+    """Local calendar day of a timestamp (the bucket key)"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+def is_agent_file(name: str, suffix: str) -> bool:
+    return suffix == '.py' and 'agent' in name
+
+
+class ActivityIndex:
+    """SQLite store of per-file state and daily activity buckets"""
+
+    def __init__(self, db_file: Path = ACTIVITY_DB):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file), timeout=30)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, project TEXT, rel TEXT, name TEXT, suffix TEXT, mtime REAL, ctime REAL);"
+            "CREATE TABLE IF NOT EXISTS projects ("
+            " name TEXT PRIMARY KEY, ctime REAL, agent_files INTEGER);"
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " day TEXT, project TEXT, suffix TEXT, kind TEXT, files INTEGER, agent_files INTEGER,"
+            " PRIMARY KEY (day, project, suffix, kind));"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+            "CREATE INDEX IF NOT EXISTS files_by_mtime ON files (project, mtime);"
+        )
+        self.conn.commit()
+        self._buckets: Counter = Counter()
+        self._agent_buckets: Counter = Counter()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def add_event(self, kind: str, project: str, name: str, suffix: str, timestamp: float):
+        """Count one file event in its day bucket (written on flush)"""
+        key = (day_of(timestamp), project, suffix, kind)
+        self._buckets[key] += 1
+        if is_agent_file(name, suffix):
+            self._agent_buckets[key] += 1
+
+    def refresh(self, snapshot: FileSnapshot) -> Dict[str, int]:
+        """
+        Record everything that changed since the last refresh
+
+        Args:
+            snapshot: Fresh snapshot of the active-projects root
+
+        Returns:
+            Event counts by kind
+        """
+        known = {row[0]: row[1:] for row in self.conn.execute("SELECT path, mtime, ctime FROM files")}
+        now = time.time()
+        counts = Counter()
+        upserts = []
+
+        for entry in snapshot.files(include_hidden=False):
+            previous = known.pop(entry.path, None)
+            if previous is None:
+                self.add_event('created', entry.project, entry.name, entry.suffix, entry.ctime)
+                self.add_event('modified', entry.project, entry.name, entry.suffix, entry.mtime)
+                counts['created'] += 1
+            elif previous[0] != entry.mtime:
+                # Already counted for that day when the earlier mtime was on the same day
+                if day_of(previous[0]) != day_of(entry.mtime):
+                    self.add_event('modified', entry.project, entry.name, entry.suffix, entry.mtime)
+                    counts['modified'] += 1
+            else:
+                continue
+            upserts.append((entry.path, entry.project, entry.rel, entry.name, entry.suffix, entry.mtime, entry.ctime))
+
+        # Whatever the snapshot no longer has was deleted (or became ignored)
+        deleted = list(known)
+        if deleted:
+            for path, project, name, suffix in self._file_rows(deleted):
+                self.add_event('deleted', project, name, suffix, now)
+            counts['deleted'] = len(deleted)
+
+        self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+        self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in deleted])
+
+        self.conn.execute("DELETE FROM projects")
+        self.conn.executemany("INSERT INTO projects VALUES (?, ?, ?)", [
+            (name, snapshot.project_ctimes.get(name),
+             sum(1 for entry in snapshot.projects[name] if entry.suffix == '.py' and 'agent' in entry.path.lower()))
+            for name in snapshot.project_names()
+        ])
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (str(now),))
+        self.flush()
+        return dict(counts)
+
+    def record_file(self, entry) -> Optional[str]:
+        """
+        Record one file seen by a live watcher
+
+        Returns:
+            The event kind recorded, or None when nothing changed
+        """
+        row = self.conn.execute("SELECT mtime FROM files WHERE path = ?", (entry.path,)).fetchone()
+        if row is None:
+            self.add_event('created', entry.project, entry.name, entry.suffix, entry.ctime)
+            self.add_event('modified', entry.project, entry.name, entry.suffix, entry.mtime)
+            if entry.suffix == '.py' and 'agent' in entry.path.lower():
+                self.conn.execute("UPDATE projects SET agent_files = agent_files + 1 WHERE name = ?", (entry.project,))
+            kind = 'created'
+        elif row[0] != entry.mtime:
+            if day_of(row[0]) != day_of(entry.mtime):
+                self.add_event('modified', entry.project, entry.name, entry.suffix, entry.mtime)
+            kind = 'modified'
+        else:
+            return None
+        self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+                          (entry.path, entry.project, entry.rel, entry.name, entry.suffix, entry.mtime, entry.ctime))
+        return kind
+
+    def record_deleted(self, path: str) -> bool:
+        """Record a file removed while being watched"""
+        rows = self._file_rows([path])
+        if not rows:
+            return False
+        _, project, name, suffix = rows[0]
+        self.add_event('deleted', project, name, suffix, time.time())
+        if suffix == '.py' and 'agent' in path.lower():
+            self.conn.execute("UPDATE projects SET agent_files = MAX(agent_files - 1, 0) WHERE name = ?", (project,))
+        self.conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return True
+
+    def record_project(self, name: str, ctime: float):
+        """Record a project directory that appeared while being watched"""
+        self.conn.execute("INSERT OR IGNORE INTO projects VALUES (?, ?, 0)", (name, ctime))
+
+    def record_project_removed(self, name: str):
+        """Forget a project directory removed while being watched"""
+        self.conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+
+    def paths_under(self, directory: str) -> List[str]:
+        """Indexed files below a directory (for a directory removed as a whole)"""
+        prefix = directory.rstrip('/') + '/'
+        return [row[0] for row in self.conn.execute(
+            "SELECT path FROM files WHERE substr(path, 1, ?) = ?", (len(prefix), prefix)
+        )]
+
+    def heartbeat(self):
+        """Mark the index as kept current by a live watcher"""
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('watcher_heartbeat', ?)", (str(time.time()),))
+        self.conn.commit()
+
+    def clear_heartbeat(self):
+        """Mark the index as no longer watched (agents rescan again)"""
+        self.conn.execute("DELETE FROM meta WHERE key = 'watcher_heartbeat'")
+        self.conn.commit()
+
+    def is_live(self, max_age: float = LIVE_MAX_AGE) -> bool:
+        """Whether a watcher has fed the index within the last max_age seconds"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'watcher_heartbeat'").fetchone()
+        return row is not None and time.time() - float(row[0]) <= max_age
+
+    def flush(self):
+        """Add pending bucket counts in one transaction"""
+        if self._buckets:
+            self.conn.executemany(
+                "INSERT INTO buckets VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (day, project, suffix, kind) DO UPDATE SET"
+                " files = files + excluded.files, agent_files = agent_files + excluded.agent_files",
+                [key + (count, self._agent_buckets.get(key, 0)) for key, count in self._buckets.items()]
+            )
+            self._buckets.clear()
+            self._agent_buckets.clear()
+        self.conn.commit()
+
+    def _file_rows(self, paths: List[str]) -> List[Tuple]:
+        rows = []
+        for start in range(0, len(paths), 500):
+            chunk = paths[start:start + 500]
+            rows.extend(self.conn.execute(
+                f"SELECT path, project, name, suffix FROM files WHERE path IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        return rows
+
+    # ------------------------------------------------------------------
+    # Range aggregation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _day_range(start, end) -> Tuple[str, str]:
+        start = start.date() if isinstance(start, datetime) else start
+        end = end.date() if isinstance(end, datetime) else end
+        return start.isoformat(), end.isoformat()
+
+    def totals(self, start, end, kind: str) -> Dict[str, int]:
+        """{'files': n, 'agent_files': n} for one event kind over a day range (inclusive)"""
+        first, last = self._day_range(start, end)
+        files, agent_files = self.conn.execute(
+            "SELECT COALESCE(SUM(files), 0), COALESCE(SUM(agent_files), 0) FROM buckets"
+            " WHERE day BETWEEN ? AND ? AND kind = ?", (first, last, kind)
+        ).fetchone()
+        return {'files': files, 'agent_files': agent_files}
+
+    def suffix_counts(self, start, end, kind: str, project: Optional[str] = None) -> Dict[str, int]:
+        """Event counts per file extension over a day range"""
+        first, last = self._day_range(start, end)
+        query = "SELECT suffix, SUM(files) FROM buckets WHERE day BETWEEN ? AND ? AND kind = ?"
+        params = [first, last, kind]
+        if project is not None:
+            query += " AND project = ?"
+            params.append(project)
+        return dict(self.conn.execute(query + " GROUP BY suffix", params))
+
+    def project_counts(self, start, end, kinds: Iterable[str] = ('created', 'modified')) -> Dict[str, Dict[str, int]]:
+        """{project: {suffix: count}} over a day range"""
+        first, last = self._day_range(start, end)
+        kinds = list(kinds)
+        counts: Dict[str, Dict[str, int]] = {}
+        for project, suffix, files in self.conn.execute(
+            "SELECT project, suffix, SUM(files) FROM buckets WHERE day BETWEEN ? AND ?"
+            f" AND kind IN ({','.join('?' * len(kinds))}) GROUP BY project, suffix",
+            [first, last] + kinds
+        ):
+            counts.setdefault(project, {})[suffix] = files
+        return counts
+
+    def daily_series(self, start, end, kind: str = 'modified') -> Dict[str, int]:
+        """{day: files} for every day with activity in the range"""
+        first, last = self._day_range(start, end)
+        return dict(self.conn.execute(
+            "SELECT day, SUM(files) FROM buckets WHERE day BETWEEN ? AND ? AND kind = ? GROUP BY day ORDER BY day",
+            (first, last, kind)
+        ))
+
+    def weekly_series(self, weeks: int, end: Optional[date] = None) -> List[Dict]:
+        """Created/modified totals and projects touched for each of the last N Monday-based weeks"""
+        end = end or date.today()
+        monday = end - timedelta(days=end.weekday())
+        series = []
+        for offset in range(weeks):
+            week_start = monday - timedelta(weeks=offset)
+            week_end = week_start + timedelta(days=6)
+            series.append({
+                "week_start": week_start.isoformat(),
+                "files_created": self.totals(week_start, week_end, 'created')['files'],
+                "files_modified": self.totals(week_start, week_end, 'modified')['files'],
+                "projects_touched": len(self.project_counts(week_start, week_end))
+            })
+        return series
+
+    def projects(self) -> Dict[str, Tuple[Optional[float], int]]:
+        """{project: (directory ctime, agent .py files)} as of the last refresh"""
+        return {name: (ctime, agent_files) for name, ctime, agent_files in self.conn.execute("SELECT * FROM projects")}
+
+    def recent_files(self, project: str, since: float, limit: int = 10) -> List[Tuple[str, float]]:
+        """(relative path, mtime) of a project's files modified after a timestamp, newest first"""
+        return list(self.conn.execute(
+            "SELECT rel, mtime FROM files WHERE project = ? AND mtime > ? ORDER BY mtime DESC LIMIT ?",
+            (project, since, limit)
+        ))
+
+    def file_mtime(self, project: str, rel: str) -> Optional[float]:
+        row = self.conn.execute("SELECT mtime FROM files WHERE project = ? AND rel = ?", (project, rel)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def refreshed_at(self) -> Optional[float]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else None
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    index = ActivityIndex()
+
+    start = time.perf_counter()
+    counts = index.refresh(FileSnapshot.shared(ACTIVE_DIR, refresh=True))
+    print(f"🗂️  Activity index refreshed in {time.perf_counter() - start:.2f}s: "
+          f"{counts.get('created', 0)} new, {counts.get('modified', 0)} modified, {counts.get('deleted', 0)} deleted")
+
+    today = date.today()
+    first = today - timedelta(days=days - 1)
+    print(f"\n📈 Files modified per day (last {days} days):")
+    for day, files in index.daily_series(first, today).items():
+        print(f"   {day}: {files}")
+
+    print(f"\n📁 Most active projects:")
+    projects = index.project_counts(first, today)
+    for project, suffixes in sorted(projects.items(), key=lambda item: -sum(item[1].values()))[:10]:
+        print(f"   {project}: {sum(suffixes.values())} file events")
+
+
+if __name__ == "__main__":
+    main()
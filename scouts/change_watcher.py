@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Change Watcher - Live, debounced feed of file events under the active projects
+On Linux the tree is watched with inotify (through libc, no extra package);
+elsewhere, or when inotify is unavailable or out of watches, the tree is
+re-scanned every few seconds instead. Raw events are coalesced per path and
+released after a quiet period, then recorded in the ActivityIndex and handed
+to subscribers, so agents learn about changes in O(events) rather than by
+rescanning every file.
+
+Usage:
+    python change_watcher.py [root] [--poll] [--debounce SECONDS]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scouts.activity_index import ACTIVITY_DB, ActivityIndex
+from scouts.fs_snapshot import ACTIVE_DIR, IGNORED_DIRS, FileEntry, FileSnapshot
+
+# Seconds without new raw events before a batch is released
+DEBOUNCE_SECONDS = 1.0
+
+# A busy tree still releases a batch at least this often
+MAX_BATCH_DELAY = 10.0
+
+# Rescan interval of the polling fallback
+POLL_INTERVAL = 5.0
+
+# Seconds between heartbeats marking the activity index as live
+HEARTBEAT_INTERVAL = 10.0
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+EVENT_HEADER = struct.Struct('iIII')
+
+# Raw change kinds produced by the backends
+CHANGED = 'changed'
+REMOVED = 'removed'
+REMOVED_TREE = 'removed_tree'
+RESCAN = 'rescan'
+
+
+class FileEvent(NamedTuple):
+    """One coalesced file event delivered to subscribers"""
+    kind: str       # 'created', 'modified' or 'deleted'
+    path: str
+    project: str
+    rel: str
+    timestamp: float
+
+
+class InotifyUnavailable(Exception):
+    """inotify cannot be used here (not Linux, no libc support, or out of watches)"""
+    pass
+
+
+class InotifyBackend:
+    """Recursive inotify watches over the projects tree"""
+
+    def __init__(self, root: Path, ignored_dirs=IGNORED_DIRS):
+        if not sys.platform.startswith('linux'):
+            raise InotifyUnavailable("inotify is Linux-only")
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        except (OSError, AttributeError) as e:
+            raise InotifyUnavailable(str(e))
+
+        self.root = str(root)
+        self.ignored_dirs = frozenset(ignored_dirs)
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise InotifyUnavailable(os.strerror(ctypes.get_errno()))
+        self.watches: Dict[int, str] = {}
+        self._watch_tree(self.root, [])
+
+    def _watch(self, directory: str):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise InotifyUnavailable("inotify watch limit reached (fs.inotify.max_user_watches)")
+            return
+        self.watches[wd] = directory
+
+    def _watch_tree(self, top: str, changes: List[Tuple[str, str]]):
+        """Watch a directory and everything below it, reporting the files found as changed"""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            self._watch(directory)
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.ignored_dirs and not (directory == self.root and entry.name.startswith('.')):
+                                stack.append(entry.path)
+                        elif directory != self.root:
+                            changes.append((CHANGED, entry.path))
+                    except OSError:
+                        continue
+
+    def read(self, timeout: float) -> List[Tuple[str, str]]:
+        """Raw (kind, path) changes, waiting up to timeout seconds for the first"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+
+        changes = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changes.append((RESCAN, self.root))
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & IN_ISDIR:
+                if name in self.ignored_dirs or (directory == self.root and name.startswith('.')):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land in a new directory before its watch exists
+                    self._watch_tree(path, changes)
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    changes.append((REMOVED_TREE, path))
+            elif directory != self.root:
+                changes.append((REMOVED if mask & (IN_DELETE | IN_MOVED_FROM) else CHANGED, path))
+        return changes
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Periodic snapshot diff, for platforms (or limits) without inotify"""
+
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL):
+        self.root = Path(root)
+        self.interval = interval
+        self.state, self.projects = self._state()
+        self.next_poll = time.monotonic() + interval
+
+    def _state(self) -> Tuple[Dict[str, float], List[str]]:
+        snapshot = FileSnapshot(self.root).scan()
+        return {entry.path: entry.mtime for entry in snapshot.files()}, snapshot.project_names()
+
+    def read(self, timeout: float) -> List[Tuple[str, str]]:
+        wait = self.next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        time.sleep(max(wait, 0))
+        self.next_poll = time.monotonic() + self.interval
+
+        state, projects = self._state()
+        changes = [(CHANGED, path) for path, mtime in state.items() if self.state.get(path) != mtime]
+        changes.extend((REMOVED, path) for path in self.state if path not in state)
+        # A vanished project directory is reported as a whole, like inotify does
+        changes.extend((REMOVED_TREE, str(self.root / name)) for name in self.projects if name not in projects)
+        self.state, self.projects = state, projects
+        return changes
+
+    def close(self):
+        pass
+
+
+class ChangeWatcher:
+    """Background service feeding file events to the activity index and subscribers"""
+
+    def __init__(self, root: Path = ACTIVE_DIR, activity_db: Path = ACTIVITY_DB,
+                 debounce: float = DEBOUNCE_SECONDS, poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool = True):
+        """
+        Args:
+            root: Directory whose subdirectories are the projects
+            activity_db: ActivityIndex database the events are recorded in
+            debounce: Quiet seconds before a batch of changes is released
+            poll_interval: Rescan interval when polling
+            use_inotify: Try inotify before falling back to polling
+        """
+        self.root = Path(root)
+        self.activity_db = Path(activity_db)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend_name: Optional[str] = None
+
+        self._subscribers: Dict[int, Tuple[Callable[[List[FileEvent]], None], Optional[str]]] = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Subscription API
+    # ------------------------------------------------------------------
+
+    def subscribe(self, callback: Callable[[List[FileEvent]], None], project: Optional[str] = None) -> int:
+        """
+        Call back with every released batch (optionally only one project's events)
+
+        Returns:
+            Token for unsubscribe()
+        """
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (callback, project)
+            return self._next_token
+
+    def subscribe_queue(self, project: Optional[str] = None) -> 'queue.Queue[FileEvent]':
+        """Subscribe with a queue the caller drains at its own pace"""
+        events: 'queue.Queue[FileEvent]' = queue.Queue()
+        self.subscribe(lambda batch: [events.put(event) for event in batch], project)
+        return events
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    # ------------------------------------------------------------------
+    # Service
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, wait: bool = True) -> 'ChangeWatcher':
+        """Run in a daemon thread (waiting until the initial scan is recorded)"""
+        if not self.running:
+            self._stop.clear()
+            self._ready.clear()
+            self._thread = threading.Thread(target=self.run, name="change-watcher", daemon=True)
+            self._thread.start()
+            if wait:
+                self._ready.wait()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def run(self):
+        """Watch until stop() (the index connection lives on this thread)"""
+        try:
+            index = ActivityIndex(self.activity_db)
+            backend = self._open_backend()
+            # Catch up with everything that happened while nobody was watching
+            index.refresh(FileSnapshot(self.root).scan())
+            index.heartbeat()
+        finally:
+            self._ready.set()
+
+        pending: Dict[str, str] = {}
+        first_change = last_change = 0.0
+        last_heartbeat = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                try:
+                    changes = backend.read(min(self.debounce, HEARTBEAT_INTERVAL))
+                except InotifyUnavailable as e:
+                    print(f"⚠️  {e}; falling back to polling")
+                    backend.close()
+                    backend = PollingBackend(self.root, self.poll_interval)
+                    self.backend_name = 'polling'
+                    changes = [(RESCAN, str(self.root))]
+
+                now = time.monotonic()
+                if changes:
+                    if not pending:
+                        first_change = now
+                    last_change = now
+                    for kind, path in changes:
+                        # Later raw events for a path supersede earlier ones
+                        pending.pop(path, None)
+                        pending[path] = kind
+
+                if pending and (now - last_change >= self.debounce or now - first_change >= MAX_BATCH_DELAY):
+                    batch, pending = pending, {}
+                    self._release(index, batch)
+
+                if now - last_heartbeat >= HEARTBEAT_INTERVAL:
+                    index.heartbeat()
+                    last_heartbeat = now
+        finally:
+            backend.close()
+            # Without a watcher the index goes stale at once, not LIVE_MAX_AGE later
+            index.clear_heartbeat()
+
+    def _open_backend(self):
+        if self.use_inotify:
+            try:
+                backend = InotifyBackend(self.root)
+                self.backend_name = 'inotify'
+                return backend
+            except InotifyUnavailable as e:
+                print(f"⚠️  {e}; falling back to polling")
+        self.backend_name = 'polling'
+        return PollingBackend(self.root, self.poll_interval)
+
+    def _release(self, index: ActivityIndex, batch: Dict[str, str]):
+        """Record one coalesced batch and hand it to subscribers"""
+        events = []
+        projects = index.projects()
+        for path, kind in batch.items():
+            if kind == RESCAN:
+                index.refresh(FileSnapshot(self.root).scan())
+                continue
+            if kind == REMOVED_TREE:
+                for removed in index.paths_under(path):
+                    events.extend(self._record_removed(index, removed))
+                if os.path.dirname(path) == str(self.root):
+                    # A whole project directory went away
+                    index.record_project_removed(os.path.basename(path))
+                    projects.pop(os.path.basename(path), None)
+                continue
+            entry = self._entry(path) if kind == CHANGED else None
+            if entry is None:
+                events.extend(self._record_removed(index, path))
+                continue
+            if entry.hidden:
+                continue
+            if entry.project not in projects:
+                # First file of a project created while watching
+                index.record_project(entry.project, os.stat(self.root / entry.project).st_ctime)
+                projects[entry.project] = None
+            recorded = index.record_file(entry)
+            if recorded:
+                events.append(FileEvent(recorded, entry.path, entry.project, entry.rel, entry.mtime))
+        index.flush()
+        index.heartbeat()
+
+        if events:
+            with self._lock:
+                subscribers = list(self._subscribers.values())
+            for callback, project in subscribers:
+                selected = [event for event in events if project is None or event.project == project]
+                if selected:
+                    try:
+                        callback(selected)
+                    except Exception as e:
+                        print(f"⚠️  Change subscriber failed: {e}")
+
+    def _record_removed(self, index: ActivityIndex, path: str) -> List[FileEvent]:
+        if not index.record_deleted(path):
+            return []
+        project, rel = self._split(path)
+        return [FileEvent('deleted', path, project, rel, time.time())]
+
+    def _split(self, path: str) -> Tuple[str, str]:
+        project, _, rel = os.path.relpath(path, self.root).partition(os.sep)
+        return project, rel
+
+    def _entry(self, path: str) -> Optional[FileEntry]:
+        """FileEntry for a changed path (None when it is gone or not a regular file)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path):
+            return None
+        project, rel = self._split(path)
+        name = os.path.basename(path)
+        return FileEntry(path, rel, project, name, os.path.splitext(name)[1],
+                         stat.st_size, stat.st_mtime, stat.st_ctime)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the active projects and record file activity")
+    parser.add_argument('root', nargs='?', default=str(ACTIVE_DIR), help="Projects root")
+    parser.add_argument('--poll', action='store_true', help="Poll instead of using inotify")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS, help="Quiet seconds before a batch is released")
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL, help="Rescan interval when polling")
+    args = parser.parse_args()
+
+    watcher = ChangeWatcher(Path(args.root), debounce=args.debounce,
+                            poll_interval=args.poll_interval, use_inotify=not args.poll)
+    icons = {'created': '✨', 'modified': '📝', 'deleted': '🗑️'}
+    watcher.subscribe(lambda batch: [
+        print(f"   {icons[event.kind]} {event.project}/{event.rel}") for event in batch
+    ])
+
+    print(f"👁️  Watching {args.root}")
+    watcher.start()
+    print(f"   Backend: {watcher.backend_name} (Ctrl+C to stop)")
+    try:
+        while watcher.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        watcher.stop()
+        print("\n✅ Watcher stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,65 +11,51 @@ Extracts:
 - Technical breakthroughs
 """
 
-import re
+import sys
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scouts import markdown_extractor as markdown
+from scouts.fs_snapshot import FileSnapshot
+from scouts.markdown_extractor import MarkdownDocument
+
+
+# Python files whose docstrings are mined per project
+PYTHON_FILE_LIMIT = 20
+
+CONTENT_KEYS = ["insights", "guides", "tips", "stories", "problems_solved", "tech_stack", "business_impact"]
+
+# Markdown file name keywords -> the extractors applied to them
+MARKDOWN_NAME_KEYWORDS = {
+    "guides": ['guide', 'tutorial', 'how', 'setup'],
+    "tips": ['tip', 'trick', 'best', 'practice'],
+    "stories": ['story', 'case', 'example']
+}
 
 
 class ContentExtractor:
     """Extracts rich content from project documentation"""
 
+    def __init__(self, index=None):
+        """
+        Args:
+            index: Optional ExtractionIndex; unchanged files reuse their cached partials
+        """
+        self.index = index
+
     def extract_from_project(self, project_dir: Path) -> Dict:
         """Extract all types of content from a project"""
 
-        content = {
-            "insights": [],
-            "guides": [],
-            "tips": [],
-            "stories": [],
-            "problems_solved": [],
-            "tech_stack": [],
-            "business_impact": []
-        }
-
-        # Read README
-        readme = project_dir / "README.md"
-        if readme.exists():
-            readme_content = self._read_markdown(readme)
-            content["insights"].extend(self._extract_insights(readme_content))
-            content["guides"].extend(self._extract_guides(readme_content))
-            content["tips"].extend(self._extract_tips(readme_content))
-            content["stories"].extend(self._extract_stories(readme_content))
-            content["problems_solved"].extend(self._extract_problems_solved(readme_content))
-            content["business_impact"].extend(self._extract_business_impact(readme_content))
-
-        # Read other markdown files
-        for md_file in project_dir.rglob("*.md"):
-            if md_file.name != "README.md" and not any(skip in str(md_file) for skip in ['node_modules', '.git', 'venv']):
-                md_content = self._read_markdown(md_file)
-
-                # Look for specific content types
-                if any(word in md_file.name.lower() for word in ['guide', 'tutorial', 'how', 'setup']):
-                    content["guides"].extend(self._extract_guides(md_content))
-
-                if any(word in md_file.name.lower() for word in ['tip', 'trick', 'best', 'practice']):
-                    content["tips"].extend(self._extract_tips(md_content))
-
-                if any(word in md_file.name.lower() for word in ['story', 'case', 'example']):
-                    content["stories"].extend(self._extract_stories(md_content))
-
-        # Read CLAUDE.md for project context
-        claude_md = project_dir / "CLAUDE.md"
-        if claude_md.exists():
-            claude_content = self._read_markdown(claude_md)
-            content["insights"].extend(self._extract_insights(claude_content))
-            content["tech_stack"].extend(self._extract_tech_stack(claude_content))
-
-        # Read Python docstrings for insights
-        for py_file in list(project_dir.rglob("*.py"))[:20]:  # Limit to first 20 files
-            if not any(skip in str(py_file) for skip in ['node_modules', '.git', '__pycache__', 'venv']):
-                py_content = self._read_file(py_file)
-                content["insights"].extend(self._extract_from_docstrings(py_content))
+        content = {key: [] for key in CONTENT_KEYS}
+
+        # Each file is extracted on its own and merged in the original order:
+        # README, other markdown, CLAUDE.md, Python docstrings
+        for entry, role in self._project_sources(project_dir):
+            partial = self._file_content(entry, role)
+            for key in CONTENT_KEYS:
+                content[key].extend(partial.get(key, []))
 
         # Deduplicate and limit
         content["insights"] = self._deduplicate(content["insights"])[:10]
@@ -81,13 +67,87 @@ class ContentExtractor:
 
         return content
 
-    def _read_markdown(self, file_path: Path) -> str:
-        """Read markdown file content"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except:
-            return ""
+    def readme_purpose(self, project_dir: Path) -> str:
+        """First line of the project README with heading marks removed"""
+        for entry in FileSnapshot.project_files(project_dir):
+            if entry.rel == "README.md":
+                return self._file_content(entry, "readme").get("purpose", "")
+        return ""
+
+    def extract_file(self, content: str, name: str, role: str) -> Dict:
+        """
+        Extract one file's partial content
+
+        Args:
+            content: File text
+            name: File name (markdown extractors are chosen by name keywords)
+            role: 'readme', 'markdown', 'claude' or 'python'
+
+        Returns:
+            Dict of content lists (only the keys this file contributes to)
+        """
+        if role == "python":
+            return {"insights": self._extract_from_docstrings(content)}
+
+        # Tokenized once, shared by every extractor below
+        doc = MarkdownDocument(content)
+
+        if role == "readme":
+            first_line = doc.lines[0].strip()
+            return {
+                "purpose": first_line.replace('#', '').strip() if first_line else "",
+                "insights": self._extract_insights(doc),
+                "guides": self._extract_guides(doc),
+                "tips": self._extract_tips(doc),
+                "stories": self._extract_stories(doc),
+                "problems_solved": self._extract_problems_solved(doc),
+                "business_impact": self._extract_business_impact(content)
+            }
+
+        if role == "markdown":
+            extractors = {
+                "guides": self._extract_guides,
+                "tips": self._extract_tips,
+                "stories": self._extract_stories
+            }
+            return {key: extractors[key](doc) for key in self._markdown_keys(name)}
+
+        if role == "claude":
+            return {
+                "insights": self._extract_insights(doc),
+                "tech_stack": self._extract_tech_stack(content)
+            }
+
+        return {}
+
+    def _project_sources(self, project_dir: Path) -> List[Tuple]:
+        """(FileEntry, role) for every file the extractor reads, in merge order"""
+        # Shared snapshot of the project tree (ignored directories already pruned)
+        files = FileSnapshot.project_files(project_dir)
+
+        readme = [(f, "readme") for f in files if f.rel == "README.md"]
+        claude = [(f, "claude") for f in files if f.rel == "CLAUDE.md"]
+
+        # Other markdown files, only when the name selects an extractor
+        markdown = [
+            (f, "markdown") for f in files
+            if f.suffix == ".md" and f.name != "README.md" and f.rel != "CLAUDE.md" and self._markdown_keys(f.name)
+        ]
+
+        # Read Python docstrings for insights; stop at the first 20 files
+        python = list(islice(((f, "python") for f in files if f.suffix == ".py"), PYTHON_FILE_LIMIT))
+
+        return readme + markdown + claude + python
+
+    @staticmethod
+    def _markdown_keys(name: str) -> List[str]:
+        name = name.lower()
+        return [key for key, words in MARKDOWN_NAME_KEYWORDS.items() if any(word in name for word in words)]
+
+    def _file_content(self, entry, role: str) -> Dict:
+        if self.index is not None:
+            return self.index.get(entry, role, self.extract_file)
+        return self.extract_file(self._read_file(Path(entry.path)), entry.name, role)
 
     def _read_file(self, file_path: Path) -> str:
         """Read any text file"""
@@ -97,87 +157,68 @@ class ContentExtractor:
         except:
             return ""
 
-    def _extract_insights(self, content: str) -> List[str]:
+    def _extract_insights(self, doc: MarkdownDocument) -> List[str]:
         """Extract key insights"""
         insights = []
 
-        # Look for patterns like "Key insight:", "Learned:", "Discovery:"
-        patterns = [
-            r"(?:key insight|learned|discovery|finding|realized):\s*(.+?)(?:\n|$)",
-            r"##\s*(?:insights?|learnings?|discoveries)\s*\n(.+?)(?=\n##|\Z)",
-            r"\*\*(?:insight|learning|discovery)\*\*:\s*(.+?)(?:\n|$)",
-        ]
-
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                text = match.group(1).strip()
-                if len(text) > 20 and len(text) < 300:
-                    insights.append(text)
+        # Look for patterns like "Key insight:", "Learned:", "Discovery:",
+        # "## Insights" sections and "**Insight**:" markers
+        candidates = (
+            doc.after_markers(markdown.INSIGHT_MARKERS)
+            + [body for _, body in doc.sections(markdown.INSIGHT_SECTIONS)]
+            + doc.after_markers(markdown.INSIGHT_BOLD_MARKERS)
+        )
+        for text in candidates:
+            text = text.strip()
+            if len(text) > 20 and len(text) < 300:
+                insights.append(text)
 
         # Extract bullet points under "Insights" sections
-        insights_section = re.search(r"##\s*Insights?\s*\n((?:[-*]\s*.+\n)+)", content, re.IGNORECASE)
-        if insights_section:
-            bullets = re.findall(r"[-*]\s*(.+)", insights_section.group(1))
-            insights.extend([b.strip() for b in bullets if len(b.strip()) > 20])
+        bullets = doc.bullets_under(markdown.INSIGHT_BULLET_SECTIONS)
+        insights.extend([b for b in bullets if len(b) > 20])
 
         return insights
 
-    def _extract_guides(self, content: str) -> List[Dict]:
+    def _extract_guides(self, doc: MarkdownDocument) -> List[Dict]:
         """Extract step-by-step guides"""
         guides = []
 
-        # Look for numbered steps
-        step_patterns = [
-            r"(?:step\s+\d+|^\d+\.)\s*[:\-]?\s*(.+?)(?=\n(?:step\s+\d+|\d+\.)|$)",
-            r"##\s*(?:step\s+\d+|installation|setup)\s*\n(.+?)(?=\n##|\Z)",
-        ]
-
-        for pattern in step_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            for match in matches:
-                text = match.group(1).strip()
-                if len(text) > 30 and len(text) < 500:
-                    guides.append({
-                        "type": "step",
-                        "content": text
-                    })
+        # Look for numbered steps, then "## Step N" / installation / setup sections
+        candidates = doc.step_lines() + [body for _, body in doc.sections(markdown.GUIDE_SECTIONS)]
+        for text in candidates:
+            text = text.strip()
+            if len(text) > 30 and len(text) < 500:
+                guides.append({
+                    "type": "step",
+                    "content": text
+                })
 
         return guides
 
-    def _extract_tips(self, content: str) -> List[str]:
+    def _extract_tips(self, doc: MarkdownDocument) -> List[str]:
         """Extract tips and tricks"""
         tips = []
 
         # Look for tip patterns
-        tip_patterns = [
-            r"(?:tip|trick|pro tip|protip|note|important):\s*(.+?)(?:\n|$)",
-            r"💡\s*(.+?)(?:\n|$)",
-            r"\*\*tip\*\*:\s*(.+?)(?:\n|$)",
-        ]
-
-        for pattern in tip_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                text = match.group(1).strip()
-                if len(text) > 20 and len(text) < 200:
-                    tips.append(text)
+        candidates = (
+            doc.after_markers(markdown.TIP_MARKERS)
+            + doc.after_markers(markdown.TIP_EMOJI_MARKERS)
+            + doc.after_markers(markdown.TIP_BOLD_MARKERS)
+        )
+        for text in candidates:
+            text = text.strip()
+            if len(text) > 20 and len(text) < 200:
+                tips.append(text)
 
         return tips
 
-    def _extract_stories(self, content: str) -> List[Dict]:
+    def _extract_stories(self, doc: MarkdownDocument) -> List[Dict]:
         """Extract success stories and narratives"""
         stories = []
 
         # Look for story patterns
-        story_sections = re.finditer(
-            r"##\s*(?:story|example|case study|success|journey)\s*\n(.+?)(?=\n##|\Z)",
-            content,
-            re.IGNORECASE | re.DOTALL
-        )
-
-        for match in story_sections:
-            text = match.group(1).strip()
+        for _, body in doc.sections(markdown.STORY_SECTIONS):
+            text = body.strip()
             if len(text) > 100 and len(text) < 1000:
                 stories.append({
                     "type": "narrative",
@@ -185,87 +226,48 @@ class ContentExtractor:
                 })
 
         # Look for before/after patterns
-        before_after = re.search(
-            r"(?:before|problem):\s*(.+?)\s*(?:after|solution):\s*(.+?)(?:\n\n|$)",
-            content,
-            re.IGNORECASE | re.DOTALL
-        )
+        before_after = doc.marker_pairs(markdown.BEFORE_MARKERS, markdown.AFTER_MARKERS, limit=1)
         if before_after:
+            before, after = before_after[0]
             stories.append({
                 "type": "transformation",
-                "before": before_after.group(1).strip(),
-                "after": before_after.group(2).strip()
+                "before": before.strip(),
+                "after": after.strip()
             })
 
         return stories
 
-    def _extract_problems_solved(self, content: str) -> List[Dict]:
+    def _extract_problems_solved(self, doc: MarkdownDocument) -> List[Dict]:
         """Extract problem-solution pairs"""
         problems = []
 
-        # Look for problem patterns
-        problem_patterns = [
-            r"##\s*(?:problem|challenge|issue)\s*\n(.+?)\n##\s*(?:solution|resolution|fix)\s*\n(.+?)(?=\n##|\Z)",
-            r"(?:problem|challenge):\s*(.+?)\s*(?:solution|fix):\s*(.+?)(?:\n\n|$)",
-        ]
-
-        for pattern in problem_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE | re.DOTALL)
-            for match in matches:
-                problems.append({
-                    "problem": match.group(1).strip()[:300],
-                    "solution": match.group(2).strip()[:300]
-                })
+        # Look for problem/solution sections, then inline "Problem: ... Solution: ..."
+        pairs = (
+            list(doc.section_pairs(markdown.PROBLEM_SECTIONS, markdown.SOLUTION_SECTIONS))
+            + doc.marker_pairs(markdown.PROBLEM_MARKERS, markdown.SOLUTION_MARKERS)
+        )
+        for problem, solution in pairs:
+            problems.append({
+                "problem": problem.strip()[:300],
+                "solution": solution.strip()[:300]
+            })
 
         return problems
 
     def _extract_business_impact(self, content: str) -> List[Dict]:
         """Extract business impact metrics"""
-        impacts = []
-
-        # Look for impact patterns
-        impact_patterns = [
-            r"(?:saved?|saving)\s+(\d+\s*(?:hours?|minutes?|days?))",
-            r"(?:reduced|decreased)\s+(?:by\s+)?(\d+%)",
-            r"(?:increased|improved)\s+(?:by\s+)?(\d+%)",
-            r"\$(\d+(?:,\d+)*)\s*(?:saved|revenue|profit)",
-        ]
-
-        for pattern in impact_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                impacts.append({
-                    "metric": match.group(0),
-                    "value": match.group(1)
-                })
-
-        return impacts
+        return [{"metric": metric, "value": value} for metric, value in markdown.impact_metrics(content)]
 
     def _extract_tech_stack(self, content: str) -> List[str]:
         """Extract technology stack"""
-        tech = []
-
-        # Common tech keywords
-        tech_keywords = [
-            "Python", "JavaScript", "React", "Node.js", "Flask", "FastAPI",
-            "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes",
-            "AWS", "GCP", "Azure", "Supabase", "Firebase",
-            "Claude", "GPT", "OpenAI", "AI", "ML"
-        ]
-
-        for keyword in tech_keywords:
-            if re.search(rf"\b{keyword}\b", content, re.IGNORECASE):
-                tech.append(keyword)
-
-        return list(set(tech))
+        return markdown.tech_keywords(content)
 
     def _extract_from_docstrings(self, content: str) -> List[str]:
         """Extract insights from Python docstrings"""
         insights = []
 
         # Find docstrings
-        docstrings = re.findall(r'"""(.+?)"""', content, re.DOTALL)
-        for docstring in docstrings:
+        for docstring in markdown.docstrings(content):
             # Look for meaningful descriptions
             lines = [l.strip() for l in docstring.split('\n') if len(l.strip()) > 30]
             insights.extend(lines[:2])  # Take first 2 meaningful lines
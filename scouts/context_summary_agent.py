@@ -17,6 +17,10 @@ import hashlib
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.agent_framework import BaseAgent
+from scouts.activity_index import ACTIVITY_DB, ActivityIndex
+from scouts.fs_snapshot import ACTIVE_DIR, FileSnapshot
+from scouts.log_archive import LogArchive
+from scouts.log_tail import LogTail
 
 
 class ContextSummaryAgent(BaseAgent):
@@ -37,6 +41,12 @@ class ContextSummaryAgent(BaseAgent):
         self.log_filename = "log.md"
         self.context_filename = "context.md"
         
+        # Opened on first use, when a change watcher maintains it
+        self.activity_index = None
+        
+        # Incremental readers per log file (offsets persist in a sidecar)
+        self.log_tails: Dict[str, LogTail] = {}
+        
         # Setup logging
         self.logger = logging.getLogger("context_summary")
         self.logger.setLevel(logging.INFO)
@@ -80,6 +90,13 @@ class ContextSummaryAgent(BaseAgent):
             return self.summarize_session(project_path)
         elif task_type == "rotate_logs":
             return self.rotate_logs(project_path)
+        elif task_type == "search_archives":
+            return self.search_archives(
+                project_path,
+                task.get("text", ""),
+                task.get("days"),
+                task.get("checkpoints", False)
+            )
         else:
             return {"error": f"Unknown task type: {task_type}"}
     
@@ -151,6 +168,9 @@ class ContextSummaryAgent(BaseAgent):
             with open(log_file, 'a', encoding='utf-8') as f:
                 f.write(log_entry)
             
+            # Fold just the new entry into the running counts
+            self._log_tail(log_file).update()
+            
             return {
                 "success": True,
                 "log_file": str(log_file),
@@ -173,11 +193,8 @@ class ContextSummaryAgent(BaseAgent):
         self.logger.info(f"Summarizing session for {project_dir.name}")
         
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                log_content = f.read()
-            
-            # Parse session data
-            session_data = self._parse_session_data(log_content)
+            # Counts are maintained incrementally; only new bytes are read
+            session_data = self._log_tail(log_file).session_data()
             
             # Generate session summary
             session_summary = self._generate_session_summary(session_data)
@@ -201,12 +218,15 @@ class ContextSummaryAgent(BaseAgent):
             return {"error": "No log file to rotate"}
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        archived_name = f"log_archived_{timestamp}.md"
-        archived_file = project_dir / archived_name
+        archived_name = f"log_archived_{timestamp}"
         
         try:
-            # Move current log to archived
-            log_file.rename(archived_file)
+            # Compress and index the current log, then start a fresh one
+            archive = LogArchive(project_dir)
+            archive.import_legacy()
+            archived_file = archive.add(log_file, archived_name, archived_at=datetime.now().timestamp())
+            log_file.unlink()
+            self._log_tail(log_file).reset()
             
             # Create new log with header
             self._create_new_log(log_file, project_dir.name)
@@ -223,34 +243,46 @@ class ContextSummaryAgent(BaseAgent):
             self.logger.error(f"Error rotating logs: {e}")
             return {"error": str(e)}
     
+    def search_archives(self, project_path: str, text: str, days: Optional[int] = None,
+                        checkpoints: bool = False) -> Dict[str, Any]:
+        """Search rotated logs; only the compressed blocks that can match are read"""
+        project_dir = Path(project_path)
+        if not project_dir.exists():
+            return {"error": f"Project path does not exist: {project_path}"}
+        
+        archive = LogArchive(project_dir)
+        archive.import_legacy()
+        if checkpoints:
+            results = archive.checkpoints_mentioning(text, days)
+        else:
+            results = archive.search(text, days)
+        
+        return {
+            "success": True,
+            "query": text,
+            "days": days,
+            "results": results
+        }
+    
     def _should_create_checkpoint(self, log_file: Path) -> bool:
         """Check if a context checkpoint should be created"""
         if not log_file.exists():
             return False
         
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Count messages since last checkpoint
-            lines = content.split('\n')
-            messages_since_checkpoint = 0
-            found_checkpoint = False
-            
-            for line in reversed(lines):
-                if '## Context Checkpoint' in line:
-                    found_checkpoint = True
-                    break
-                elif line.startswith('**[') or line.startswith('**User') or line.startswith('**Assistant'):
-                    messages_since_checkpoint += 1
-            
-            # Create checkpoint if enough messages or no checkpoint found
-            return messages_since_checkpoint >= self.context_checkpoint_interval or not found_checkpoint
+            # Messages since the last checkpoint, from the bytes appended since the last check
+            return self._log_tail(log_file).should_checkpoint(self.context_checkpoint_interval)
             
         except Exception as e:
             self.logger.warning(f"Error checking checkpoint need: {e}")
             return False
     
+    def _log_tail(self, log_file: Path) -> LogTail:
+        key = str(log_file)
+        if key not in self.log_tails:
+            self.log_tails[key] = LogTail(log_file)
+        return self.log_tails[key]
+    
     def _should_rotate_log(self, log_file: Path) -> bool:
         """Check if log file should be rotated"""
         try:
@@ -297,20 +329,42 @@ class ContextSummaryAgent(BaseAgent):
         cutoff_time = datetime.now() - timedelta(hours=24)  # Last 24 hours
         
         try:
-            for file_path in project_dir.rglob("*"):
-                if file_path.is_file() and not file_path.name.startswith('.'):
-                    mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
+            # A live change watcher already knows what changed; no rescan needed
+            if self._live_activity_index(project_dir):
+                for rel, mtime in self.activity_index.recent_files(project_dir.name, cutoff_time.timestamp()):
+                    try:
+                        size = (project_dir / rel).stat().st_size
+                    except OSError:
+                        continue
+                    recent_changes.append({
+                        "file": rel,
+                        "modified": datetime.fromtimestamp(mtime).isoformat(),
+                        "size": size
+                    })
+                return recent_changes
+
+            for entry in FileSnapshot.project_files(project_dir):
+                if not entry.hidden:
+                    mod_time = datetime.fromtimestamp(entry.mtime)
                     if mod_time > cutoff_time:
                         recent_changes.append({
-                            "file": str(file_path.relative_to(project_dir)),
+                            "file": entry.rel,
                             "modified": mod_time.isoformat(),
-                            "size": file_path.stat().st_size
+                            "size": entry.size
                         })
         except Exception as e:
             self.logger.warning(f"Error getting recent changes: {e}")
         
         return sorted(recent_changes, key=lambda x: x["modified"], reverse=True)[:10]
     
+    def _live_activity_index(self, project_dir: Path) -> bool:
+        """Whether a change watcher is currently feeding the activity index for this project"""
+        if project_dir.resolve().parent != ACTIVE_DIR or not ACTIVITY_DB.exists():
+            return False
+        if self.activity_index is None:
+            self.activity_index = ActivityIndex()
+        return self.activity_index.is_live()
+    
     def _extract_localhost_info(self, project_files: Dict[str, str]) -> Dict[str, Any]:
         """Extract localhost configuration from project files"""
         localhost_info = {}
@@ -459,6 +513,7 @@ class ContextSummaryAgent(BaseAgent):
         try:
             with open(log_file, 'a', encoding='utf-8') as f:
                 f.write(checkpoint_entry)
+            self._log_tail(log_file).update()
         except Exception as e:
             self.logger.warning(f"Error adding checkpoint marker: {e}")
     
@@ -482,33 +537,6 @@ This file contains the conversation history for Claude Code sessions in this pro
         with open(log_file, 'w', encoding='utf-8') as f:
             f.write(header)
     
-    def _parse_session_data(self, log_content: str) -> Dict[str, Any]:
-        """Parse session data from log content"""
-        lines = log_content.split('\n')
-        
-        session_data = {
-            "total_entries": 0,
-            "entry_types": {},
-            "session_duration": None,
-            "key_activities": []
-        }
-        
-        # Count entries by type
-        for line in lines:
-            if '**[' in line and ']' in line:
-                session_data["total_entries"] += 1
-                # Extract entry type
-                if '💬' in line:
-                    session_data["entry_types"]["message"] = session_data["entry_types"].get("message", 0) + 1
-                elif '⚡' in line:
-                    session_data["entry_types"]["command"] = session_data["entry_types"].get("command", 0) + 1
-                elif '❌' in line:
-                    session_data["entry_types"]["error"] = session_data["entry_types"].get("error", 0) + 1
-                elif '✅' in line:
-                    session_data["entry_types"]["success"] = session_data["entry_types"].get("success", 0) + 1
-        
-        return session_data
-    
     def _generate_session_summary(self, session_data: Dict[str, Any]) -> str:
         """Generate session summary"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -551,12 +579,14 @@ This file contains the conversation history for Claude Code sessions in this pro
 def main():
     """Main CLI interface"""
     parser = argparse.ArgumentParser(description="Context Summary & Chat Log Agent")
-    parser.add_argument("command", choices=["checkpoint", "log", "summarize", "rotate", "monitor"], 
+    parser.add_argument("command", choices=["checkpoint", "log", "summarize", "rotate", "monitor", "search"], 
                        help="Command to execute")
     parser.add_argument("--project", help="Project path", default=os.getcwd())
     parser.add_argument("--text", help="Conversation text or log entry")
     parser.add_argument("--type", default="message", help="Entry type for log")
     parser.add_argument("--force", action="store_true", help="Force checkpoint creation")
+    parser.add_argument("--days", type=int, help="Only search archived logs from the last N days")
+    parser.add_argument("--checkpoints", action="store_true", help="Group archive matches by checkpoint")
     parser.add_argument("--format", choices=["json", "text"], default="text", help="Output format")
     
     args = parser.parse_args()
@@ -616,6 +646,21 @@ def main():
             else:
                 print(f"❌ Error: {result.get('error', 'Unknown error')}")
     
+    elif args.command == "search":
+        result = agent.search_archives(args.project, args.text or "", args.days, args.checkpoints)
+        
+        if args.format == "json":
+            print(json.dumps(result, indent=2))
+        elif not result.get("success"):
+            print(f"❌ Error: {result.get('error', 'Unknown error')}")
+        else:
+            print(f"🔎 {len(result['results'])} archived matches for '{args.text or ''}'")
+            for match in result["results"][:10]:
+                if args.checkpoints:
+                    print(f"   📍 Checkpoint {match['checkpoint']}: {len(match['matches'])} entries")
+                else:
+                    print(f"   {match['timestamp']} [{match['kind']}] {match['text'].splitlines()[0][:80]}")
+    
     elif args.command == "monitor":
         result = agent.monitor_project(args.project, args.text or "")
         
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Extraction Index - Persistent per-file cache of ContentExtractor results
+Each file the extractor reads is recorded with its mtime, size, content hash
+and extracted partial (insights, guides, tips, ...). A later run reuses the
+partial while mtime and size are unchanged, and re-hashes (without
+re-extracting) when only the metadata moved, so a daily collector run only
+re-reads and re-parses files that actually changed.
+
+Partials are also content-addressed: a bounded LRU keyed on (sha1, role,
+name) serves files whose content was already extracted under another path
+(copied templates, moved files, the same CLAUDE.md in several projects).
+The table itself is capped at max_entries rows, evicting the least recently
+used ones.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+# Bump when extraction output changes so stale partials are re-extracted
+INDEX_VERSION = 1
+
+# Partials kept in the in-memory content-addressed LRU
+CONTENT_CACHE_SIZE = 4096
+
+# Rows kept in the table; the least recently used beyond this are evicted
+MAX_ENTRIES = 50000
+
+
+def decode_text(data: bytes) -> str:
+    """Decode file bytes the way open(..., encoding='utf-8').read() would"""
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return ""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+class ExtractionIndex:
+    """SQLite index of extracted files: path -> (mtime, size, sha1, role, partial)"""
+
+    def __init__(self, db_file: Path, cache_size: int = CONTENT_CACHE_SIZE, max_entries: int = MAX_ENTRIES):
+        """
+        Args:
+            db_file: SQLite file holding the index
+            cache_size: Partials kept in the content-addressed LRU
+            max_entries: Rows kept in the table (least recently used evicted first)
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, mtime REAL, size INTEGER, sha1 TEXT, role TEXT,"
+            " version INTEGER, partial TEXT, used REAL)"
+        )
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(files)")]
+        if 'used' not in columns:
+            # Indexes written before LRU eviction
+            self.conn.execute("ALTER TABLE files ADD COLUMN used REAL DEFAULT 0")
+        self.conn.commit()
+        self.cache_size = cache_size
+        self.max_entries = max_entries
+        self.run_started = time.time()
+        self._entries: Optional[Dict[str, Tuple]] = None
+        self._content: Optional[OrderedDict] = None
+        self._pending: Dict[str, Tuple] = {}
+        self.seen: Set[str] = set()
+        self.stats = {'cached': 0, 'rehashed': 0, 'shared': 0, 'extracted': 0}
+
+    @property
+    def entries(self) -> Dict[str, Tuple]:
+        """All indexed rows, loaded once per run"""
+        if self._entries is None:
+            cursor = self.conn.execute("SELECT path, mtime, size, sha1, role, version, partial FROM files")
+            self._entries = {row[0]: row[1:] for row in cursor}
+        return self._entries
+
+    @property
+    def content(self) -> OrderedDict:
+        """(sha1, role, name) -> partial JSON, most recently used last"""
+        if self._content is None:
+            self._content = OrderedDict()
+            cursor = self.conn.execute(
+                "SELECT sha1, role, path, partial FROM files WHERE version = ? ORDER BY used DESC LIMIT ?",
+                (INDEX_VERSION, self.cache_size)
+            )
+            for sha1, role, path, partial in reversed(cursor.fetchall()):
+                self._content[(sha1, role, Path(path).name)] = partial
+        return self._content
+
+    def _remember(self, key: Tuple, partial: str):
+        self.content[key] = partial
+        self.content.move_to_end(key)
+        if len(self.content) > self.cache_size:
+            self.content.popitem(last=False)
+
+    def get(self, entry, role: str, extract: Callable[[str, str, str], Dict]) -> Dict:
+        """
+        Extracted partial for a snapshot FileEntry, re-extracting only on change
+
+        Args:
+            entry: FileEntry (path, name, size, mtime) from the filesystem snapshot
+            role: How the extractor treats the file ('readme', 'markdown', ...)
+            extract: extract(content, name, role) -> partial
+        """
+        self.seen.add(entry.path)
+        row = self.entries.get(entry.path)
+        if row is not None:
+            mtime, size, sha1, cached_role, version, partial = row
+            if mtime == entry.mtime and size == entry.size and cached_role == role and version == INDEX_VERSION:
+                self.stats['cached'] += 1
+                return json.loads(partial)
+
+        try:
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = b""
+        digest = hashlib.sha1(data).hexdigest()
+        key = (digest, role, entry.name)
+
+        if row is not None and sha1 == digest and cached_role == role and version == INDEX_VERSION:
+            # Touched but unchanged: keep the partial, refresh the metadata
+            self.stats['rehashed'] += 1
+            result = json.loads(partial)
+        elif key in self.content:
+            # Same content already extracted under another path
+            self.stats['shared'] += 1
+            partial = self.content[key]
+            result = json.loads(partial)
+        else:
+            self.stats['extracted'] += 1
+            result = extract(decode_text(data), entry.name, role)
+            partial = json.dumps(result)
+        self._remember(key, partial)
+
+        record = (entry.mtime, entry.size, digest, role, INDEX_VERSION, partial)
+        self.entries[entry.path] = record
+        self._pending[entry.path] = record
+        return result
+
+    def export(self) -> Tuple[Dict[str, Tuple], Set[str], Dict[str, int]]:
+        """Hand over unsaved rows, seen paths and stats (a worker returns these to the parent)"""
+        exported = (self._pending, self.seen, self.stats)
+        self._pending = {}
+        self.seen = set()
+        self.stats = {key: 0 for key in self.stats}
+        return exported
+
+    def merge(self, exported: Tuple[Dict[str, Tuple], Set[str], Dict[str, int]]):
+        """Adopt the output of another process's export()"""
+        records, seen, stats = exported
+        self.entries.update(records)
+        self._pending.update(records)
+        self.seen.update(seen)
+        for key, count in stats.items():
+            self.stats[key] = self.stats.get(key, 0) + count
+
+    def prune(self, live_paths: Optional[Iterable[str]] = None, keep_prefixes: Iterable[str] = ()):
+        """
+        Drop rows for files not seen this run (deleted or no longer read)
+
+        Args:
+            live_paths: Paths to keep (defaults to every path looked up this run)
+            keep_prefixes: Directories whose rows are kept regardless (e.g. projects
+                           whose analysis timed out before reaching every file)
+        """
+        live = set(live_paths) if live_paths is not None else self.seen
+        keep_prefixes = tuple(keep_prefixes)
+        stale = [path for path in self.entries
+                 if path not in live and not (keep_prefixes and path.startswith(keep_prefixes))]
+
+        # Over the cap: evict the least recently used of the remaining rows
+        overflow = len(self.entries) - len(stale) - self.max_entries
+        if overflow > 0:
+            stale_set = set(stale)
+            used = dict(self.conn.execute("SELECT path, used FROM files"))
+            kept = [path for path in self.entries if path not in stale_set]
+            kept.sort(key=lambda path: self.run_started if path in self.seen else used.get(path) or 0)
+            stale.extend(kept[:overflow])
+
+        for path in stale:
+            del self.entries[path]
+            self._pending.pop(path, None)
+        if stale:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in stale])
+        return len(stale)
+
+    def save(self):
+        """Write new and refreshed rows (and last-used times) in one transaction"""
+        if self._pending:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime, size, sha1, role, version, partial, used)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(path,) + record + (self.run_started,) for path, record in self._pending.items()]
+            )
+        # Rows served from the cache this run count as recently used
+        touched = [(self.run_started, path) for path in self.seen if path not in self._pending]
+        if touched:
+            self.conn.executemany("UPDATE files SET used = ? WHERE path = ?", touched)
+        self._pending = {}
+        self.conn.commit()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Filesystem Snapshot - One walk of the active projects tree shared by every scanner
+The active-projects root is walked once with os.scandir, pruning ignored
+directories (node_modules, .git, venv, ...) before descending. Each file is
+stat()ed once and kept as a FileEntry (path, size, mtime, ctime, suffix), so
+the collector, content extractor, weekly progress and context agents query
+the same in-memory snapshot instead of each running its own rglob("*").
+
+Usage:
+    python fs_snapshot.py [root]
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+ACTIVE_DIR = Path("/Users/elizabethknopf/Documents/claudec/active")
+
+# Never descended into
+IGNORED_DIRS = frozenset({'node_modules', '.git', '__pycache__', 'venv', '.venv'})
+
+# Seconds a shared snapshot is reused before the tree is walked again
+SNAPSHOT_MAX_AGE = 60
+
+
+class FileEntry(NamedTuple):
+    """One file in the snapshot"""
+    path: str      # absolute path
+    rel: str       # path relative to the project directory
+    project: str   # top-level project directory name
+    name: str
+    suffix: str    # as on disk ('' when there is none)
+    size: int
+    mtime: float
+    ctime: float
+
+    @property
+    def ext(self) -> str:
+        return self.suffix.lower()
+
+    @property
+    def hidden(self) -> bool:
+        return self.name.startswith('.')
+
+
+class FileSnapshot:
+    """In-memory file table for every project under a root directory"""
+
+    _shared: Dict[str, 'FileSnapshot'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root: Path, ignored_dirs=IGNORED_DIRS):
+        self.root = Path(root)
+        self.ignored_dirs = frozenset(ignored_dirs)
+        self.projects: Dict[str, List[FileEntry]] = {}
+        self.project_ctimes: Dict[str, float] = {}
+        self.scanned_at: Optional[float] = None
+
+    @classmethod
+    def shared(cls, root: Path = ACTIVE_DIR, max_age: float = SNAPSHOT_MAX_AGE,
+               refresh: bool = False) -> 'FileSnapshot':
+        """
+        Process-wide snapshot of a root, re-walked once it is older than max_age
+
+        Args:
+            root: Directory whose subdirectories are the projects
+            max_age: Seconds a previous walk stays valid
+            refresh: Walk the tree again regardless of age
+        """
+        key = str(Path(root).resolve())
+        with cls._shared_lock:
+            snapshot = cls._shared.get(key)
+            if refresh or snapshot is None or snapshot.age > max_age:
+                snapshot = cls(root).scan()
+                cls._shared[key] = snapshot
+            return snapshot
+
+    @classmethod
+    def project_files(cls, project_dir: Path, max_age: float = SNAPSHOT_MAX_AGE) -> List[FileEntry]:
+        """
+        Files of one project directory
+
+        Served from a fresh shared snapshot of its parent when one exists;
+        otherwise only that directory is walked.
+        """
+        project_dir = Path(project_dir)
+        with cls._shared_lock:
+            snapshot = cls._shared.get(str(project_dir.parent.resolve()))
+        if snapshot is not None and snapshot.age <= max_age and project_dir.name in snapshot.projects:
+            return snapshot.projects[project_dir.name]
+        return cls(project_dir.parent).scan(only=[project_dir.name]).projects.get(project_dir.name, [])
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.scanned_at if self.scanned_at else float('inf')
+
+    def scan(self, only: Optional[List[str]] = None) -> 'FileSnapshot':
+        """Walk the root (or just the named projects) and rebuild the file table"""
+        self.projects = {}
+        self.project_ctimes = {}
+        try:
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    if only is not None and entry.name not in only:
+                        continue
+                    if entry.name.startswith('.') or not entry.is_dir():
+                        continue
+                    try:
+                        self.project_ctimes[entry.name] = entry.stat().st_ctime
+                    except OSError:
+                        continue
+                    self.projects[entry.name] = self._walk(entry.path, entry.name)
+        except OSError:
+            pass
+        self.scanned_at = time.time()
+        return self
+
+    def _walk(self, top: str, project: str) -> List[FileEntry]:
+        files = []
+        prefix = len(top) + 1
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.ignored_dirs:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files.append(FileEntry(
+                                entry.path, entry.path[prefix:], project, entry.name,
+                                os.path.splitext(entry.name)[1],
+                                stat.st_size, stat.st_mtime, stat.st_ctime
+                            ))
+                    except OSError:
+                        continue
+        return files
+
+    def project_names(self) -> List[str]:
+        return sorted(self.projects)
+
+    def project_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def files(self, project: Optional[str] = None, include_hidden: bool = True) -> Iterator[FileEntry]:
+        """Every file, or only one project's files"""
+        projects = [project] if project is not None else self.project_names()
+        for name in projects:
+            for entry in self.projects.get(name, []):
+                if include_hidden or not entry.hidden:
+                    yield entry
+
+    @property
+    def file_count(self) -> int:
+        return sum(len(files) for files in self.projects.values())
+
+
+def main():
+    root = Path(sys.argv[1]) if len(sys.argv) > 1 else ACTIVE_DIR
+    start = time.perf_counter()
+    snapshot = FileSnapshot(root).scan()
+    elapsed = time.perf_counter() - start
+
+    print(f"📁 {root}")
+    print(f"   {len(snapshot.projects)} projects, {snapshot.file_count:,} files in {elapsed:.2f}s")
+    for name in snapshot.project_names():
+        files = snapshot.projects[name]
+        print(f"   {name}: {len(files):,} files, {sum(f.size for f in files) / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
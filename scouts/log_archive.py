@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Log Archive - Compressed, searchable store for rotated chat logs
+A rotated log is split into records (log entries and checkpoint markers),
+grouped into blocks of about 64 KB, and written as one gzip member per
+block, so the archive is still a plain .md.gz that gunzip reads whole. A
+per-project SQLite index keeps each block's byte range, time span and
+keywords, so a query such as "checkpoints mentioning X in the last 30 days"
+decompresses only the blocks that can match.
+
+Usage:
+    python log_archive.py <project_dir> <text> [--days N] [--checkpoints]
+"""
+
+import argparse
+import re
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+ARCHIVE_DIRNAME = "log_archive"
+
+# Uncompressed bytes per independently decompressible block
+BLOCK_SIZE = 64 * 1024
+
+GZIP_WBITS = 31  # zlib wbits for a gzip member
+
+ENTRY_PATTERN = re.compile(r'^\*\*\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+CHECKPOINT_HEADING = '## Context Checkpoint'
+CHECKPOINT_TIMESTAMP = re.compile(r'^\*\*Timestamp\*\*:\s*(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', re.MULTILINE)
+TERM_PATTERN = re.compile(r'\w{2,}')
+LEGACY_ARCHIVE_GLOB = "log_archived_*.md"
+
+
+class LogRecord(NamedTuple):
+    """One log entry or checkpoint marker"""
+    kind: str                  # 'entry', 'checkpoint' or 'header'
+    timestamp: Optional[float]
+    text: str
+
+
+def split_records(text: str) -> List[LogRecord]:
+    """Split log text at entry and checkpoint headings"""
+    records = []
+    current: List[str] = []
+    kind, timestamp = 'header', None
+
+    def close():
+        if current:
+            body = ''.join(current)
+            stamp = timestamp
+            if kind == 'checkpoint':
+                match = CHECKPOINT_TIMESTAMP.search(body)
+                stamp = _parse_time(match.group(1)) if match else None
+            records.append(LogRecord(kind, stamp, body))
+
+    for line in text.splitlines(keepends=True):
+        entry = ENTRY_PATTERN.match(line)
+        if entry or line.startswith(CHECKPOINT_HEADING):
+            close()
+            current = []
+            kind = 'entry' if entry else 'checkpoint'
+            timestamp = _parse_time(entry.group(1)) if entry else None
+        current.append(line)
+    close()
+    return records
+
+
+def terms_of(text: str) -> set:
+    return set(TERM_PATTERN.findall(text.lower()))
+
+
+def _parse_time(value: str) -> Optional[float]:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S").timestamp()
+    except ValueError:
+        return None
+
+
+class LogArchive:
+    """Compressed archives and their block/keyword index for one project"""
+
+    def __init__(self, project_dir: Path):
+        self.project_dir = Path(project_dir)
+        self.archive_dir = self.project_dir / ARCHIVE_DIRNAME
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.archive_dir / "index.db"))
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS archives ("
+            " name TEXT PRIMARY KEY, archived_at REAL, first_ts REAL, last_ts REAL,"
+            " raw_bytes INTEGER, stored_bytes INTEGER, entries INTEGER, checkpoints INTEGER);"
+            "CREATE TABLE IF NOT EXISTS blocks ("
+            " archive TEXT, block INTEGER, offset INTEGER, length INTEGER,"
+            " first_ts REAL, last_ts REAL, checkpoints INTEGER, PRIMARY KEY (archive, block));"
+            "CREATE TABLE IF NOT EXISTS terms ("
+            " term TEXT, archive TEXT, block INTEGER, PRIMARY KEY (term, archive, block)) WITHOUT ROWID;"
+        )
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def add(self, log_file: Path, name: Optional[str] = None, archived_at: Optional[float] = None) -> Path:
+        """
+        Compress a rotated log into the archive and index it
+
+        Args:
+            log_file: Log to archive (left in place; the caller removes it)
+            name: Archive name without extension (defaults to the file stem)
+            archived_at: Rotation time (defaults to the file's mtime)
+
+        Returns:
+            Path of the .md.gz archive
+        """
+        log_file = Path(log_file)
+        name = name or log_file.stem
+        archived_at = archived_at if archived_at is not None else log_file.stat().st_mtime
+        with open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+        records = split_records(text)
+
+        archive_file = self.archive_dir / f"{name}.md.gz"
+        tmp_file = archive_file.with_suffix('.tmp')
+        blocks, terms = [], []
+        offset = 0
+        with open(tmp_file, 'wb') as out:
+            for number, block in enumerate(self._blocks(records)):
+                raw = ''.join(record.text for record in block).encode('utf-8')
+                compressor = zlib.compressobj(9, zlib.DEFLATED, GZIP_WBITS)
+                data = compressor.compress(raw) + compressor.flush()
+                out.write(data)
+
+                stamps = [record.timestamp for record in block if record.timestamp is not None]
+                blocks.append((name, number, offset, len(data),
+                               min(stamps, default=None), max(stamps, default=None),
+                               sum(1 for record in block if record.kind == 'checkpoint')))
+                terms.extend((term, name, number) for term in terms_of(raw.decode('utf-8')))
+                offset += len(data)
+        tmp_file.replace(archive_file)
+
+        stamps = [block[4] for block in blocks if block[4] is not None] + [block[5] for block in blocks if block[5] is not None]
+        self._forget(name)
+        self.conn.execute("INSERT INTO archives VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (
+            name, archived_at, min(stamps, default=None), max(stamps, default=None),
+            len(text.encode('utf-8')), offset,
+            sum(1 for record in records if record.kind == 'entry'),
+            sum(1 for record in records if record.kind == 'checkpoint')
+        ))
+        self.conn.executemany("INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?, ?)", blocks)
+        self.conn.executemany("INSERT OR IGNORE INTO terms VALUES (?, ?, ?)", terms)
+        self.conn.commit()
+        return archive_file
+
+    def import_legacy(self) -> List[Path]:
+        """Compress uncompressed log_archived_*.md files left by earlier rotations"""
+        imported = []
+        for legacy in sorted(self.project_dir.glob(LEGACY_ARCHIVE_GLOB)):
+            imported.append(self.add(legacy))
+            legacy.unlink()
+        return imported
+
+    @staticmethod
+    def _blocks(records: List[LogRecord]) -> Iterable[List[LogRecord]]:
+        """Group whole records into blocks of about BLOCK_SIZE bytes"""
+        block, size = [], 0
+        for record in records:
+            length = len(record.text.encode('utf-8'))
+            if block and size + length > BLOCK_SIZE:
+                yield block
+                block, size = [], 0
+            block.append(record)
+            size += length
+        if block:
+            yield block
+
+    def _forget(self, name: str):
+        for table in ("archives", "blocks", "terms"):
+            column = "name" if table == "archives" else "archive"
+            self.conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (name,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def search(self, text: str = "", days: Optional[int] = None,
+               kinds: Iterable[str] = ('entry', 'checkpoint')) -> List[Dict]:
+        """
+        Archived records containing text (case-insensitive), newest first
+
+        Args:
+            text: Words to look for, matched as whole words ('' matches every record)
+            days: Only records from the last N days
+            kinds: Record kinds to return ('entry', 'checkpoint', 'header')
+
+        Returns:
+            [{"archive", "kind", "timestamp", "text"}]
+        """
+        since = time.time() - days * 86400 if days is not None else None
+        kinds = set(kinds)
+        needle = text.lower()
+
+        results = []
+        for archive, block, offset, length in self._candidate_blocks(needle, since):
+            for record in split_records(self._read_block(archive, offset, length)):
+                if record.kind not in kinds:
+                    continue
+                if since is not None and (record.timestamp is None or record.timestamp < since):
+                    continue
+                if needle and not self._mentions(record, needle):
+                    continue
+                results.append({
+                    "archive": archive,
+                    "kind": record.kind,
+                    "timestamp": datetime.fromtimestamp(record.timestamp).isoformat() if record.timestamp else None,
+                    "text": record.text.strip()
+                })
+        return sorted(results, key=lambda r: r["timestamp"] or "", reverse=True)
+
+    def checkpoints_mentioning(self, text: str, days: Optional[int] = None) -> List[Dict]:
+        """
+        Checkpoints whose session segment (the entries since the previous checkpoint) mentions text
+
+        Returns:
+            [{"archive", "checkpoint", "matches"}] newest first
+        """
+        since = time.time() - days * 86400 if days is not None else None
+        needle = text.lower()
+        candidates = {(archive, block) for archive, block, _, _ in self._candidate_blocks(needle, since)}
+        if not candidates:
+            return []
+
+        found = []
+        for archive in sorted({archive for archive, _ in candidates}):
+            # A segment may start in an earlier block, so read forward from the first candidate
+            rows = self.conn.execute(
+                "SELECT block, offset, length, checkpoints FROM blocks WHERE archive = ? ORDER BY block", (archive,)
+            ).fetchall()
+            first = min(block for name, block in candidates if name == archive)
+            matches: List[str] = []
+            for block, offset, length, checkpoints in rows:
+                # Only blocks that can match, or that close a segment with matches
+                if block < first or ((archive, block) not in candidates and not (matches and checkpoints)):
+                    continue
+                for record in split_records(self._read_block(archive, offset, length)):
+                    if record.kind == 'checkpoint':
+                        if matches and (since is None or (record.timestamp or 0) >= since):
+                            found.append({
+                                "archive": archive,
+                                "checkpoint": datetime.fromtimestamp(record.timestamp).isoformat() if record.timestamp else None,
+                                "matches": matches
+                            })
+                        matches = []
+                    elif record.kind == 'entry' and self._mentions(record, needle):
+                        matches.append(record.text.strip())
+        return sorted(found, key=lambda r: r["checkpoint"] or "", reverse=True)
+
+    @staticmethod
+    def _mentions(record: LogRecord, needle: str) -> bool:
+        return needle in record.text.lower() and terms_of(needle) <= terms_of(record.text)
+
+    def _candidate_blocks(self, needle: str, since: Optional[float]) -> List[Tuple[str, int, int, int]]:
+        """Blocks whose keywords and time span can satisfy a query"""
+        query = "SELECT b.archive, b.block, b.offset, b.length FROM blocks b"
+        params: List = []
+        conditions = []
+        for number, term in enumerate(sorted(terms_of(needle))):
+            # Every whole word of the query must occur in the block
+            query += f" JOIN terms t{number} ON t{number}.archive = b.archive AND t{number}.block = b.block AND t{number}.term = ?"
+            params.append(term)
+        if since is not None:
+            conditions.append("(b.last_ts IS NULL OR b.last_ts >= ?)")
+            params.append(since)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return self.conn.execute(query + " ORDER BY b.archive, b.block", params).fetchall()
+
+    def _read_block(self, archive: str, offset: int, length: int) -> str:
+        """Decompress one block (a single gzip member) from an archive"""
+        with open(self.archive_dir / f"{archive}.md.gz", 'rb') as f:
+            f.seek(offset)
+            data = f.read(length)
+        return zlib.decompress(data, GZIP_WBITS).decode('utf-8')
+
+    def stats(self) -> Dict:
+        row = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(stored_bytes), 0),"
+            " COALESCE(SUM(entries), 0), COALESCE(SUM(checkpoints), 0) FROM archives"
+        ).fetchone()
+        return dict(zip(("archives", "raw_bytes", "stored_bytes", "entries", "checkpoints"), row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search a project's compressed log archive")
+    parser.add_argument('project', help="Project directory")
+    parser.add_argument('text', nargs='?', default="", help="Text to search for")
+    parser.add_argument('--days', type=int, help="Only the last N days")
+    parser.add_argument('--checkpoints', action='store_true', help="Group matches by checkpoint")
+    args = parser.parse_args()
+
+    archive = LogArchive(Path(args.project))
+    imported = archive.import_legacy()
+    if imported:
+        print(f"🗜️  Compressed {len(imported)} legacy archives")
+
+    stats = archive.stats()
+    print(f"📦 {stats['archives']} archives, {stats['entries']} entries, {stats['checkpoints']} checkpoints "
+          f"({stats['raw_bytes'] / 1024:.0f} KB → {stats['stored_bytes'] / 1024:.0f} KB)")
+
+    if args.checkpoints:
+        for result in archive.checkpoints_mentioning(args.text, args.days):
+            print(f"\n📍 Checkpoint {result['checkpoint']} ({result['archive']}): {len(result['matches'])} matching entries")
+            for match in result['matches'][:3]:
+                print(f"   {match.splitlines()[0][:100]}")
+    else:
+        for result in archive.search(args.text, args.days):
+            print(f"\n🔎 {result['timestamp']} [{result['kind']}] ({result['archive']})")
+            print(f"   {result['text'][:200]}")
+
+
+if __name__ == "__main__":
+    main()
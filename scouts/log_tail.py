@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Log Tail - Incremental reader for a project's chat log (log.md)
+The log only ever grows by appends until it is rotated, so the counts the
+ContextSummaryAgent needs (messages since the last "## Context Checkpoint",
+entries per type for the session summary) are kept in a small sidecar next
+to the log together with the byte offset they cover. Each check reads only
+the bytes appended since then. When the sidecar is missing or no longer
+matches the file (rotated, rewritten), the log is read backwards in blocks
+just far enough to find the last checkpoint.
+
+Usage:
+    python log_tail.py path/to/log.md
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+# Bytes read per step when scanning backwards
+BLOCK_SIZE = 64 * 1024
+
+# Bytes before the offset remembered to detect a rewritten log
+FINGERPRINT_BYTES = 64
+
+CHECKPOINT_MARKER = '## Context Checkpoint'.encode('utf-8')
+MESSAGE_PREFIXES = tuple(prefix.encode('utf-8') for prefix in ('**[', '**User', '**Assistant'))
+ENTRY_TYPE_ICONS = [(icon.encode('utf-8'), entry_type) for icon, entry_type in
+                    (('💬', 'message'), ('⚡', 'command'), ('❌', 'error'), ('✅', 'success'))]
+
+
+def sidecar_path(log_file: Path) -> Path:
+    """Hidden state file kept next to the log"""
+    return log_file.parent / f".{log_file.name}.tail.json"
+
+
+class LogTail:
+    """Running checkpoint and session counts for one append-only log"""
+
+    def __init__(self, log_file: Path):
+        self.log_file = Path(log_file)
+        self.state_file = sidecar_path(self.log_file)
+        self.state = self._load()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def messages_since_checkpoint(self) -> Optional[int]:
+        """Message lines after the last checkpoint marker (None when there is no marker)"""
+        self.update()
+        count, found = self.state['messages'], self.state['found_checkpoint']
+        # The unterminated last line counts too, but is not committed to the state
+        line = self._partial_line()
+        if CHECKPOINT_MARKER in line:
+            return 0
+        if line.startswith(MESSAGE_PREFIXES):
+            count += 1
+        return count if found else None
+
+    def should_checkpoint(self, interval: int) -> bool:
+        """Same rule as before: enough messages since the last checkpoint, or none yet"""
+        count = self.messages_since_checkpoint()
+        return count is None or count >= interval
+
+    def session_data(self) -> Dict:
+        """Entry counts for the session summary (the shape _generate_session_summary takes)"""
+        self.update()
+        if self.state['session'] is None:
+            # First summary after a backward rebuild: count the part not yet covered
+            self.state['session'] = self._count_entries(0, self.state['offset'])
+            self._save()
+        session = json.loads(json.dumps(self.state['session']))
+        self._count_line(self._partial_line(), session)
+        return {
+            "total_entries": session["total_entries"],
+            "entry_types": session["entry_types"],
+            "session_duration": None,
+            "key_activities": []
+        }
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def update(self):
+        """Fold the bytes appended since the last call into the running counts"""
+        try:
+            stat = os.stat(self.log_file)
+        except OSError:
+            self.state = self._empty()
+            return
+        if not self._still_valid(stat):
+            self._rebuild(stat)
+            return
+
+        end = self._last_line_end(self.state['offset'], stat.st_size)
+        if end <= self.state['offset']:
+            return
+        with open(self.log_file, 'rb') as f:
+            f.seek(self.state['offset'])
+            data = f.read(end - self.state['offset'])
+        for line in data.split(b'\n')[:-1]:
+            self._fold_line(line)
+        self.state['offset'] = end
+        self._save()
+
+    def reset(self):
+        """Forget the state (the log was rotated or recreated)"""
+        self.state = self._empty()
+        try:
+            self.state_file.unlink()
+        except OSError:
+            pass
+
+    def _fold_line(self, line: bytes):
+        if CHECKPOINT_MARKER in line:
+            self.state['found_checkpoint'] = True
+            self.state['messages'] = 0
+        elif line.startswith(MESSAGE_PREFIXES):
+            self.state['messages'] += 1
+        if self.state['session'] is not None:
+            self._count_line(line, self.state['session'])
+
+    @staticmethod
+    def _count_line(line: bytes, session: Dict):
+        if b'**[' in line and b']' in line:
+            session["total_entries"] += 1
+            for icon, entry_type in ENTRY_TYPE_ICONS:
+                if icon in line:
+                    session["entry_types"][entry_type] = session["entry_types"].get(entry_type, 0) + 1
+                    break
+
+    def _count_entries(self, start: int, end: int) -> Dict:
+        """Session counts over a byte range of complete lines, read in blocks"""
+        session = {"total_entries": 0, "entry_types": {}}
+        carry = b''
+        with open(self.log_file, 'rb') as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                data = carry + f.read(min(BLOCK_SIZE, remaining))
+                remaining = end - f.tell()
+                lines = data.split(b'\n')
+                carry = lines.pop()
+                for line in lines:
+                    self._count_line(line, session)
+        return session
+
+    def _rebuild(self, stat: os.stat_result):
+        """Scan backwards from the end just far enough to find the last checkpoint"""
+        state = self._empty()
+        state['inode'] = stat.st_ino
+        end = self._last_line_end(0, stat.st_size)
+        messages = 0
+        found = False
+
+        with open(self.log_file, 'rb') as f:
+            pos = end
+            carry = b''
+            while pos > 0 and not found:
+                start = max(0, pos - BLOCK_SIZE)
+                f.seek(start)
+                data = f.read(pos - start) + carry
+                lines = data.split(b'\n')
+                # The first piece may continue in the older block; keep it for the next step
+                carry = lines.pop(0) if start > 0 else b''
+                for line in reversed(lines):
+                    if CHECKPOINT_MARKER in line:
+                        found = True
+                        break
+                    if line.startswith(MESSAGE_PREFIXES):
+                        messages += 1
+                pos = start
+
+        state['offset'] = end
+        state['messages'] = messages
+        state['found_checkpoint'] = found
+        # Entry counts need the whole log; computed on the first session summary
+        state['session'] = None
+        self.state = state
+        self._save()
+
+    def _still_valid(self, stat: os.stat_result) -> bool:
+        state = self.state
+        if state['inode'] != stat.st_ino or stat.st_size < state['offset']:
+            return False
+        return self._fingerprint(state['offset']) == state['fingerprint']
+
+    def _fingerprint(self, offset: int) -> str:
+        start = max(0, offset - FINGERPRINT_BYTES)
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(start)
+                return f.read(offset - start).hex()
+        except OSError:
+            return ''
+
+    def _last_line_end(self, start: int, size: int) -> int:
+        """Offset just past the last newline at or after start (start when there is none)"""
+        pos = size
+        with open(self.log_file, 'rb') as f:
+            while pos > start:
+                block_start = max(start, pos - BLOCK_SIZE)
+                f.seek(block_start)
+                newline = f.read(pos - block_start).rfind(b'\n')
+                if newline != -1:
+                    return block_start + newline + 1
+                pos = block_start
+        return start
+
+    def _partial_line(self) -> bytes:
+        """Text after the last newline (a line still being written)"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(self.state['offset'])
+                return f.read()
+        except OSError:
+            return b''
+
+    @staticmethod
+    def _empty() -> Dict:
+        return {
+            'inode': None,
+            'offset': 0,
+            'fingerprint': '',
+            'messages': 0,
+            'found_checkpoint': False,
+            'session': {"total_entries": 0, "entry_types": {}}
+        }
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            if set(state) == set(self._empty()):
+                return state
+        except (OSError, ValueError):
+            pass
+        state = self._empty()
+        # Without a sidecar the log has to be located again
+        state['inode'] = -1
+        return state
+
+    def _save(self):
+        self.state['fingerprint'] = self._fingerprint(self.state['offset'])
+        tmp_file = self.state_file.with_suffix('.tmp')
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self.state, f)
+            tmp_file.replace(self.state_file)
+        except OSError:
+            pass
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python log_tail.py path/to/log.md")
+        sys.exit(1)
+
+    tail = LogTail(Path(sys.argv[1]))
+    count = tail.messages_since_checkpoint()
+    session = tail.session_data()
+    print(f"📜 {tail.log_file}")
+    print(f"   Messages since last checkpoint: {count if count is not None else 'no checkpoint yet'}")
+    print(f"   Session entries: {session['total_entries']} {session['entry_types']}")
+    print(f"   Bytes covered: {tail.state['offset']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Markdown Extractor - Tokenize a markdown document once for every content extractor
+A MarkdownDocument splits the text into lines and heading sections a single
+time. The extractors then look sections up by title, read bullets under a
+heading, and pair inline "Problem: ... Solution: ..." markers using
+precompiled patterns. This replaces one DOTALL regex pass per extractor,
+whose lazy spans backtracked over the rest of the file for every candidate.
+Every lookup is a linear scan, so multi-megabyte files stay bounded.
+"""
+
+import bisect
+import re
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+# Section titles (the text of a "##"+ heading line)
+INSIGHT_SECTIONS = re.compile(r"insights?|learnings?|discoveries")
+INSIGHT_BULLET_SECTIONS = re.compile(r"insights?")
+GUIDE_SECTIONS = re.compile(r"step\s+\d+|installation|setup")
+STORY_SECTIONS = re.compile(r"story|example|case study|success|journey")
+PROBLEM_SECTIONS = re.compile(r"problem|challenge|issue")
+SOLUTION_SECTIONS = re.compile(r"solution|resolution|fix")
+
+# Inline markers; the text after each runs to the end of its line
+INSIGHT_MARKERS = re.compile(r"(?:key insight|learned|discovery|finding|realized):", re.IGNORECASE)
+INSIGHT_BOLD_MARKERS = re.compile(r"\*\*(?:insight|learning|discovery)\*\*:", re.IGNORECASE)
+TIP_MARKERS = re.compile(r"(?:tip|trick|pro tip|protip|note|important):", re.IGNORECASE)
+TIP_EMOJI_MARKERS = re.compile(r"💡")
+TIP_BOLD_MARKERS = re.compile(r"\*\*tip\*\*:", re.IGNORECASE)
+STEP_MARKERS = re.compile(r"step\s+\d+|^\d+\.", re.IGNORECASE | re.MULTILINE)
+
+# Inline pairs; the first text runs to the second marker, the second to a blank line
+PROBLEM_MARKERS = re.compile(r"(?:problem|challenge):", re.IGNORECASE)
+SOLUTION_MARKERS = re.compile(r"(?:solution|fix):", re.IGNORECASE)
+BEFORE_MARKERS = re.compile(r"(?:before|problem):", re.IGNORECASE)
+AFTER_MARKERS = re.compile(r"(?:after|solution):", re.IGNORECASE)
+
+IMPACT_PATTERNS = [
+    re.compile(r"(?:saved?|saving)\s+(\d+\s*(?:hours?|minutes?|days?))", re.IGNORECASE),
+    re.compile(r"(?:reduced|decreased)\s+(?:by\s+)?(\d+%)", re.IGNORECASE),
+    re.compile(r"(?:increased|improved)\s+(?:by\s+)?(\d+%)", re.IGNORECASE),
+    re.compile(r"\$(\d+(?:,\d+)*)\s*(?:saved|revenue|profit)", re.IGNORECASE),
+]
+
+TECH_KEYWORDS = [
+    "Python", "JavaScript", "React", "Node.js", "Flask", "FastAPI",
+    "PostgreSQL", "MongoDB", "Redis", "Docker", "Kubernetes",
+    "AWS", "GCP", "Azure", "Supabase", "Firebase",
+    "Claude", "GPT", "OpenAI", "AI", "ML"
+]
+TECH_PATTERN = re.compile(
+    "|".join(rf"(?P<k{i}>\b{keyword}\b)" for i, keyword in enumerate(TECH_KEYWORDS)),
+    re.IGNORECASE
+)
+
+DOCSTRING_PATTERN = re.compile(r'"""(.+?)"""', re.DOTALL)
+
+
+class MarkdownDocument:
+    """Markdown text split once into lines and "##"-level heading sections"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.split('\n')
+        # (line number, lowercased title) for every line starting with "##"
+        self.headings = [
+            (number, line.lstrip('#').strip().lower())
+            for number, line in enumerate(self.lines) if line.startswith('##')
+        ]
+
+    def _section_end(self, index: int) -> int:
+        return self.headings[index + 1][0] if index + 1 < len(self.headings) else len(self.lines)
+
+    def section_text(self, index: int) -> str:
+        """Body of the index-th heading, up to the next "##" heading"""
+        start = self.headings[index][0] + 1
+        return '\n'.join(self.lines[start:self._section_end(index)])
+
+    def sections(self, titles: Pattern) -> Iterator[Tuple[int, str]]:
+        """(heading index, body) for every heading whose whole title matches"""
+        for index, (_, title) in enumerate(self.headings):
+            if titles.fullmatch(title):
+                yield index, self.section_text(index)
+
+    def section_pairs(self, first: Pattern, second: Pattern) -> Iterator[Tuple[str, str]]:
+        """
+        (first body, second body) for a `first` heading followed by a `second` heading
+
+        The first body runs up to the second heading, across any headings in
+        between; the second body is that heading's own section.
+        """
+        seconds = [index for index, (_, title) in enumerate(self.headings) if second.fullmatch(title)]
+        index = 0
+        while index < len(self.headings):
+            if first.fullmatch(self.headings[index][1]):
+                start = self.headings[index][0] + 1
+                k = bisect.bisect_right(seconds, index)
+                # The first body needs at least one line
+                if k < len(seconds) and self.headings[seconds[k]][0] == start:
+                    k += 1
+                if k < len(seconds):
+                    other = seconds[k]
+                    yield '\n'.join(self.lines[start:self.headings[other][0]]), self.section_text(other)
+                    index = other
+            index += 1
+
+    def bullets_under(self, titles: Pattern) -> List[str]:
+        """Bullet lines directly under the first matching heading that has any"""
+        for index, (number, title) in enumerate(self.headings):
+            if not titles.fullmatch(title):
+                continue
+            line = number + 1
+            while line < len(self.lines) and not self.lines[line].strip():
+                line += 1
+            bullets = []
+            # A bullet line needs its trailing newline (so never the last line)
+            while line < len(self.lines) - 1 and self.lines[line][:1] in ('-', '*') and len(self.lines[line]) > 1:
+                bullets.append(self.lines[line][1:].strip())
+                line += 1
+            if bullets:
+                return bullets
+        return []
+
+    def after_markers(self, markers: Pattern) -> List[str]:
+        """Text following each marker, up to the end of its line"""
+        content = self.content
+        results = []
+        pos = 0
+        while True:
+            match = markers.search(content, pos)
+            if not match:
+                return results
+            start = self._skip_space(match.end())
+            if start >= len(content):
+                return results
+            end = content.find('\n', start)
+            if end == -1:
+                end = len(content)
+            results.append(content[start:end])
+            pos = end
+
+    def step_lines(self) -> List[str]:
+        """Text after each "Step N" / "N." marker, up to the end of its line"""
+        content = self.content
+        results = []
+        pos = 0
+        while True:
+            match = STEP_MARKERS.search(content, pos)
+            if not match:
+                return results
+            start = self._skip_space(match.end())
+            if start < len(content) and content[start] in ':-':
+                start = self._skip_space(start + 1)
+            if start >= len(content):
+                return results
+            end = content.find('\n', start)
+            if end == -1:
+                end = len(content)
+            results.append(content[start:end])
+            pos = end
+
+    def marker_pairs(self, first: Pattern, second: Pattern, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """
+        (first text, second text) for "First: ... Second: ..." spans
+
+        The first text runs to the next `second` marker; the second text runs
+        to the next blank line. Both marker lists are found in one scan each.
+        """
+        content = self.content
+        firsts = [(m.start(), m.end()) for m in first.finditer(content)]
+        if not firsts:
+            return []
+        seconds = [(m.start(), m.end()) for m in second.finditer(content)]
+
+        pairs = []
+        pos = 0
+        j = 0
+        for first_start, first_end in firsts:
+            if first_start < pos:
+                continue
+            while j < len(seconds) and seconds[j][0] <= first_end:
+                j += 1
+            if j == len(seconds):
+                break
+            second_start, second_end = seconds[j]
+            start = self._skip_space(second_end)
+            if start >= len(content):
+                break
+            end = content.find('\n\n', start + 1)
+            pos = end + 2 if end != -1 else len(content)
+            if end == -1:
+                end = len(content)
+            pairs.append((content[first_end:second_start], content[start:end]))
+            if limit and len(pairs) >= limit:
+                break
+        return pairs
+
+    def _skip_space(self, pos: int) -> int:
+        content = self.content
+        while pos < len(content) and content[pos].isspace():
+            pos += 1
+        return pos
+
+
+def tech_keywords(content: str) -> List[str]:
+    """Technology keywords mentioned anywhere in the text (one scan)"""
+    return list({TECH_KEYWORDS[int(match.lastgroup[1:])] for match in TECH_PATTERN.finditer(content)})
+
+
+def impact_metrics(content: str) -> List[Tuple[str, str]]:
+    """(matched phrase, value) for every savings / growth metric"""
+    return [(match.group(0), match.group(1)) for pattern in IMPACT_PATTERNS for match in pattern.finditer(content)]
+
+
+def docstrings(content: str) -> List[str]:
+    return DOCSTRING_PATTERN.findall(content)
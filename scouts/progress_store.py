@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Progress Store - In-memory progress database with a write-behind JSON-lines log
+The WeeklyProgressAgent's database (weekly summaries, daily progress,
+milestones, metrics) lives in memory with a sorted week index, so trend and
+accomplishment queries read the newest N weeks without re-sorting. Each
+change is queued as one JSON line and appended by a background flush a
+moment later (and at exit), instead of re-serializing the whole database on
+every save. The log is replayed on load and compacted once superseded lines
+outnumber live ones.
+
+Usage:
+    python progress_store.py [store.jsonl]
+"""
+
+import atexit
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+STORE_FILE = Path(__file__).parent / "weekly_progress_database.jsonl"
+LEGACY_FILE = Path(__file__).parent / "weekly_progress_database.json"
+
+# Seconds a change may wait in memory before it is appended
+FLUSH_INTERVAL = 2.0
+
+# Log lines tolerated before compaction (and superseded lines per live record)
+COMPACT_MIN_LINES = 200
+COMPACT_RATIO = 2
+
+KEYED_SECTIONS = ("weekly_summaries", "daily_progress", "productivity_metrics")
+
+
+def empty_database() -> Dict[str, Any]:
+    """Shape of a new progress database"""
+    return {
+        "metadata": {
+            "created": datetime.now().isoformat(),
+            "last_updated": datetime.now().isoformat(),
+            "version": "1.0"
+        },
+        "weekly_summaries": {},
+        "daily_progress": {},
+        "milestones": [],
+        "productivity_metrics": {}
+    }
+
+
+class ProgressStore:
+    """Progress database held in memory, persisted as an append-only log"""
+
+    def __init__(self, store_file: Path = STORE_FILE, legacy_file: Optional[Path] = LEGACY_FILE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        """
+        Args:
+            store_file: JSON-lines log the database is persisted to
+            legacy_file: Whole-database JSON imported when the log does not exist yet
+            flush_interval: Seconds changes are held before a background append
+        """
+        self.store_file = Path(store_file)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self.flush_interval = flush_interval
+
+        self.data = empty_database()
+        self.weeks: List[str] = []  # sorted weekly_summaries keys
+        self.lines = 0
+        self._pending: List[str] = []
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+        self._load()
+        atexit.register(self.flush)
+
+    # ------------------------------------------------------------------
+    # Reads (in memory)
+    # ------------------------------------------------------------------
+
+    def latest_weeks(self, count: Optional[int] = None) -> List[str]:
+        """Newest week keys first (all of them when count is None)"""
+        with self._lock:
+            weeks = self.weeks if count is None else self.weeks[-count:] if count > 0 else []
+            return weeks[::-1]
+
+    def week(self, week_key: str) -> Optional[Dict[str, Any]]:
+        return self.data["weekly_summaries"].get(week_key)
+
+    @property
+    def week_count(self) -> int:
+        return len(self.weeks)
+
+    # ------------------------------------------------------------------
+    # Writes (write-behind)
+    # ------------------------------------------------------------------
+
+    def put(self, section: str, key: str, value: Any):
+        """Set one entry of a keyed section (weekly_summaries, daily_progress, ...)"""
+        with self._lock:
+            entries = self.data.setdefault(section, {})
+            if section == "weekly_summaries" and key not in entries:
+                bisect.insort(self.weeks, key)
+            entries[key] = value
+            self._append({"section": section, "key": key, "value": value})
+
+    def put_week(self, week_key: str, summary: Dict[str, Any]):
+        self.put("weekly_summaries", week_key, summary)
+
+    def replace(self, section: str, value: Any):
+        """Replace a whole section (e.g. the milestones list or metadata)"""
+        with self._lock:
+            self.data[section] = value
+            if section == "weekly_summaries":
+                self.weeks = sorted(value)
+            self._append({"section": section, "value": value})
+
+    def touch(self):
+        """Record the metadata's last-updated time"""
+        with self._lock:
+            self.data["metadata"]["last_updated"] = datetime.now().isoformat()
+            self.replace("metadata", self.data["metadata"])
+
+    def _append(self, record: Dict[str, Any]):
+        self._pending.append(json.dumps(record))
+        if self.flush_interval <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Append queued changes now (compacting the log when it has grown stale)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            self.store_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.store_file, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(pending) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.lines += len(pending)
+
+            if self.lines > max(COMPACT_MIN_LINES, COMPACT_RATIO * self._live_records()):
+                self.compact()
+
+    def compact(self):
+        """Rewrite the log as one line per live record"""
+        with self._lock:
+            records = [{"section": "metadata", "value": self.data["metadata"]}]
+            for section, value in self.data.items():
+                if section == "metadata":
+                    continue
+                if section in KEYED_SECTIONS and isinstance(value, dict):
+                    records.extend({"section": section, "key": key, "value": entry} for key, entry in value.items())
+                else:
+                    records.append({"section": section, "value": value})
+            # Queued changes are already part of the in-memory data
+            self._pending = []
+
+            tmp_file = self.store_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            tmp_file.replace(self.store_file)
+            self.lines = len(records)
+
+    def _live_records(self) -> int:
+        return 1 + sum(
+            len(value) if section in KEYED_SECTIONS and isinstance(value, dict) else 1
+            for section, value in self.data.items() if section != "metadata"
+        )
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if self.store_file.exists():
+            torn = False
+            with open(self.store_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    self.lines += 1
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn last line from an interrupted append
+                        torn = True
+                        continue
+                    if "key" in record:
+                        self.data.setdefault(record["section"], {})[record["key"]] = record["value"]
+                    else:
+                        self.data[record["section"]] = record["value"]
+            if torn:
+                # Rewrite so the next append does not continue the torn line
+                self.compact()
+        elif self.legacy_file is not None and self.legacy_file.exists():
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+            self.data.update(legacy)
+            self.compact()
+        self.weeks = sorted(self.data["weekly_summaries"])
+
+
+def main():
+    store_file = Path(sys.argv[1]) if len(sys.argv) > 1 else STORE_FILE
+    start = time.perf_counter()
+    store = ProgressStore(store_file)
+    elapsed = time.perf_counter() - start
+
+    print(f"🗄️  {store.store_file}")
+    print(f"   {store.week_count} weekly summaries, {store.lines} log lines, loaded in {elapsed * 1000:.1f} ms")
+    for week_key in store.latest_weeks(5):
+        print(f"   {week_key}: {store.week(week_key).get('progress_score', '?')}/100")
+
+
+if __name__ == "__main__":
+    main()
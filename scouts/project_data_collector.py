@@ -5,26 +5,62 @@ Collect real project data, statistics, and stories for social media content
 
 import json
 import os
+import signal
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.agent_framework import BaseAgent
 from scouts.content_extractor import ContentExtractor
+from scouts.extraction_index import ExtractionIndex
+from scouts.fs_snapshot import FileSnapshot
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+PROJECT_TIMEOUT = 120  # Seconds before one project's analysis is abandoned
+
+
+class ProjectTimeout(Exception):
+    """Raised inside a project's analysis when it exceeds its time limit"""
+
+
+@contextmanager
+def project_time_limit(seconds):
+    """Raise ProjectTimeout if the block runs longer than seconds (Unix main thread only)"""
+    if not seconds or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expired(signum, frame):
+        raise ProjectTimeout(f"Analysis timed out after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
 
 class ProjectDataCollector(BaseAgent):
     """Collects real data from projects for authentic social media content"""
 
-    def __init__(self):
+    def __init__(self, index_file=None):
         super().__init__(
             "project_data_collector",
             "Project Data Collector",
             "Collects real statistics, examples, and stories from projects"
         )
         self.active_dir = Path("/Users/elizabethknopf/Documents/claudec/active")
-        self.content_extractor = ContentExtractor()
+        # Per-file extraction results persist between runs; only changed files are re-read
+        self.index_file = Path(index_file) if index_file else Path(__file__).parent.parent / "data" / "project_index.db"
+        self.extraction_index = ExtractionIndex(self.index_file)
+        self.content_extractor = ContentExtractor(index=self.extraction_index)
 
     def get_capabilities(self):
         """Return list of agent capabilities"""
@@ -34,11 +70,21 @@ class ProjectDataCollector(BaseAgent):
         """Process a task request"""
         task_type = task.get("type", "collect_all")
         if task_type == "collect_all":
-            return self.collect_all_project_data()
+            return self.collect_all_project_data(
+                workers=task.get("workers", 1),
+                project_timeout=task.get("project_timeout", PROJECT_TIMEOUT)
+            )
         return {"error": "Unknown task type"}
 
-    def collect_all_project_data(self):
-        """Collect comprehensive data from all projects"""
+    def collect_all_project_data(self, workers=1, project_timeout=PROJECT_TIMEOUT, on_project=None):
+        """
+        Collect comprehensive data from all projects
+
+        Args:
+            workers: Process pool size; 1 analyzes projects serially. Output is identical
+            project_timeout: Seconds before a project's analysis is abandoned (0 = no limit)
+            on_project: Optional callback(name, project_data) as each project finishes
+        """
         all_data = {
             "collection_date": datetime.now().isoformat(),
             "projects": {},
@@ -59,24 +105,84 @@ class ProjectDataCollector(BaseAgent):
             "automation_examples": []
         }
 
-        # Scan each project
-        for project_dir in self.active_dir.iterdir():
-            if not project_dir.is_dir() or project_dir.name.startswith('.'):
-                continue
+        # Walk the whole tree once; every analyzer below reads this snapshot
+        snapshot = FileSnapshot.shared(self.active_dir, refresh=True)
 
-            project_data = self.analyze_project(project_dir)
-            all_data["projects"][project_dir.name] = project_data
+        # Scan each project
+        project_dirs = [snapshot.project_dir(name) for name in snapshot.project_names()]
+        if workers > 1 and len(project_dirs) > 1:
+            results = self._collect_parallel(project_dirs, workers, project_timeout, on_project)
+        else:
+            results = {}
+            for project_dir in project_dirs:
+                results[project_dir.name] = self._analyze_with_limit(project_dir, project_timeout)
+                if on_project:
+                    on_project(project_dir.name, results[project_dir.name])
+
+        # Merge in project order regardless of completion order
+        for project_dir in project_dirs:
+            all_data["projects"][project_dir.name] = results[project_dir.name]
             all_data["aggregate_stats"]["total_projects"] += 1
 
+        # Forget files that were deleted (or are no longer read) and persist the index;
+        # projects cut short by an error keep their rows for the next run
+        incomplete = [
+            os.path.join(data["path"], "") for data in all_data["projects"].values()
+            if data.get("error") or data.get("extract_error")
+        ]
+        self.extraction_index.prune(keep_prefixes=incomplete)
+        self.extraction_index.save()
+        stats = self.extraction_index.stats
+        print(f"🗂️  Extraction index: {stats['cached']} cached, {stats['rehashed']} unchanged after touch, "
+              f"{stats['shared']} shared by content, {stats['extracted']} extracted")
+
         # Generate insights
         all_data["insights"] = self.generate_insights(all_data)
         all_data["real_examples"] = self.extract_real_examples(all_data)
 
         return all_data
 
-    def analyze_project(self, project_dir):
-        """Analyze a single project for interesting data"""
-        data = {
+    def _collect_parallel(self, project_dirs, workers, project_timeout, on_project=None):
+        """Fan projects out across a process pool, streaming results as they finish"""
+        print(f"   ⚡ Parallel mode: {len(project_dirs)} projects across {workers} workers")
+
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.index_file),)) as executor:
+            futures = {
+                executor.submit(_analyze_project_worker, str(project_dir), project_timeout): project_dir
+                for project_dir in project_dirs
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                project_dir = futures[future]
+                try:
+                    project_data, exported = future.result()
+                    # Worker index updates are saved by this process only
+                    self.extraction_index.merge(exported)
+                except Exception as e:
+                    project_data = self._project_template(project_dir)
+                    project_data["error"] = f"Worker failed: {e}"
+
+                results[project_dir.name] = project_data
+                status = f"⚠️  {project_data['error']}" if project_data.get("error") else f"{project_data['file_count']:,} files"
+                print(f"   [{i}/{len(project_dirs)}] {project_dir.name}: {status}")
+                if on_project:
+                    on_project(project_dir.name, project_data)
+
+        return results
+
+    def _analyze_with_limit(self, project_dir, project_timeout):
+        """analyze_project, abandoned with an error entry once it exceeds project_timeout"""
+        try:
+            with project_time_limit(project_timeout):
+                return self.analyze_project(project_dir)
+        except ProjectTimeout as e:
+            data = self._project_template(project_dir)
+            data["error"] = str(e)
+            return data
+
+    def _project_template(self, project_dir):
+        return {
             "name": project_dir.name,
             "path": str(project_dir),
             "file_count": 0,
@@ -92,37 +198,40 @@ class ProjectDataCollector(BaseAgent):
             "estimated_complexity": "simple"
         }
 
+    def analyze_project(self, project_dir):
+        """Analyze a single project for interesting data"""
+        data = self._project_template(project_dir)
+
         try:
             # Count files and analyze structure
-            for file_path in project_dir.rglob("*"):
-                if file_path.is_file() and not any(skip in str(file_path) for skip in ['node_modules', '.git', '__pycache__', 'venv']):
-                    data["file_count"] += 1
-                    ext = file_path.suffix.lower()
-                    data["file_types"][ext] = data["file_types"].get(ext, 0) + 1
-
-                    # Check for agent patterns
-                    if 'agent' in file_path.name.lower():
-                        data["has_agents"] = True
-                        data["interesting_files"].append({
-                            "file": file_path.name,
-                            "type": "agent"
-                        })
-
-                    # Check for automation
-                    if any(word in file_path.name.lower() for word in ['automation', 'scheduler', 'cron', 'background']):
-                        data["has_automation"] = True
-                        data["interesting_files"].append({
-                            "file": file_path.name,
-                            "type": "automation"
-                        })
-
-                    # Check for API
-                    if 'api' in file_path.name.lower():
-                        data["has_api"] = True
-
-                    # Check for dashboard
-                    if 'dashboard' in file_path.name.lower():
-                        data["has_dashboard"] = True
+            for entry in FileSnapshot.project_files(project_dir):
+                data["file_count"] += 1
+                data["file_types"][entry.ext] = data["file_types"].get(entry.ext, 0) + 1
+                name = entry.name.lower()
+
+                # Check for agent patterns
+                if 'agent' in name:
+                    data["has_agents"] = True
+                    data["interesting_files"].append({
+                        "file": entry.name,
+                        "type": "agent"
+                    })
+
+                # Check for automation
+                if any(word in name for word in ['automation', 'scheduler', 'cron', 'background']):
+                    data["has_automation"] = True
+                    data["interesting_files"].append({
+                        "file": entry.name,
+                        "type": "automation"
+                    })
+
+                # Check for API
+                if 'api' in name:
+                    data["has_api"] = True
+
+                # Check for dashboard
+                if 'dashboard' in name:
+                    data["has_dashboard"] = True
 
             # Determine tech stack
             if '.py' in data["file_types"]:
@@ -143,15 +252,8 @@ class ProjectDataCollector(BaseAgent):
                 rich_content = self.content_extractor.extract_from_project(project_dir)
                 data["rich_content"] = rich_content
 
-                # Get purpose from README or first insight
-                readme_path = project_dir / "README.md"
-                if readme_path.exists():
-                    try:
-                        with open(readme_path, 'r') as f:
-                            first_line = f.readline().strip()
-                            data["purpose"] = first_line.replace('#', '').strip() if first_line else ""
-                    except:
-                        pass
+                # Get purpose from README (cached with its extraction) or first insight
+                data["purpose"] = self.content_extractor.readme_purpose(project_dir)
 
                 # Use insights as alternative purpose
                 if not data["purpose"] and rich_content.get("insights"):
@@ -320,9 +422,25 @@ class ProjectDataCollector(BaseAgent):
 
         return examples[:15]  # Limit to 15 examples total
 
+_worker_collector = None
+
+
+def _init_worker(index_file):
+    """Process pool initializer: one collector (and index reader) per worker process"""
+    global _worker_collector
+    _worker_collector = ProjectDataCollector(index_file=index_file)
+
+
+def _analyze_project_worker(project_dir, project_timeout):
+    """Process pool worker: analyze one project and hand back its index updates"""
+    data = _worker_collector._analyze_with_limit(Path(project_dir), project_timeout)
+    return data, _worker_collector.extraction_index.export()
+
+
 def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_WORKERS
     collector = ProjectDataCollector()
-    data = collector.collect_all_project_data()
+    data = collector.collect_all_project_data(workers=workers)
 
     # Save to file
     output_file = Path(__file__).parent / "project_data_analysis.json"
@@ -6,6 +6,7 @@ Runs daily to scan active projects and update the project_data_analysis.json
 used by the pillar content generator.
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
@@ -13,9 +14,16 @@ from pathlib import Path
 # Add utils to path for agent_framework
 sys.path.insert(0, str(Path(__file__).parent.parent / 'utils'))
 
-from project_data_collector import ProjectDataCollector
+from project_data_collector import DEFAULT_WORKERS, PROJECT_TIMEOUT, ProjectDataCollector
 
 def main():
+    parser = argparse.ArgumentParser(description="Scan active projects and update project_data_analysis.json")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Projects analyzed in parallel (1 = serial)")
+    parser.add_argument('--project-timeout', type=int, default=PROJECT_TIMEOUT,
+                        help="Seconds before one project's analysis is abandoned (0 = no limit)")
+    args = parser.parse_args()
+
     print("\n" + "="*100)
     print("📊 PROJECT DATA COLLECTOR")
     print("="*100)
@@ -24,7 +32,7 @@ def main():
     collector = ProjectDataCollector()
 
     # Collect all project data
-    project_data = collector.collect_all_project_data()
+    project_data = collector.collect_all_project_data(workers=args.workers, project_timeout=args.project_timeout)
 
     # Save to config directory
     config_dir = Path(__file__).parent.parent / 'config'
@@ -16,6 +16,9 @@ import hashlib
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.agent_framework import BaseAgent
+from scouts.activity_index import ActivityIndex
+from scouts.fs_snapshot import FileSnapshot
+from scouts.progress_store import ProgressStore
 from context_summary_agent import ContextSummaryAgent
 from planning_analysis_agent import PlanningAnalysisAgent
 from social_media_content_agent import SocialMediaContentAgent
@@ -60,8 +63,14 @@ class WeeklyProgressAgent(BaseAgent):
             }
         }
         
-        # Progress storage
-        self.progress_database_file = Path(__file__).parent / "weekly_progress_database.json"
+        # Projects root (walked once per summary via the shared snapshot)
+        self.active_dir = Path("/Users/elizabethknopf/Documents/claudec/active")
+
+        # Daily activity buckets; weekly metrics are range queries over these
+        self.activity_index = ActivityIndex()
+
+        # Progress storage (in memory, appended to a JSON-lines log in the background)
+        self.progress_database_file = Path(__file__).parent / "weekly_progress_database.jsonl"
         
         # Initialize other agents
         self.context_agent = ContextSummaryAgent()
@@ -116,36 +125,19 @@ class WeeklyProgressAgent(BaseAgent):
     
     def load_progress_database(self) -> Dict[str, Any]:
         """Load existing progress database"""
-        if self.progress_database_file.exists():
-            try:
-                with open(self.progress_database_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                self.logger.error(f"Error loading progress database: {e}")
+        try:
+            self.progress_store = ProgressStore(self.progress_database_file)
+        except Exception as e:
+            self.logger.error(f"Error loading progress database: {e}")
+            # Start a fresh log rather than appending to an unreadable one
+            self.progress_store = ProgressStore(self.progress_database_file.with_suffix('.new.jsonl'), legacy_file=None)
         
-        # Initialize empty database
-        return {
-            "metadata": {
-                "created": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "version": "1.0"
-            },
-            "weekly_summaries": {},
-            "daily_progress": {},
-            "milestones": [],
-            "productivity_metrics": {}
-        }
+        return self.progress_store.data
     
     def save_progress_database(self):
-        """Save progress database to file"""
-        self.progress_database["metadata"]["last_updated"] = datetime.now().isoformat()
-        
-        try:
-            with open(self.progress_database_file, 'w') as f:
-                json.dump(self.progress_database, f, indent=2)
-            self.logger.info(f"Progress database saved with {len(self.progress_database['weekly_summaries'])} weekly summaries")
-        except Exception as e:
-            self.logger.error(f"Error saving progress database: {e}")
+        """Queue the metadata update; changes are appended by a write-behind flush"""
+        self.progress_store.touch()
+        self.logger.info(f"Progress database saved with {self.progress_store.week_count} weekly summaries")
     
     def generate_weekly_summary(self, week_offset: int = 0) -> Dict[str, Any]:
         """Generate comprehensive weekly progress summary"""
@@ -158,6 +150,11 @@ class WeeklyProgressAgent(BaseAgent):
         
         self.logger.info(f"Generating weekly summary for week {week_key} ({week_start.strftime('%Y-%m-%d')} to {week_end.strftime('%Y-%m-%d')})")
         
+        # Record what changed since the last run; a live change watcher keeps
+        # the index current, otherwise the projects tree is walked once
+        if not self.activity_index.is_live():
+            self.activity_index.refresh(FileSnapshot.shared(self.active_dir, refresh=True))
+
         # Gather comprehensive progress data
         weekly_data = {
             "week_key": week_key,
@@ -189,15 +186,14 @@ class WeeklyProgressAgent(BaseAgent):
         weekly_data["progress_score"] = self._calculate_weekly_progress_score(weekly_data)
         
         # Store in database
-        self.progress_database["weekly_summaries"][week_key] = weekly_data
+        self.progress_store.put_week(week_key, weekly_data)
         self.save_progress_database()
         
         return weekly_data
     
     def _analyze_portfolio_progress(self, week_start: datetime, week_end: datetime) -> Dict[str, Any]:
         """Analyze progress across project portfolio"""
-        active_dir = Path("/Users/elizabethknopf/Documents/claudec/active")
-        project_paths = [str(p) for p in active_dir.iterdir() if p.is_dir() and not p.name.startswith('.')]
+        project_paths = [str(self.active_dir / name) for name in sorted(self.activity_index.projects())]
         
         portfolio_analysis = {
             "total_projects": len(project_paths),
@@ -243,46 +239,38 @@ class WeeklyProgressAgent(BaseAgent):
             "highlights": []
         }
         
+        project_ctime, agent_files = self.activity_index.projects().get(project_dir.name, (None, 0))
+
         # Check if project was created this week
-        try:
-            creation_time = datetime.fromtimestamp(project_dir.stat().st_ctime)
+        if project_ctime is not None:
+            creation_time = datetime.fromtimestamp(project_ctime)
             if week_start <= creation_time <= week_end:
                 analysis["is_new_project"] = True
                 analysis["has_activity"] = True
                 analysis["highlights"].append("New project created")
-        except:
-            pass
         
-        # Analyze file changes during the week
+        # File changes during the week, from the daily activity buckets
         file_changes = {}
-        try:
-            for file_path in project_dir.rglob("*"):
-                if file_path.is_file() and not file_path.name.startswith('.'):
-                    mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                    if week_start <= mod_time <= week_end:
-                        analysis["has_activity"] = True
-                        ext = file_path.suffix or "no_extension"
-                        file_changes[ext] = file_changes.get(ext, 0) + 1
-                        analysis["major_changes"] += 1
-        except Exception as e:
-            self.logger.warning(f"Error analyzing {project_dir.name}: {e}")
+        for suffix, count in self.activity_index.suffix_counts(week_start, week_end, 'modified', project_dir.name).items():
+            ext = suffix or "no_extension"
+            file_changes[ext] = file_changes.get(ext, 0) + count
+            analysis["major_changes"] += count
+        if file_changes:
+            analysis["has_activity"] = True
         
         analysis["file_changes"] = file_changes
         
         # Check for specific achievements
         if analysis["has_activity"]:
             # Check for CLAUDE.md creation
-            claude_file = project_dir / "CLAUDE.md"
-            if claude_file.exists():
-                try:
-                    claude_mod_time = datetime.fromtimestamp(claude_file.stat().st_mtime)
-                    if week_start <= claude_mod_time <= week_end:
-                        analysis["highlights"].append("CLAUDE.md context file added")
-                except:
-                    pass
+            claude_mod = self.activity_index.file_mtime(project_dir.name, "CLAUDE.md")
+            if claude_mod is not None:
+                claude_mod_time = datetime.fromtimestamp(claude_mod)
+                if week_start <= claude_mod_time <= week_end:
+                    analysis["highlights"].append("CLAUDE.md context file added")
             
             # Check for agent development
-            if any('agent' in str(f).lower() for f in project_dir.rglob("*.py")):
+            if agent_files:
                 analysis["highlights"].append("Agent development activity")
         
         return analysis
@@ -361,29 +349,24 @@ class WeeklyProgressAgent(BaseAgent):
                 pass
         
         # Check for major project milestones
-        active_dir = Path("/Users/elizabethknopf/Documents/claudec/active")
-        for project_dir in active_dir.iterdir():
-            if project_dir.is_dir() and not project_dir.name.startswith('.'):
-                # Check if project was set up with complete configuration this week
-                claude_file = project_dir / "CLAUDE.md"
-                todo_file = project_dir / "TODO.md"
+        for project_name in sorted(self.activity_index.projects()):
+            # Check if project was set up with complete configuration this week
+            claude_mtime = self.activity_index.file_mtime(project_name, "CLAUDE.md")
+            todo_mtime = self.activity_index.file_mtime(project_name, "TODO.md")
+            
+            if claude_mtime is not None and todo_mtime is not None:
+                claude_mod = datetime.fromtimestamp(claude_mtime)
+                todo_mod = datetime.fromtimestamp(todo_mtime)
                 
-                if claude_file.exists() and todo_file.exists():
-                    try:
-                        claude_mod = datetime.fromtimestamp(claude_file.stat().st_mtime)
-                        todo_mod = datetime.fromtimestamp(todo_file.stat().st_mtime)
-                        
-                        if (week_start <= claude_mod <= week_end) and (week_start <= todo_mod <= week_end):
-                            accomplishments.append({
-                                "type": "project_standardization",
-                                "title": f"Standardized {project_dir.name} Project",
-                                "description": "Added complete project configuration with CLAUDE.md and TODO.md",
-                                "impact": "medium",
-                                "category": "project_setup",
-                                "date": max(claude_mod, todo_mod).isoformat()
-                            })
-                    except:
-                        pass
+                if (week_start <= claude_mod <= week_end) and (week_start <= todo_mod <= week_end):
+                    accomplishments.append({
+                        "type": "project_standardization",
+                        "title": f"Standardized {project_name} Project",
+                        "description": "Added complete project configuration with CLAUDE.md and TODO.md",
+                        "impact": "medium",
+                        "category": "project_setup",
+                        "date": max(claude_mod, todo_mod).isoformat()
+                    })
         
         # Check for dashboard/localhost integration milestones
         dashboard_dir = Path("/Users/elizabethknopf/Documents/claudec/active/Project Management/dashboard")
@@ -417,39 +400,18 @@ class WeeklyProgressAgent(BaseAgent):
             "automation_improvements": 0
         }
         
-        # Count file modifications across all projects
-        active_dir = Path("/Users/elizabethknopf/Documents/claudec/active")
-        projects_with_activity = set()
+        # Range aggregation over the daily activity buckets
+        modified = self.activity_index.totals(week_start, week_end, 'modified')
+        created = self.activity_index.totals(week_start, week_end, 'created')
+        created_by_suffix = self.activity_index.suffix_counts(week_start, week_end, 'created')
+        projects_with_activity = self.activity_index.project_counts(week_start, week_end)
         
-        for project_dir in active_dir.iterdir():
-            if project_dir.is_dir() and not project_dir.name.startswith('.'):
-                project_has_activity = False
-                
-                try:
-                    for file_path in project_dir.rglob("*"):
-                        if file_path.is_file() and not file_path.name.startswith('.'):
-                            mod_time = datetime.fromtimestamp(file_path.stat().st_mtime)
-                            creation_time = datetime.fromtimestamp(file_path.stat().st_ctime)
-                            
-                            if week_start <= mod_time <= week_end:
-                                metrics["total_files_modified"] += 1
-                                project_has_activity = True
-                            
-                            if week_start <= creation_time <= week_end:
-                                metrics["total_files_created"] += 1
-                                project_has_activity = True
-                                
-                                # Score different file types
-                                if file_path.suffix == '.py' and 'agent' in file_path.name:
-                                    metrics["agent_development_score"] += 10
-                                elif file_path.suffix == '.md':
-                                    metrics["documentation_score"] += 5
-                
-                    if project_has_activity:
-                        projects_with_activity.add(project_dir.name)
-                        
-                except Exception as e:
-                    self.logger.warning(f"Error calculating metrics for {project_dir.name}: {e}")
+        metrics["total_files_modified"] = modified["files"]
+        metrics["total_files_created"] = created["files"]
+        
+        # Score different file types
+        metrics["agent_development_score"] = created["agent_files"] * 10
+        metrics["documentation_score"] = created_by_suffix.get('.md', 0) * 5
         
         metrics["projects_touched"] = len(projects_with_activity)
         
@@ -608,11 +570,11 @@ class WeeklyProgressAgent(BaseAgent):
     
     def _get_productivity_trend(self) -> str:
         """Get productivity trend compared to previous weeks"""
-        if len(self.progress_database["weekly_summaries"]) < 2:
+        if self.progress_store.week_count < 2:
             return "establishing_baseline"
         
         # Get last two weeks' scores
-        sorted_weeks = sorted(self.progress_database["weekly_summaries"].keys(), reverse=True)
+        sorted_weeks = self.progress_store.latest_weeks(2)
         
         if len(sorted_weeks) >= 2:
             current_score = self.progress_database["weekly_summaries"][sorted_weeks[0]]["progress_score"]
@@ -644,11 +606,11 @@ class WeeklyProgressAgent(BaseAgent):
             "recommendations": []
         }
         
-        # Get weekly scores
-        sorted_weeks = sorted(self.progress_database["weekly_summaries"].keys(), reverse=True)
+        # Get weekly scores (newest first, from the in-memory week index)
+        sorted_weeks = self.progress_store.latest_weeks(weeks_back)
         
         scores = []
-        for week_key in sorted_weeks[:weeks_back]:
+        for week_key in sorted_weeks:
             week_data = self.progress_database["weekly_summaries"][week_key]
             scores.append({
                 "week": week_key,
@@ -658,6 +620,9 @@ class WeeklyProgressAgent(BaseAgent):
         
         trend_analysis["weekly_scores"] = scores
         
+        # File activity per week straight from the activity buckets
+        trend_analysis["weekly_activity"] = self.activity_index.weekly_series(weeks_back)
+        
         if scores:
             trend_analysis["average_score"] = sum(s["score"] for s in scores) / len(scores)
             
@@ -745,9 +710,9 @@ class WeeklyProgressAgent(BaseAgent):
         all_accomplishments = []
         
         # Gather accomplishments from recent weeks
-        sorted_weeks = sorted(self.progress_database["weekly_summaries"].keys(), reverse=True)
+        sorted_weeks = self.progress_store.latest_weeks(weeks_back)
         
-        for week_key in sorted_weeks[:weeks_back]:
+        for week_key in sorted_weeks:
             week_data = self.progress_database["weekly_summaries"][week_key]
             accomplishments = week_data.get("major_accomplishments", [])
             all_accomplishments.extend(accomplishments)
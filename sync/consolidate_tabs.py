@@ -1,172 +1,162 @@
 #!/usr/bin/env python3
 """
 Consolidate existing Content tabs into single "Content" tab
-Merges Content_20251023 and Content_20251025 into one tab with Date column
+Merges dated Content_YYYYMMDD tabs into one tab with Date column
+
+All source tabs are read with one values.batchGet, rows are streamed into
+the target tab in bounded chunks at fixed row numbers (so a re-sent chunk
+overwrites rather than duplicates), progress is checkpointed after every
+chunk, and formatting plus all tab deletes go out in one batchUpdate.
+An interrupted run resumes from its checkpoint.
 """
 
+import argparse
 import json
-import pickle
+import re
+import sys
 from pathlib import Path
-from googleapiclient.discovery import build
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sync.google_api import GoogleAPIPool, SheetsBatchWriter
+from sync.sheets_sync_engine import (
+    SheetsSyncEngine, approval_format_requests, header_format_requests, quote_tab
+)
+
+TARGET_TAB = 'Content'
+DATED_TAB_PATTERN = re.compile(r'^Content_(\d{8})$')
+CHUNK_ROWS = 500
+
+HEADERS = [
+    'Date',
+    'Title',
+    'Content Type',
+    'Trend Source',
+    'Trend URL',
+    'Personal Example',
+    'Hook Option 1',
+    'Hook Option 2',
+    'Stat 1',
+    'Stat 2',
+    'Stat 3',
+    'Framework',
+    'Platforms',
+    'Fusion Strength',
+    'Quality Score',
+    'Auto Approved',
+    'Status'
+]
+
 
 class TabConsolidator:
     """Consolidate multiple content tabs into single tab"""
 
-    def __init__(self):
+    def __init__(self, sheets_service=None, spreadsheet_id=None, checkpoint_file=None):
         self.agents_dir = Path(__file__).parent
         self.token_file = self.agents_dir / 'google_token.pickle'
 
-        # Load credentials
-        with open(self.token_file, 'rb') as token:
-            self.creds = pickle.load(token)
-
-        # Initialize services
-        self.sheets_service = build('sheets', 'v4', credentials=self.creds)
-
-        # Load Google Sheets results to get spreadsheet ID
-        results_file = self.agents_dir / 'google_sheets_results.json'
-        with open(results_file, 'r') as f:
-            results = json.load(f)
-            self.spreadsheet_id = results['spreadsheet_id']
-            self.spreadsheet_url = results['spreadsheet_url']
-
-    def consolidate(self):
-        """Consolidate existing tabs into single Content tab"""
+        if sheets_service is None:
+            # Shared, rate-limited Sheets client
+            self.api = GoogleAPIPool.shared(self.token_file)
+            sheets_service = self.api.service('sheets')
+        self.sheets_service = sheets_service
+
+        if spreadsheet_id is None:
+            # Load Google Sheets results to get spreadsheet ID
+            results_file = self.agents_dir / 'google_sheets_results.json'
+            with open(results_file, 'r') as f:
+                results = json.load(f)
+                spreadsheet_id = results['spreadsheet_id']
+                self.spreadsheet_url = results['spreadsheet_url']
+        else:
+            self.spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
+        self.spreadsheet_id = spreadsheet_id
+
+        data_dir = self.agents_dir.parent / 'data'
+        self.checkpoint_file = Path(checkpoint_file) if checkpoint_file else data_dir / 'consolidation_checkpoint.json'
+        self.sync_state_file = data_dir / 'sheets_sync_state.json'
+
+    def consolidate(self, old_tabs=None, chunk_rows=CHUNK_ROWS, restart=False):
+        """
+        Consolidate dated tabs into the single Content tab
+
+        Args:
+            old_tabs: Tabs to merge (defaults to every Content_YYYYMMDD tab)
+            chunk_rows: Rows per write request
+            restart: Ignore any checkpoint from an interrupted run
+        """
 
         print("\n" + "="*100)
         print("🔄 CONSOLIDATING CONTENT TABS")
         print("="*100)
 
-        # Tabs to consolidate
-        old_tabs = ['Content_20251023', 'Content_20251025']
-
-        print(f"\n📋 Merging tabs: {', '.join(old_tabs)}")
-
-        # Get data from each tab
-        all_data = []
-
-        for tab_name in old_tabs:
-            print(f"\n📥 Reading {tab_name}...")
-
-            try:
-                result = self.sheets_service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{tab_name}!A:Z"
-                ).execute()
-
-                values = result.get('values', [])
-
-                if not values:
-                    print(f"   ⚠️  No data found")
-                    continue
-
-                # Skip header row, add date column
-                date = tab_name.replace('Content_', '')
-                date_formatted = f"{date[:4]}-{date[4:6]}-{date[6:]}"
-
-                print(f"   ✅ Found {len(values)-1} rows (date: {date_formatted})")
-
-                for row in values[1:]:  # Skip header
-                    # Add date as first column
-                    # Add "Daily" as content type (second column after date)
-                    # If row already has content type (column 2), keep it; otherwise add "Daily"
-                    if len(row) >= 2:
-                        # Insert "Daily" after title if not present
-                        row_with_date = [date_formatted, row[0], 'Daily'] + row[1:]
-                    else:
-                        row_with_date = [date_formatted] + row + ['Daily']
-                    all_data.append(row_with_date)
-
-            except Exception as e:
-                print(f"   ❌ Error reading {tab_name}: {e}")
-
-        print(f"\n✅ Total rows collected: {len(all_data)}")
-
-        # Create new "Content" tab
-        print(f"\n📝 Creating 'Content' tab...")
-
-        try:
-            request = {
-                'addSheet': {
-                    'properties': {
-                        'title': 'Content'
-                    }
-                }
-            }
-
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body={'requests': [request]}
-            ).execute()
+        checkpoint = None if restart else self._load_checkpoint()
+        if checkpoint:
+            old_tabs = checkpoint['tabs']
+            print(f"\n♻️  Resuming interrupted consolidation ({checkpoint['written']} rows already written)")
+            sheets = self._sheet_properties()
+            missing = [tab for tab in old_tabs if tab not in sheets]
+            if len(missing) == len(old_tabs):
+                # The final batchUpdate (which deletes them all at once) already ran
+                old_tabs = []
+            elif missing:
+                print(f"   ❌ Source tabs changed since the checkpoint ({', '.join(missing)} missing)")
+                print(f"   Re-run with --restart to start over")
+                return
+        else:
+            sheets = self._sheet_properties()
+            if old_tabs is None:
+                old_tabs = sorted(title for title in sheets if DATED_TAB_PATTERN.match(title))
+
+        if not old_tabs:
+            print("\n✅ No dated Content tabs left to consolidate")
+            self._clear_checkpoint()
+            return
 
-            print(f"   ✅ Created 'Content' tab")
-
-        except Exception as e:
-            print(f"   ⚠️  Tab may already exist: {e}")
-
-        # Write consolidated data
-        print(f"\n📤 Writing consolidated data...")
-
-        headers = [
-            'Date',
-            'Title',
-            'Content Type',
-            'Trend Source',
-            'Trend URL',
-            'Personal Example',
-            'Hook Option 1',
-            'Hook Option 2',
-            'Stat 1',
-            'Stat 2',
-            'Stat 3',
-            'Framework',
-            'Platforms',
-            'Fusion Strength',
-            'Quality Score',
-            'Auto Approved',
-            'Status'
-        ]
-
-        rows = [headers] + all_data
+        print(f"\n📋 Merging {len(old_tabs)} tabs: {', '.join(old_tabs[:5])}{' ...' if len(old_tabs) > 5 else ''}")
 
-        self.sheets_service.spreadsheets().values().update(
+        # Read every source tab in one request
+        print(f"\n📥 Reading {len(old_tabs)} tabs with one batch request...")
+        response = self.sheets_service.spreadsheets().values().batchGet(
             spreadsheetId=self.spreadsheet_id,
-            range='Content!A1',
-            valueInputOption='USER_ENTERED',
-            body={'values': rows}
+            ranges=[f"{quote_tab(tab)}!A:Z" for tab in old_tabs]
         ).execute()
-
-        print(f"   ✅ Wrote {len(rows)} rows (including header)")
-
-        # Format the new tab
-        print(f"\n🎨 Formatting 'Content' tab...")
-        self._format_content_tab(len(rows), len(headers))
-
-        # Delete old tabs
-        print(f"\n🗑️  Deleting old tabs...")
-
-        spreadsheet = self.sheets_service.spreadsheets().get(
-            spreadsheetId=self.spreadsheet_id
-        ).execute()
-
-        delete_requests = []
-        for sheet in spreadsheet.get('sheets', []):
-            sheet_title = sheet['properties']['title']
-            if sheet_title in old_tabs:
-                sheet_id = sheet['properties']['sheetId']
-                delete_requests.append({
-                    'deleteSheet': {
-                        'sheetId': sheet_id
-                    }
-                })
-                print(f"   🗑️  Deleting {sheet_title}...")
-
-        if delete_requests:
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body={'requests': delete_requests}
-            ).execute()
-            print(f"   ✅ Deleted {len(delete_requests)} old tabs")
+        tab_values = [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+        total = sum(max(len(values) - 1, 0) for values in tab_values)
+        print(f"   ✅ Found {total} rows")
+
+        if checkpoint is None:
+            checkpoint = self._prepare_target(sheets, old_tabs, total)
+        sheet_id = checkpoint['sheet_id']
+
+        # Stream rows in bounded chunks at fixed positions, checkpointing each chunk
+        print(f"\n📤 Writing consolidated data in chunks of {chunk_rows}...")
+        written = checkpoint['written']
+        chunk = []
+        for index, row in enumerate(self._consolidated_rows(old_tabs, tab_values)):
+            if index < written:
+                continue
+            chunk.append(row)
+            if len(chunk) == chunk_rows:
+                written = self._write_chunk(checkpoint, chunk, written)
+                chunk = []
+        if chunk:
+            written = self._write_chunk(checkpoint, chunk, written)
+        print(f"   ✅ Wrote {written} rows starting at row {checkpoint['start_row']}")
+
+        # Formatting and every tab delete in one batchUpdate
+        print(f"\n🎨 Formatting '{TARGET_TAB}' and deleting {len(old_tabs)} old tabs...")
+        writer = SheetsBatchWriter(self.sheets_service, self.spreadsheet_id)
+        if checkpoint['new_tab']:
+            writer.queue_requests(header_format_requests(sheet_id, len(HEADERS)))
+            writer.queue_requests(approval_format_requests(sheet_id, 14))
+        writer.queue_requests([
+            {'deleteSheet': {'sheetId': sheets[tab]['sheetId']}} for tab in old_tabs
+        ])
+        writer.flush()
+
+        self._clear_checkpoint()
+        # Daily syncs re-learn the Content tab's row count on their next run
+        SheetsSyncEngine(self.sheets_service, self.spreadsheet_id, self.sync_state_file).invalidate(TARGET_TAB)
 
         # Print summary
         print("\n" + "="*100)
@@ -176,121 +166,146 @@ class TabConsolidator:
         print(f"\n📊 Google Sheet:")
         print(f"   {self.spreadsheet_url}")
 
-        print(f"\n📝 New tab: Content")
-        print(f"   Total rows: {len(all_data)} (+ 1 header)")
-        print(f"   Date range: 2025-10-23 to 2025-10-25")
-
-        print(f"\n🗑️  Removed tabs:")
-        for tab in old_tabs:
-            print(f"   • {tab}")
+        dates = [self._tab_date(tab) for tab in old_tabs]
+        print(f"\n📝 Tab: {TARGET_TAB}")
+        print(f"   Rows added: {written}")
+        print(f"   Date range: {min(dates)} to {max(dates)}")
 
-        print(f"\n✅ Future daily runs will append to 'Content' tab")
+        print(f"\n🗑️  Removed {len(old_tabs)} tabs")
 
-    def _format_content_tab(self, num_rows, num_cols):
-        """Format the Content tab"""
+        print(f"\n✅ Future daily runs will append to '{TARGET_TAB}' tab")
 
-        # Get sheet ID
+    def _sheet_properties(self):
+        """Title -> {sheetId, rowCount} for every tab, from one metadata read"""
         spreadsheet = self.sheets_service.spreadsheets().get(
-            spreadsheetId=self.spreadsheet_id
+            spreadsheetId=self.spreadsheet_id,
+            fields='sheets.properties(sheetId,title,gridProperties.rowCount)'
         ).execute()
-
-        sheet_id = None
-        for sheet in spreadsheet.get('sheets', []):
-            if sheet['properties']['title'] == 'Content':
-                sheet_id = sheet['properties']['sheetId']
-                break
-
-        if sheet_id is None:
-            print("   ⚠️  Could not find sheet ID")
-            return
-
-        requests = []
-
-        # 1. Freeze header row
-        requests.append({
-            'updateSheetProperties': {
-                'properties': {
-                    'sheetId': sheet_id,
-                    'gridProperties': {
-                        'frozenRowCount': 1
-                    }
-                },
-                'fields': 'gridProperties.frozenRowCount'
+        return {
+            sheet['properties']['title']: {
+                'sheetId': sheet['properties']['sheetId'],
+                'rowCount': sheet['properties'].get('gridProperties', {}).get('rowCount', 1000)
             }
-        })
+            for sheet in spreadsheet.get('sheets', [])
+        }
+
+    def _prepare_target(self, sheets, old_tabs, total):
+        """Create/size the target tab, write headers if new, and start a checkpoint"""
+        if TARGET_TAB in sheets:
+            sheet_id = sheets[TARGET_TAB]['sheetId']
+            row_count = sheets[TARGET_TAB]['rowCount']
+            existing = self.sheets_service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{quote_tab(TARGET_TAB)}!A:A"
+            ).execute().get('values', [])
+            new_tab = not existing
+        else:
+            print(f"\n📝 Creating '{TARGET_TAB}' tab...")
+            response = self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': [{'addSheet': {'properties': {'title': TARGET_TAB}}}]}
+            ).execute()
+            sheet_id = response['replies'][0]['addSheet']['properties']['sheetId']
+            row_count = response['replies'][0]['addSheet']['properties'].get('gridProperties', {}).get('rowCount', 1000)
+            existing = []
+            new_tab = True
 
-        # 2. Bold header row
-        requests.append({
-            'repeatCell': {
-                'range': {
-                    'sheetId': sheet_id,
-                    'startRowIndex': 0,
-                    'endRowIndex': 1
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                        'textFormat': {
-                            'foregroundColor': {'red': 1, 'green': 1, 'blue': 1},
-                            'fontSize': 10,
-                            'bold': True
-                        }
-                    }
-                },
-                'fields': 'userEnteredFormat(backgroundColor,textFormat)'
-            }
-        })
+        start_row = 2 if new_tab else len(existing) + 1
 
-        # 3. Auto-resize columns
-        requests.append({
-            'autoResizeDimensions': {
-                'dimensions': {
+        # values.update cannot write past the grid, so size it once up front
+        needed = start_row - 1 + total
+        if needed > row_count:
+            self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': [{'appendDimension': {
                     'sheetId': sheet_id,
-                    'dimension': 'COLUMNS',
-                    'startIndex': 0,
-                    'endIndex': num_cols
-                }
-            }
-        })
-
-        # 4. Color-code by approval status (column O = index 14)
-        requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': sheet_id,
-                        'startRowIndex': 1,
-                        'endRowIndex': num_rows,
-                        'startColumnIndex': 14,
-                        'endColumnIndex': 15
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_CONTAINS',
-                            'values': [{'userEnteredValue': '✅'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 0.85, 'green': 1, 'blue': 0.85}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
+                    'dimension': 'ROWS',
+                    'length': needed - row_count
+                }}]}
+            ).execute()
 
-        try:
-            self.sheets_service.spreadsheets().batchUpdate(
+        if new_tab:
+            self.sheets_service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
-                body={'requests': requests}
+                range=f"{quote_tab(TARGET_TAB)}!A1",
+                valueInputOption='USER_ENTERED',
+                body={'values': [HEADERS]}
             ).execute()
-            print("   ✅ Formatting applied")
-        except Exception as e:
-            print(f"   ⚠️  Some formatting may have failed: {e}")
+
+        checkpoint = {
+            'spreadsheet_id': self.spreadsheet_id,
+            'tabs': old_tabs,
+            'sheet_id': sheet_id,
+            'new_tab': new_tab,
+            'start_row': start_row,
+            'written': 0
+        }
+        self._save_checkpoint(checkpoint)
+        return checkpoint
+
+    def _consolidated_rows(self, old_tabs, tab_values):
+        """Source rows with the Date and Content Type columns added"""
+        for tab_name, values in zip(old_tabs, tab_values):
+            date_formatted = self._tab_date(tab_name)
+            for row in values[1:]:  # Skip header
+                # Add date as first column
+                # Add "Daily" as content type (second column after date)
+                if len(row) >= 2:
+                    # Insert "Daily" after title if not present
+                    yield [date_formatted, row[0], 'Daily'] + row[1:]
+                else:
+                    yield [date_formatted] + row + ['Daily']
+
+    def _write_chunk(self, checkpoint, chunk, written):
+        row = checkpoint['start_row'] + written
+        self.sheets_service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{quote_tab(TARGET_TAB)}!A{row}",
+            valueInputOption='USER_ENTERED',
+            body={'values': chunk}
+        ).execute()
+
+        written += len(chunk)
+        checkpoint['written'] = written
+        self._save_checkpoint(checkpoint)
+        print(f"   ✅ Rows {row}-{row + len(chunk) - 1} written")
+        return written
+
+    @staticmethod
+    def _tab_date(tab_name):
+        date = tab_name.replace('Content_', '')
+        return f"{date[:4]}-{date[4:6]}-{date[6:]}"
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_file.exists():
+            return None
+        with open(self.checkpoint_file, 'r') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get('spreadsheet_id') != self.spreadsheet_id:
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint):
+        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.checkpoint_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+        tmp_file.replace(self.checkpoint_file)
+
+    def _clear_checkpoint(self):
+        if self.checkpoint_file.exists():
+            self.checkpoint_file.unlink()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Consolidate dated Content tabs into one Content tab")
+    parser.add_argument('tabs', nargs='*', help="Tabs to merge (default: every Content_YYYYMMDD tab)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Rows per write request")
+    parser.add_argument('--restart', action='store_true', help="Ignore a checkpoint from an interrupted run")
+    args = parser.parse_args()
+
     consolidator = TabConsolidator()
-    consolidator.consolidate()
+    consolidator.consolidate(old_tabs=args.tabs or None, chunk_rows=args.chunk_rows, restart=args.restart)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Fake Google HTTP Server - Local stand-in for the Sheets v4 REST API
+Serves the Sheets endpoints the sync modules use from an in-memory
+FakeSheetsService, so real googleapiclient clients (via GoogleAPIPool with
+api_endpoint / GOOGLE_API_ENDPOINT) can be exercised without network access.
+fail_next() injects 429/5xx responses to exercise retry and backoff.
+
+Usage:
+    python fake_google_http.py [port]
+"""
+
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sync.fake_google_services import FakeSheetsService
+
+STATUS_NAMES = {
+    400: 'INVALID_ARGUMENT',
+    404: 'NOT_FOUND',
+    429: 'RESOURCE_EXHAUSTED',
+    500: 'INTERNAL',
+    503: 'UNAVAILABLE'
+}
+
+# (HTTP method, path pattern under /sheets/, handler name)
+SHEETS_ROUTES = [
+    ('GET', re.compile(r'^v4/spreadsheets/([^/:]+)$'), 'get'),
+    ('POST', re.compile(r'^v4/spreadsheets/([^/:]+):batchUpdate$'), 'batch_update'),
+    ('GET', re.compile(r'^v4/spreadsheets/([^/:]+)/values:batchGet$'), 'values_batch_get'),
+    ('POST', re.compile(r'^v4/spreadsheets/([^/:]+)/values:batchUpdate$'), 'values_batch_update'),
+    ('POST', re.compile(r'^v4/spreadsheets/([^/:]+)/values/(.+):append$'), 'values_append'),
+    ('GET', re.compile(r'^v4/spreadsheets/([^/:]+)/values/(.+)$'), 'values_get'),
+    ('PUT', re.compile(r'^v4/spreadsheets/([^/:]+)/values/(.+)$'), 'values_update')
+]
+
+
+class FakeGoogleServer:
+    """Threaded HTTP server wrapping a FakeSheetsService"""
+
+    def __init__(self, sheets: Optional[FakeSheetsService] = None, port: int = 0):
+        self.sheets = sheets or FakeSheetsService()
+        self.log: List[Tuple[str, str]] = []
+        self._failures: List[int] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int = 1, status: int = 429):
+        """Answer the next `count` requests with an error status"""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def start(self) -> 'FakeGoogleServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _next_failure(self) -> Optional[int]:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def dispatch(self, method: str, path: str, query: Dict[str, List[str]], body: Dict) -> Dict:
+        """Route a Sheets REST call to the in-memory service"""
+        api, _, rest = path.lstrip('/').partition('/')
+        if api != 'sheets':
+            raise LookupError(f"Unknown API: {api}")
+
+        for route_method, pattern, handler in SHEETS_ROUTES:
+            match = pattern.match(rest)
+            if route_method == method and match:
+                args = [unquote(group) for group in match.groups()]
+                return getattr(self, f"_sheets_{handler}")(*args, query=query, body=body)
+        raise LookupError(f"No route for {method} {path}")
+
+    def _sheets_get(self, spreadsheet_id, query, body):
+        return self.sheets.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
+
+    def _sheets_batch_update(self, spreadsheet_id, query, body):
+        return self.sheets.spreadsheets().batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+
+    def _sheets_values_batch_get(self, spreadsheet_id, query, body):
+        return self.sheets.spreadsheets().values().batchGet(
+            spreadsheetId=spreadsheet_id, ranges=query.get('ranges', [])
+        ).execute()
+
+    def _sheets_values_batch_update(self, spreadsheet_id, query, body):
+        return self.sheets.spreadsheets().values().batchUpdate(spreadsheetId=spreadsheet_id, body=body).execute()
+
+    def _sheets_values_append(self, spreadsheet_id, range_name, query, body):
+        return self.sheets.spreadsheets().values().append(
+            spreadsheetId=spreadsheet_id, range=range_name, body=body,
+            valueInputOption=query.get('valueInputOption', [None])[0],
+            insertDataOption=query.get('insertDataOption', [None])[0]
+        ).execute()
+
+    def _sheets_values_get(self, spreadsheet_id, range_name, query, body):
+        return self.sheets.spreadsheets().values().get(spreadsheetId=spreadsheet_id, range=range_name).execute()
+
+    def _sheets_values_update(self, spreadsheet_id, range_name, query, body):
+        return self.sheets.spreadsheets().values().update(
+            spreadsheetId=spreadsheet_id, range=range_name, body=body,
+            valueInputOption=query.get('valueInputOption', [None])[0]
+        ).execute()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status: int, payload: Dict):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _error(self, status: int, message: str):
+                self._respond(status, {'error': {
+                    'code': status,
+                    'message': message,
+                    'status': STATUS_NAMES.get(status, 'UNKNOWN')
+                }})
+
+            def _handle(self):
+                parts = urlsplit(self.path)
+                server.log.append((self.command, parts.path))
+
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+
+                failure = server._next_failure()
+                if failure:
+                    self._error(failure, 'Injected failure')
+                    return
+
+                try:
+                    body = json.loads(raw) if raw else {}
+                    result = server.dispatch(self.command, parts.path, parse_qs(parts.query), body)
+                except LookupError as e:
+                    self._error(404, str(e))
+                except (ValueError, KeyError) as e:
+                    self._error(400, str(e))
+                else:
+                    self._respond(200, result)
+
+            do_GET = _handle
+            do_POST = _handle
+            do_PUT = _handle
+
+        return Handler
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    server = FakeGoogleServer(port=port)
+    print(f"🧪 Fake Google API listening on {server.url}")
+    print(f"   export GOOGLE_API_ENDPOINT={server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
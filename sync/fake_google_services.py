@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Fake Google Services - In-memory stand-ins for the googleapiclient services
+Mirror the fluent `service.resource().method(...).execute()` interface for
+the calls the sync modules make, and record every call so tests and dry
+runs can check API usage without credentials or network access.
+"""
+
+import re
+from typing import Dict, List, Optional
+
+RANGE_PATTERN = re.compile(r"^(?:'((?:[^']|'')+)'|([^!]+))(?:!([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?)?$")
+
+
+def parse_range(range_name: str):
+    """Split A1 notation into (tab, first row, last row); rows are 1-based, None if open"""
+    match = RANGE_PATTERN.match(range_name)
+    if not match:
+        raise ValueError(f"Unable to parse range: {range_name}")
+    quoted, bare, _, start, _, end = match.groups()
+    tab = quoted.replace("''", "'") if quoted else bare
+    start_row = int(start) if start else 1
+    end_row = int(end) if end else (start_row if start and end is None else None)
+    return tab, start_row, end_row
+
+
+def column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def parse_columns(range_name: str):
+    """0-based (first column, end column exclusive) of an A1 range; end None if open"""
+    _, _, start, _, end, _ = RANGE_PATTERN.match(range_name).groups()
+    start_col = column_index(start) if start else 0
+    end_col = column_index(end) + 1 if end else (start_col + 1 if start and end is None else None)
+    return start_col, end_col
+
+
+class FakeHttpError(Exception):
+    """Mimics googleapiclient.errors.HttpError: status is on .resp.status"""
+
+    class _Response:
+        def __init__(self, status: int):
+            self.status = status
+
+    def __init__(self, status: int, message: str = 'Injected failure'):
+        super().__init__(f"<HttpError {status}: {message}>")
+        self.resp = self._Response(status)
+
+
+class FakeRequest:
+    """Deferred call, run on execute() like googleapiclient.http.HttpRequest"""
+
+    def __init__(self, service, name: str, func, **kwargs):
+        self.service = service
+        self.name = name
+        self.func = func
+        self.kwargs = kwargs
+
+    def execute(self, **kwargs):
+        self.service.calls.append((self.name, self.kwargs))
+        if self.service.failures:
+            raise FakeHttpError(self.service.failures.pop(0))
+        return self.func(**self.kwargs)
+
+
+class FakeSheetsService:
+    """In-memory Sheets v4 service"""
+
+    def __init__(self):
+        self.tabs = {}  # title -> {'sheetId': int, 'rows': [[...]]}
+        self.calls = []
+        self.formatting = []
+        self.failures = []
+        self._next_sheet_id = 1
+
+    def fail_next(self, count: int = 1, status: int = 429):
+        """Raise FakeHttpError(status) from the next `count` executes"""
+        self.failures.extend([status] * count)
+
+    def add_tab(self, title: str, rows: Optional[List[List]] = None) -> int:
+        sheet_id = self._next_sheet_id
+        self._next_sheet_id += 1
+        self.tabs[title] = {'sheetId': sheet_id, 'rows': [list(r) for r in rows or []]}
+        return sheet_id
+
+    def call_count(self, name: Optional[str] = None) -> int:
+        return sum(1 for call, _ in self.calls if name is None or call == name)
+
+    def spreadsheets(self):
+        return _Spreadsheets(self)
+
+    def _tab(self, range_name: str):
+        tab, start_row, end_row = parse_range(range_name)
+        if tab not in self.tabs:
+            raise ValueError(f"Unable to parse range: {range_name}")
+        return self.tabs[tab], start_row, end_row
+
+
+class _Spreadsheets:
+    def __init__(self, service: FakeSheetsService):
+        self.service = service
+
+    def values(self):
+        return _Values(self.service)
+
+    def get(self, **kwargs):
+        return FakeRequest(self.service, 'spreadsheets.get', self._get, **kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return FakeRequest(self.service, 'spreadsheets.batchUpdate', self._batch_update, **kwargs)
+
+    def _get(self, spreadsheetId, fields=None, **kwargs):
+        return {'sheets': [
+            {'properties': {'sheetId': tab['sheetId'], 'title': title}}
+            for title, tab in self.service.tabs.items()
+        ]}
+
+    def _batch_update(self, spreadsheetId, body):
+        replies = []
+        for request in body.get('requests', []):
+            if 'addSheet' in request:
+                title = request['addSheet']['properties']['title']
+                if title in self.service.tabs:
+                    raise ValueError(f"A sheet with the name \"{title}\" already exists")
+                sheet_id = self.service.add_tab(title)
+                replies.append({'addSheet': {'properties': {'sheetId': sheet_id, 'title': title}}})
+            elif 'deleteSheet' in request:
+                sheet_id = request['deleteSheet']['sheetId']
+                titles = [t for t, tab in self.service.tabs.items() if tab['sheetId'] == sheet_id]
+                if not titles:
+                    raise ValueError(f"No grid with id: {sheet_id}")
+                del self.service.tabs[titles[0]]
+                replies.append({})
+            else:
+                self.service.formatting.append(request)
+                replies.append({})
+        return {'spreadsheetId': spreadsheetId, 'replies': replies}
+
+
+class _Values:
+    def __init__(self, service: FakeSheetsService):
+        self.service = service
+
+    def get(self, **kwargs):
+        return FakeRequest(self.service, 'values.get', self._get, **kwargs)
+
+    def batchGet(self, **kwargs):
+        return FakeRequest(self.service, 'values.batchGet', self._batch_get, **kwargs)
+
+    def update(self, **kwargs):
+        return FakeRequest(self.service, 'values.update', self._update, **kwargs)
+
+    def batchUpdate(self, **kwargs):
+        return FakeRequest(self.service, 'values.batchUpdate', self._batch_update, **kwargs)
+
+    def append(self, **kwargs):
+        return FakeRequest(self.service, 'values.append', self._append, **kwargs)
+
+    def _read(self, range_name: str) -> Dict:
+        tab, start_row, end_row = self.service._tab(range_name)
+        start_col, end_col = parse_columns(range_name)
+        rows = [row[start_col:end_col] for row in tab['rows'][start_row - 1:end_row]]
+        while rows and not rows[-1]:
+            rows.pop()
+        result = {'range': range_name}
+        if rows:
+            result['values'] = [list(r) for r in rows]
+        return result
+
+    def _get(self, spreadsheetId, range, **kwargs):
+        return self._read(range)
+
+    def _batch_get(self, spreadsheetId, ranges, **kwargs):
+        return {'spreadsheetId': spreadsheetId, 'valueRanges': [self._read(r) for r in ranges]}
+
+    def _update(self, spreadsheetId, range, body, valueInputOption=None, **kwargs):
+        tab, start_row, _ = self.service._tab(range)
+        values = body.get('values', [])
+        rows = tab['rows']
+        while len(rows) < start_row - 1 + len(values):
+            rows.append([])
+        for i, row in enumerate(values):
+            rows[start_row - 1 + i] = list(row)
+        return {'updatedRange': range, 'updatedRows': len(values)}
+
+    def _batch_update(self, spreadsheetId, body):
+        responses = [
+            self._update(spreadsheetId, data['range'], {'values': data['values']})
+            for data in body.get('data', [])
+        ]
+        return {
+            'spreadsheetId': spreadsheetId,
+            'totalUpdatedRows': sum(r['updatedRows'] for r in responses),
+            'responses': responses
+        }
+
+    def _append(self, spreadsheetId, range, body, valueInputOption=None, insertDataOption=None, **kwargs):
+        tab_name, _, _ = parse_range(range)
+        tab, _, _ = self.service._tab(range)
+        rows = tab['rows']
+        while rows and not rows[-1]:
+            rows.pop()
+        start_row = len(rows) + 1
+        values = body.get('values', [])
+        rows.extend(list(r) for r in values)
+        end_row = len(rows)
+        quoted = "'" + tab_name.replace("'", "''") + "'"
+        return {
+            'spreadsheetId': spreadsheetId,
+            'tableRange': f"{quoted}!A1:Z{start_row - 1}" if start_row > 1 else None,
+            'updates': {
+                'updatedRange': f"{quoted}!A{start_row}:Z{end_row}",
+                'updatedRows': len(values)
+            }
+        }
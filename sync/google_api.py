@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Google API Access Layer - Shared clients with rate limiting and retries
+One GoogleAPIPool per token file hands out a single discovery-built client
+per service. Every .execute() made through a pooled client waits on a token
+bucket sized to that API's per-user quota and retries 429s and transient
+failures with exponential backoff and jitter. SheetsBatchWriter coalesces
+queued value writes and formatting requests into single batchUpdate calls.
+"""
+
+import os
+import pickle
+import random
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# (service, version) for each API the sync modules use
+API_VERSIONS = {
+    'sheets': 'v4',
+    'docs': 'v1',
+    'drive': 'v3'
+}
+
+# Token bucket (requests per second, burst) kept under the per-user quotas:
+# Sheets and Docs allow 60 write requests/minute, Drive 12,000 requests/minute
+API_QUOTAS = {
+    'sheets': (0.9, 5),
+    'docs': (0.9, 5),
+    'drive': (20.0, 20)
+}
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Retrying these after a 5xx could apply them twice; only 429s (never
+# applied) and connection failures are retried
+NON_IDEMPOTENT_METHODS = {'append', 'create', 'copy'}
+
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 32.0
+
+# Point every pooled client at a local stand-in (see fake_google_http.py)
+API_ENDPOINT_ENV = 'GOOGLE_API_ENDPOINT'
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available"""
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, sleeping as needed. Returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError (or compatible) exception"""
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None) or getattr(error, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception, method_name: str = '') -> bool:
+    """Whether a failed request is safe and worth retrying"""
+    status = error_status(error)
+    if status == 429:
+        return True
+    if status in RETRYABLE_STATUSES:
+        return method_name not in NON_IDEMPOTENT_METHODS
+    if status is None and isinstance(error, (ConnectionError, socket.timeout, TimeoutError)):
+        # Refused connections never reached the server
+        return isinstance(error, ConnectionRefusedError) or method_name not in NON_IDEMPOTENT_METHODS
+    return False
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class _RequestProxy:
+    """Wraps an HttpRequest so execute() is rate limited and retried"""
+
+    def __init__(self, pool: 'GoogleAPIPool', api: str, method_name: str, request):
+        self._pool = pool
+        self._api = api
+        self._method_name = method_name
+        self._request = request
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+    def execute(self, **kwargs):
+        return self._pool.execute(self._api, self._method_name, self._request, **kwargs)
+
+
+class _ResourceProxy:
+    """Wraps a service or resource so every request it builds goes through the pool"""
+
+    def __init__(self, pool: 'GoogleAPIPool', api: str, resource):
+        self._pool = pool
+        self._api = api
+        self._resource = resource
+
+    def __getattr__(self, name):
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, 'execute'):
+                return _RequestProxy(self._pool, self._api, name, result)
+            return _ResourceProxy(self._pool, self._api, result)
+        return call
+
+
+class GoogleAPIPool:
+    """Shared, rate-limited Google API clients for one set of credentials"""
+
+    _shared: Dict[str, 'GoogleAPIPool'] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, credentials=None, token_file: Optional[Path] = None,
+                 api_endpoint: Optional[str] = None, http=None,
+                 max_retries: int = MAX_RETRIES, sleep=time.sleep):
+        """
+        Args:
+            credentials: OAuth credentials; loaded from token_file when omitted
+            token_file: Pickled credentials (refreshed and re-saved when expired)
+            api_endpoint: Base URL of a local stand-in server (or GOOGLE_API_ENDPOINT)
+            http: httplib2.Http to use instead of credentials (for the stand-in)
+            max_retries: Retries per request before the error is raised
+        """
+        self.token_file = Path(token_file) if token_file else None
+        self.credentials = credentials
+        self.api_endpoint = api_endpoint or os.environ.get(API_ENDPOINT_ENV)
+        self.http = http
+        self.max_retries = max_retries
+        self.sleep = sleep
+        self.buckets = {api: TokenBucket(rate, burst, sleep=sleep) for api, (rate, burst) in API_QUOTAS.items()}
+        self.stats = {'requests': 0, 'retries': 0, 'throttled_seconds': 0.0}
+        self._services = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls, token_file: Path) -> 'GoogleAPIPool':
+        """Process-wide pool for a token file"""
+        key = str(Path(token_file).resolve())
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(token_file=token_file)
+            return cls._shared[key]
+
+    def get_credentials(self):
+        """Load (and refresh if expired) the pickled credentials"""
+        if self.credentials is None and self.token_file is not None:
+            with open(self.token_file, 'rb') as token:
+                self.credentials = pickle.load(token)
+
+        creds = self.credentials
+        if creds is not None and not creds.valid and creds.expired and creds.refresh_token:
+            from google.auth.transport.requests import Request
+            creds.refresh(Request())
+            if self.token_file is not None:
+                with open(self.token_file, 'wb') as token:
+                    pickle.dump(creds, token)
+        return creds
+
+    def service(self, api: str):
+        """Rate-limited, retrying client for 'sheets', 'docs' or 'drive' (built once)"""
+        with self._lock:
+            if api not in self._services:
+                self._services[api] = _ResourceProxy(self, api, self._build(api))
+            return self._services[api]
+
+    def wrap(self, api: str, service):
+        """Route an already-built (or fake) service through this pool"""
+        return _ResourceProxy(self, api, service)
+
+    def _build(self, api: str):
+        from googleapiclient.discovery import build
+
+        kwargs = {'cache_discovery': False}
+        http = self.http
+        if self.api_endpoint:
+            kwargs['client_options'] = {'api_endpoint': f"{self.api_endpoint.rstrip('/')}/{api}/"}
+            if http is None:
+                # The local stand-in needs no credentials
+                import httplib2
+                http = httplib2.Http()
+        if http is not None:
+            kwargs['http'] = http
+        else:
+            kwargs['credentials'] = self.get_credentials()
+        # Bundled (static) discovery documents: no discovery round-trip per build
+        return build(api, API_VERSIONS[api], **kwargs)
+
+    def _thread_http(self):
+        """
+        Per-thread authorized transport
+
+        googleapiclient clients share one httplib2.Http, which is not thread
+        safe; executing with a per-thread transport lets worker threads share
+        the pooled client.
+        """
+        if self.http is not None or self.api_endpoint or self.credentials is None:
+            return None
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            try:
+                import google_auth_httplib2
+                import httplib2
+            except ImportError:
+                return None
+            http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+    def execute(self, api: str, method_name: str, request, **kwargs):
+        """Execute a request under the API's rate limit, retrying transient failures"""
+        if threading.current_thread() is not threading.main_thread() and 'http' not in kwargs:
+            http = self._thread_http()
+            if http is not None:
+                kwargs['http'] = http
+
+        bucket = self.buckets.get(api)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                self.stats['throttled_seconds'] += bucket.acquire()
+            self.stats['requests'] += 1
+            try:
+                return request.execute(**kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e, method_name):
+                    raise
+                delay = backoff_delay(attempt)
+                attempt += 1
+                self.stats['retries'] += 1
+                print(f"   ⏳ {api}.{method_name} failed ({error_status(e) or type(e).__name__}); "
+                      f"retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                self.sleep(delay)
+
+
+class SheetsBatchWriter:
+    """
+    Coalesce queued Sheets writes into as few batchUpdate calls as possible
+
+    Value writes become one values.batchUpdate and formatting/structural
+    requests one spreadsheets.batchUpdate per flush (split only past the
+    per-call limits). Usable as a context manager that flushes on exit.
+    """
+
+    MAX_VALUE_RANGES = 500
+    MAX_REQUESTS = 500
+
+    def __init__(self, sheets_service, spreadsheet_id: str, value_input_option: str = 'USER_ENTERED'):
+        self.sheets_service = sheets_service
+        self.spreadsheet_id = spreadsheet_id
+        self.value_input_option = value_input_option
+        self.value_ranges: List[Dict] = []
+        self.requests: List[Dict] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+
+    def queue_values(self, range_name: str, values: List[List]):
+        self.value_ranges.append({'range': range_name, 'values': values})
+
+    def queue_requests(self, requests: List[Dict]):
+        self.requests.extend(requests)
+
+    @property
+    def pending(self) -> int:
+        return len(self.value_ranges) + len(self.requests)
+
+    def flush(self) -> Dict:
+        """Send queued writes; values first so formatting applies to written rows"""
+        responses = {'values': [], 'requests': []}
+
+        while self.value_ranges:
+            chunk = self.value_ranges[:self.MAX_VALUE_RANGES]
+            responses['values'].append(self.sheets_service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': self.value_input_option, 'data': chunk}
+            ).execute())
+            del self.value_ranges[:len(chunk)]
+
+        while self.requests:
+            chunk = self.requests[:self.MAX_REQUESTS]
+            responses['requests'].append(self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': chunk}
+            ).execute())
+            del self.requests[:len(chunk)]
+
+        return responses
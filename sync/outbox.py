@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""
+Outbox - Durable journal of outbound Google API operations
+Syncers enqueue every Sheets, Docs and Drive write here before anything
+touches the network. A flusher drains pending operations in batches when
+the APIs are reachable, stops cleanly when they are not, and resumes from
+the journal after a crash without repeating completed work.
+
+Journal records (one JSON object per line, append-only):
+    {"op": "enqueue", "id": ..., "kind": ..., "payload": ..., "depends_on": [...]}
+    {"op": "checkpoint", "id": ..., "data": {...}}   # partial progress
+    {"op": "done", "id": ..., "result": ...}
+    {"op": "failed", "id": ..., "error": ..., "attempts": n, "dead": bool}
+
+Payload values of the form {"$result": <op id>} are replaced with that
+operation's result before it runs, so a Sheets row can carry the URL of a
+Doc created earlier in the same drain.
+
+Usage:
+    python outbox.py status
+    python outbox.py flush [--budget SECONDS]
+    python outbox.py watch [--interval SECONDS]
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sync.google_api import GoogleAPIPool, is_retryable
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+DEFAULT_JOURNAL = DATA_DIR / 'outbox.jsonl'
+DEFAULT_TOKEN_FILE = DATA_DIR / 'google_token.pickle'
+
+MAX_ATTEMPTS = 3
+BATCH_SIZE = 20
+DEFAULT_FLUSH_BUDGET = 120  # seconds a syncer waits on the flush before finishing
+DONE_RETENTION_DAYS = 7
+
+# Concurrent Doc creation and uploads; the pooled clients still rate-limit every call
+WORKERS = 4
+
+# Errors that mean "offline", not "this operation is bad"
+CONNECTIVITY_ERRORS = {'ServerNotFoundError', 'TransportError', 'RelativeURIError'}
+
+
+def operation_id(kind: str, payload: Dict) -> str:
+    """Deterministic ID, so enqueueing the same operation twice is a no-op"""
+    canonical = json.dumps([kind, payload], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def result_ref(op_id: str) -> Dict:
+    """Placeholder for another operation's result inside a payload"""
+    return {'$result': op_id}
+
+
+def is_connectivity_error(error: Exception) -> bool:
+    return (is_retryable(error) or isinstance(error, OSError)
+            or type(error).__name__ in CONNECTIVITY_ERRORS)
+
+
+class Outbox:
+    """Append-only operation journal with replay"""
+
+    def __init__(self, journal_file: Path = DEFAULT_JOURNAL):
+        self.journal_file = Path(journal_file)
+        self.ops: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._replay()
+
+    def _replay(self):
+        self.ops = {}
+        if not self.journal_file.exists():
+            return
+        with open(self.journal_file, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn write from a crash
+                self._apply(record)
+
+    def _apply(self, record: Dict):
+        op_id = record['id']
+        if record['op'] == 'enqueue':
+            self.ops.setdefault(op_id, {
+                'id': op_id,
+                'kind': record['kind'],
+                'payload': record['payload'],
+                'depends_on': record.get('depends_on', []),
+                'enqueued_at': record.get('ts'),
+                'status': 'pending',
+                'attempts': 0,
+                'checkpoint': {}
+            })
+            return
+
+        op = self.ops.get(op_id)
+        if op is None:
+            return
+        if record['op'] == 'checkpoint':
+            op['checkpoint'].update(record['data'])
+        elif record['op'] == 'done':
+            op['status'] = 'done'
+            op['result'] = record.get('result')
+            op['done_at'] = record.get('ts')
+        elif record['op'] == 'failed':
+            op['attempts'] = record['attempts']
+            op['error'] = record['error']
+            if record.get('dead'):
+                op['status'] = 'dead'
+
+    def _write(self, record: Dict):
+        record['ts'] = datetime.now().isoformat()
+        with self._lock:
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, 'a') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._apply(record)
+
+    def enqueue(self, kind: str, payload: Dict, depends_on: Optional[List[str]] = None) -> str:
+        """Journal an operation; returns its ID (existing ID if already journaled)"""
+        op_id = operation_id(kind, payload)
+        if op_id not in self.ops:
+            self._write({'op': 'enqueue', 'id': op_id, 'kind': kind,
+                         'payload': payload, 'depends_on': depends_on or []})
+        return op_id
+
+    def checkpoint(self, op_id: str, **data):
+        self._write({'op': 'checkpoint', 'id': op_id, 'data': data})
+
+    def mark_done(self, op_id: str, result=None):
+        self._write({'op': 'done', 'id': op_id, 'result': result})
+
+    def mark_failed(self, op_id: str, error: Exception):
+        attempts = self.ops[op_id]['attempts'] + 1
+        self._write({'op': 'failed', 'id': op_id, 'error': str(error)[:500],
+                     'attempts': attempts, 'dead': attempts >= MAX_ATTEMPTS})
+
+    def pending(self) -> List[Dict]:
+        """Pending operations in journal order"""
+        return [op for op in self.ops.values() if op['status'] == 'pending']
+
+    def get(self, op_id: str) -> Optional[Dict]:
+        return self.ops.get(op_id)
+
+    def compact(self):
+        """Rewrite the journal without old completed operations"""
+        cutoff = (datetime.now() - timedelta(days=DONE_RETENTION_DAYS)).isoformat()
+        keep = [op for op in self.ops.values()
+                if op['status'] == 'pending' or (op.get('done_at') or '') >= cutoff]
+        if len(keep) == len(self.ops):
+            return
+
+        tmp_file = self.journal_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            for op in keep:
+                records = [{'op': 'enqueue', 'id': op['id'], 'kind': op['kind'], 'payload': op['payload'],
+                            'depends_on': op['depends_on'], 'ts': op['enqueued_at']}]
+                if op['checkpoint']:
+                    records.append({'op': 'checkpoint', 'id': op['id'], 'data': op['checkpoint']})
+                if op['attempts']:
+                    records.append({'op': 'failed', 'id': op['id'], 'error': op.get('error', ''),
+                                    'attempts': op['attempts'], 'dead': op['status'] == 'dead'})
+                if op['status'] == 'done':
+                    records.append({'op': 'done', 'id': op['id'], 'result': op.get('result'),
+                                    'ts': op.get('done_at')})
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_file.replace(self.journal_file)
+        self._replay()
+
+
+class OutboxContext:
+    """Services and sync engines handlers run against (built lazily)"""
+
+    def __init__(self, token_file: Path = DEFAULT_TOKEN_FILE, sheets=None, docs=None, drive=None,
+                 state_file: Optional[Path] = None):
+        self.token_file = token_file
+        self._services = {'sheets': sheets, 'docs': docs, 'drive': drive}
+        self.state_file = state_file or DATA_DIR / 'sheets_sync_state.json'
+        self.engines = {}
+
+    def service(self, api: str):
+        if self._services[api] is None:
+            self._services[api] = GoogleAPIPool.shared(self.token_file).service(api)
+        return self._services[api]
+
+    def engine(self, spreadsheet_id: str):
+        from sync.sheets_sync_engine import SheetsSyncEngine
+
+        if spreadsheet_id not in self.engines:
+            # The Sheets client is only built once the engine makes its first call
+            self.engines[spreadsheet_id] = SheetsSyncEngine(
+                self._services['sheets'], spreadsheet_id, self.state_file,
+                service_factory=lambda: self.service('sheets')
+            )
+        return self.engines[spreadsheet_id]
+
+
+# kind -> batch runner. A runner takes the ready ops of its kind (payloads
+# already resolved) and returns {op id: result or exception}.
+HANDLERS: Dict[str, Callable] = {}
+
+
+def handler(kind: str):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+@handler('sheets.sync_rows')
+def run_sheet_syncs(ops: List[Dict], ctx: OutboxContext, outbox: Outbox) -> Dict:
+    """Merge queued row syncs for the same tab into one sync_rows call each"""
+    from sync.sheets_sync_engine import approval_format_requests
+
+    groups = {}
+    for op in ops:
+        p = op['payload']
+        target = (p['spreadsheet_id'], p['tab'], tuple(p['headers']), tuple(p['key_columns']),
+                  p.get('upsert', False), tuple(p.get('volatile_columns', ())), p.get('approval_column'))
+        groups.setdefault(target, []).append(op)
+
+    results = {}
+    for (spreadsheet_id, tab, headers, key_columns, upsert, volatile, approval_column), group in groups.items():
+        rows = [row for op in group for row in op['payload']['rows']]
+        digests = [digest for op in group
+                   for digest in op['payload'].get('row_digests') or [None] * len(op['payload']['rows'])]
+        first_run_requests = None
+        if approval_column is not None:
+            first_run_requests = lambda sheet_id, column=approval_column: approval_format_requests(sheet_id, column)
+        try:
+            result = ctx.engine(spreadsheet_id).sync_rows(
+                tab, list(headers), rows, key_columns=key_columns, upsert=upsert,
+                volatile_columns=volatile, first_run_requests=first_run_requests,
+                row_digests=digests
+            )
+        except Exception as e:
+            result = e
+        for op in group:
+            results[op['id']] = result
+    return results
+
+
+@handler('docs.create_document')
+def run_document_creates(ops: List[Dict], ctx: OutboxContext, outbox: Outbox) -> Dict:
+    """Create Docs concurrently; each is create + one batchUpdate + optional share"""
+    def create(op):
+        payload = op['payload']
+        doc_id = op['checkpoint'].get('document_id')
+        if doc_id is None:
+            doc = ctx.service('docs').documents().create(body={'title': payload['title']}).execute()
+            doc_id = doc.get('documentId')
+            # Journal the ID before filling the Doc, so a crash here never creates it twice
+            outbox.checkpoint(op['id'], document_id=doc_id)
+
+        if payload.get('requests') and not op['checkpoint'].get('filled'):
+            ctx.service('docs').documents().batchUpdate(
+                documentId=doc_id,
+                body={'requests': payload['requests']}
+            ).execute()
+            outbox.checkpoint(op['id'], filled=True)
+
+        if payload.get('share_with_anyone'):
+            ctx.service('drive').permissions().create(
+                fileId=doc_id,
+                body={'type': 'anyone', 'role': 'reader'}
+            ).execute()
+
+        return f"https://docs.google.com/document/d/{doc_id}"
+
+    return _run_concurrently(create, ops, max_workers=WORKERS)
+
+
+@handler('drive.upload_file')
+def run_file_uploads(ops: List[Dict], ctx: OutboxContext, outbox: Outbox) -> Dict:
+    """Upload files per Drive folder: one folder listing, then concurrent resumable uploads"""
+    from pillar_scripts.upload_to_gdrive import UploadManifest, upload_files
+
+    manifest = UploadManifest()
+    by_folder = {}
+    for op in ops:
+        by_folder.setdefault(op['payload']['folder_id'], []).append(op)
+
+    results = {}
+    for folder_id, folder_ops in by_folder.items():
+        paths = [Path(op['payload']['path']) for op in folder_ops]
+        try:
+            uploaded = upload_files(ctx.service('drive'), paths, folder_id, manifest, workers=WORKERS)
+        except Exception as e:
+            uploaded = {path: e for path in paths}
+        for op, path in zip(folder_ops, paths):
+            result = uploaded[path]
+            if isinstance(result, dict):
+                result = {'id': result.get('id'), 'webViewLink': result.get('webViewLink')}
+            results[op['id']] = result
+    return results
+
+
+def _run_concurrently(func: Callable, ops: List[Dict], max_workers: int) -> Dict:
+    def call(op):
+        try:
+            return func(op)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ops))) as executor:
+        return dict(zip([op['id'] for op in ops], executor.map(call, ops)))
+
+
+class OutboxFlusher:
+    """Drain pending operations in dependency order, in batches"""
+
+    def __init__(self, outbox: Outbox, context: OutboxContext):
+        self.outbox = outbox
+        self.context = context
+
+    def _resolve(self, value):
+        if isinstance(value, dict):
+            if set(value) == {'$result'}:
+                dependency = self.outbox.get(value['$result'])
+                # Dead dependencies resolve to empty (e.g. a blank Doc URL cell)
+                return dependency.get('result', '') if dependency else ''
+            return {k: self._resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._resolve(v) for v in value]
+        return value
+
+    def _ready(self, op: Dict) -> bool:
+        for dep_id in op['depends_on']:
+            dependency = self.outbox.get(dep_id)
+            if dependency and dependency['status'] == 'pending':
+                return False
+        return True
+
+    def drain(self, budget: Optional[float] = None, batch_size: int = BATCH_SIZE) -> Dict:
+        """
+        Run pending operations until done, offline, or out of time
+
+        Args:
+            budget: Seconds to spend; stops between batches when exceeded
+            batch_size: Maximum operations handed to one batch runner
+
+        Returns:
+            Dictionary with 'done', 'failed', 'pending' counts and 'offline'
+        """
+        lock_file = self.outbox.journal_file.with_suffix('.lock')
+        lock_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_file, 'w') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                print("   ⏳ Another flusher is draining the outbox")
+                return {'done': 0, 'failed': 0, 'pending': len(self.outbox.pending()), 'offline': False}
+
+            # Another process may have appended since we replayed
+            self.outbox._replay()
+            return self._drain(budget, batch_size)
+
+    def _drain(self, budget: Optional[float], batch_size: int) -> Dict:
+        started = time.monotonic()
+        stats = {'done': 0, 'failed': 0, 'offline': False}
+        attempted = set()  # failed ops wait for the next drain
+
+        while True:
+            if budget is not None and time.monotonic() - started > budget:
+                print(f"   ⏱️  Flush budget of {budget:.0f}s used; remaining operations stay queued")
+                break
+
+            ready = [op for op in self.outbox.pending() if op['id'] not in attempted and self._ready(op)]
+            if not ready:
+                break
+
+            kind = ready[0]['kind']
+            batch = [op for op in ready if op['kind'] == kind][:batch_size]
+            attempted.update(op['id'] for op in batch)
+            runner = HANDLERS.get(kind)
+            if runner is None:
+                for op in batch:
+                    self.outbox.mark_failed(op['id'], LookupError(f"No handler for {kind}"))
+                    stats['failed'] += 1
+                continue
+
+            resolved = [dict(op, payload=self._resolve(op['payload'])) for op in batch]
+            results = runner(resolved, self.context, self.outbox)
+
+            offline = False
+            for op in batch:
+                result = results.get(op['id'])
+                if isinstance(result, Exception):
+                    if is_connectivity_error(result):
+                        offline = True
+                        continue
+                    self.outbox.mark_failed(op['id'], result)
+                    stats['failed'] += 1
+                    print(f"   ⚠️  {kind} {op['id']} failed: {result}")
+                else:
+                    self.outbox.mark_done(op['id'], result)
+                    stats['done'] += 1
+
+            if offline:
+                stats['offline'] = True
+                print(f"   📴 Google APIs unreachable; {len(self.outbox.pending())} operations stay queued")
+                break
+
+        stats['pending'] = len(self.outbox.pending())
+        if not stats['pending']:
+            self.outbox.compact()
+        return stats
+
+
+def flush(outbox: Outbox, context: OutboxContext, budget: Optional[float] = DEFAULT_FLUSH_BUDGET) -> Dict:
+    """Drain an outbox, printing a one-line summary"""
+    stats = OutboxFlusher(outbox, context).drain(budget=budget)
+    print(f"   📮 Outbox: {stats['done']} sent, {stats['failed']} failed, {stats['pending']} queued")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and drain the Google API outbox")
+    parser.add_argument('command', choices=['status', 'flush', 'watch'])
+    parser.add_argument('--journal', type=Path, default=DEFAULT_JOURNAL)
+    parser.add_argument('--token', type=Path, default=DEFAULT_TOKEN_FILE)
+    parser.add_argument('--budget', type=float, default=None, help="Seconds per flush")
+    parser.add_argument('--interval', type=float, default=300, help="Seconds between watch flushes")
+    args = parser.parse_args()
+
+    outbox = Outbox(args.journal)
+
+    if args.command == 'status':
+        counts = {}
+        for op in outbox.ops.values():
+            counts[op['status']] = counts.get(op['status'], 0) + 1
+        print(f"📮 {args.journal}")
+        for status, count in sorted(counts.items()):
+            print(f"   {status}: {count}")
+        for op in outbox.pending():
+            error = f" (last error: {op['error'][:80]})" if op.get('error') else ''
+            print(f"   ⏳ {op['id']} {op['kind']} attempts={op['attempts']}{error}")
+        return
+
+    context = OutboxContext(token_file=args.token)
+    if args.command == 'flush':
+        flush(outbox, context, budget=args.budget)
+        return
+
+    print(f"👀 Watching outbox (every {args.interval:.0f}s, Ctrl+C to stop)")
+    try:
+        while True:
+            outbox._replay()
+            if outbox.pending():
+                flush(outbox, context, budget=args.budget)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
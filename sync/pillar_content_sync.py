@@ -4,48 +4,27 @@ Sync Pillar Content to Google Sheets
 Generates pillar content and syncs to Google Sheets with date column
 """
 
+import hashlib
 import json
-import pickle
-import re
 import sys
 from pathlib import Path
 from datetime import datetime
-from googleapiclient.discovery import build
 
 # Add parent directory to path to import from generators
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from generators.dynamic_pillar_generator import DynamicPillarGenerator
+from sync.outbox import Outbox, OutboxContext, flush, operation_id, result_ref
+from sync.sheets_sync_engine import row_digest, row_key
+from utils.remove_emojis import sanitize_row
 
-def remove_emojis(text):
-    """Remove all emojis from text"""
-    if not text:
-        return text
-
-    # Remove emojis using regex
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"
-        "\U0001F300-\U0001F5FF"
-        "\U0001F680-\U0001F6FF"
-        "\U0001F1E0-\U0001F1FF"
-        "\U00002702-\U000027B0"
-        "\U000024C2-\U0001F251"
-        "\U0001F900-\U0001F9FF"
-        "\U0001FA00-\U0001FAFF"
-        "]+",
-        flags=re.UNICODE
-    )
-
-    # Common text emojis to remove
-    text_emojis = ['✅', '❌', '🎯', '📊', '🔥', '💡', '⚡', '🚀', '✨', '📝', '🎉', '🎬', '📡', '📋', '📈', '🔗', '🎨', '🗑️', '⏳', '⚠️', '🧵', '👇']
-
-    text = emoji_pattern.sub('', text)
-    for emoji in text_emojis:
-        text = text.replace(emoji, '')
-
-    # Clean up extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+# Title and created date identify a pillar row across runs
+KEY_COLUMNS = [1, 6]
+
+# The YouTube script's Doc link; a new Doc (and URL) is published per run
+YOUTUBE_DOC_COLUMN = 9
+
+# Twitter thread: tweets are sanitized one by one, keeping the blank lines between them
+THREAD_COLUMN = 11
 
 
 class PillarContentSyncer:
@@ -55,15 +34,6 @@ class PillarContentSyncer:
         self.agents_dir = Path(__file__).parent
         self.token_file = self.agents_dir.parent / 'data' / 'google_token.pickle'
 
-        # Load credentials
-        with open(self.token_file, 'rb') as token:
-            self.creds = pickle.load(token)
-
-        # Initialize services
-        self.sheets_service = build('sheets', 'v4', credentials=self.creds)
-        self.docs_service = build('docs', 'v1', credentials=self.creds)
-        self.drive_service = build('drive', 'v3', credentials=self.creds)
-
         # Load Google Sheets results to get spreadsheet ID
         results_file = self.agents_dir.parent / 'data' / 'google_sheets_results.json'
         with open(results_file, 'r') as f:
@@ -71,7 +41,19 @@ class PillarContentSyncer:
             self.spreadsheet_id = results['spreadsheet_id']
             self.spreadsheet_url = results['spreadsheet_url']
 
-    def generate_and_sync(self):
+        # Docs and Sheets writes are journaled first, then flushed. Shared,
+        # rate-limited clients are built on the first flush that needs them,
+        # so an offline run still journals its writes.
+        self.outbox = Outbox()
+        self.outbox_context = OutboxContext(
+            token_file=self.token_file,
+            state_file=self.agents_dir.parent / 'data' / 'sheets_sync_state.json'
+        )
+
+        # Sheet IDs and row counts are cached locally between runs
+        self.sync_engine = self.outbox_context.engine(self.spreadsheet_id)
+
+    def generate_and_sync(self, upsert=False):
         """Generate pillar content and sync to Google Sheets"""
 
         print("\n" + "="*100)
@@ -100,7 +82,7 @@ class PillarContentSyncer:
 
         # Sync to Google Sheets
         print("\n2. Syncing to Google Sheets...")
-        result = self._sync_to_sheets(pillars)
+        result = self._sync_to_sheets(pillars, upsert=upsert)
 
         print("\n" + "="*100)
         print("✅ PILLAR CONTENT SYNC COMPLETE!")
@@ -111,27 +93,20 @@ class PillarContentSyncer:
 
         print(f"\n📝 Tab: Pillar Content")
         print(f"   Date: {result['date']}")
-        print(f"   Pillars added: {result['rows_written']}")
-        print(f"   Total rows: {result['total_rows']}")
+        if result['rows_queued']:
+            print(f"   Pillars queued: {result['rows_queued']}")
+        else:
+            print(f"   Pillars added: {result['rows_written']}")
+            print(f"   Total rows: {result['total_rows']}")
 
         return result
 
-    def _sync_to_sheets(self, pillars):
+    def _sync_to_sheets(self, pillars, upsert=False):
         """Sync pillar content to Google Sheets - Single 'Pillar Content' tab"""
 
         tab_name = "Pillar Content"
         today = datetime.now().strftime('%Y-%m-%d')
 
-        # Check if tab exists
-        sheet_exists = self._check_sheet_exists(tab_name)
-
-        if not sheet_exists:
-            print(f"   Creating 'Pillar Content' tab (first time)...")
-            try:
-                self._create_sheet_tab(tab_name)
-            except Exception as e:
-                print(f"   ⚠️  Could not create tab: {e}")
-
         # Prepare headers - EXACT structure from rows 1-4
         headers = [
             'Pillar ID',
@@ -170,69 +145,103 @@ class PillarContentSyncer:
             'Hook Format Reference'
         ]
 
-        # Get existing data
-        existing_data = self._get_existing_data(tab_name)
-
-        if not existing_data or len(existing_data) == 0:
-            # First time - add headers
-            rows = [headers]
-            print(f"   ✅ First run - adding headers")
-        else:
-            # Append mode - no headers
-            rows = []
-            print(f"   ✅ Appending to existing {len(existing_data)-1} rows")
-
-        # Format pillar data into rows
+        # Rows are keyed on title + created date and compared by digest against the
+        # local row index first, so a YouTube Doc is only published for a pillar whose
+        # row will be appended (new) or rewritten (--upsert with changed content)
+        synced = self.sync_engine.synced_keys(tab_name)
+        pending, rows, digests = [], [], []
+        skipped = 0
         for pillar in pillars:
             row = self._format_pillar_row(pillar, today)
+            key = row_key(row[i] for i in KEY_COLUMNS)
+            digest = self._row_digest(row, pillar)
+            if key in synced and (not upsert or synced[key][1] == digest):
+                skipped += 1
+                continue
+            pending.append(pillar)
             rows.append(row)
-
-        # Write to sheet
-        if not existing_data or len(existing_data) == 0:
-            # First time - write from A1
-            range_name = f"{tab_name}!A1"
+            digests.append(digest)
+        pillars = pending
+
+        # Journal one Doc per YouTube script; each row carries a placeholder
+        # that the flusher fills with its Doc's URL (created concurrently)
+        doc_ops = [
+            self.outbox.enqueue('docs.create_document', {
+                'title': f"YouTube Script - {pillar['idea'].get('title', 'Untitled')}",
+                'requests': self._youtube_doc_requests(pillar),
+                'share_with_anyone': True
+            })
+            for pillar in pillars
+        ]
+        for row, op_id in zip(rows, doc_ops):
+            row[YOUTUBE_DOC_COLUMN] = result_ref(op_id)
+
+        # Then a single Sheets write: one append, one batchUpdate formatting only the new rows.
+        # The Doc URL is new on every publish, so the digest hashes the script text instead.
+        payload = {
+            'spreadsheet_id': self.spreadsheet_id,
+            'tab': tab_name,
+            'headers': headers,
+            'rows': rows,
+            'key_columns': KEY_COLUMNS,
+            'upsert': upsert,
+            'row_digests': digests
+        }
+        already_synced = (self.outbox.get(operation_id('sheets.sync_rows', payload)) or {}).get('status') == 'done'
+        op = {'status': 'done'}
+        if rows:
+            sheet_op = self.outbox.enqueue('sheets.sync_rows', payload, depends_on=doc_ops)
+            print(f"   📄 Publishing {len(pillars)} YouTube script Docs, then writing the sheet...")
+            flush(self.outbox, self.outbox_context)
+            op = self.outbox.get(sheet_op) or op  # compacted: completed long ago
+        queued = op['status'] == 'pending'
+        result = {} if already_synced else op.get('result') or {}
+        rows_written = result.get('rows_written', 0)
+        if already_synced:
+            # An identical earlier run already pushed every row
+            skipped += len(rows)
         else:
-            # Append - start after existing data
-            next_row = len(existing_data) + 1
-            range_name = f"{tab_name}!A{next_row}"
-
-        self.sheets_service.spreadsheets().values().update(
-            spreadsheetId=self.spreadsheet_id,
-            range=range_name,
-            valueInputOption='USER_ENTERED',
-            body={'values': rows}
-        ).execute()
-
-        total_rows = (len(existing_data) if existing_data else 0) + len(rows)
-        print(f"   ✅ Wrote {len(rows)} new rows (total: {total_rows} rows)")
-
-        # Format the sheet (only on first run)
-        if not existing_data or len(existing_data) == 0:
-            print(f"   🎨 Formatting sheet...")
-            self._format_sheet(tab_name, total_rows, len(headers))
+            skipped += result.get('rows_skipped', 0)
+        # Nothing written this run (all skipped, or queued): report the cached count
+        total_rows = result.get('total_rows', self.sync_engine.cached_rows(tab_name))
+
+        if queued:
+            print(f"   📮 Queued {len(rows)} pillars in the outbox; run 'python sync/outbox.py flush' when online")
+        elif op['status'] == 'dead':
+            print(f"   ❌ Sheets write failed permanently: {op.get('error')}")
+        elif result:
+            if result.get('first_run'):
+                print(f"   ✅ First run - added headers and formatted sheet")
+            print(f"   ✅ Wrote {rows_written} new rows (total: {total_rows} rows)")
+            if result.get('rows_updated'):
+                print(f"   ✅ Updated {result['rows_updated']} changed rows in place")
+        if skipped:
+            print(f"   ⏭️  Skipped {skipped} pillars already in the sheet")
 
         return {
             'spreadsheet_url': self.spreadsheet_url,
             'tab_name': tab_name,
             'date': today,
-            'rows_written': len(rows),
+            'rows_written': rows_written,
+            'rows_updated': result.get('rows_updated', 0),
+            'rows_skipped': skipped,
+            'rows_queued': len(rows) if queued else 0,
             'total_rows': total_rows
         }
 
-    def _create_youtube_doc(self, pillar):
-        """Create a Google Doc with the YouTube script and return the URL"""
-
-        idea = pillar['idea']
-        content = pillar['content']
-        youtube_script = content.get('youtube_script', '')
+    def _row_digest(self, row, pillar):
+        """Row content digest with the script's hash in place of its Doc URL"""
+        script = pillar['content'].get('youtube_script', '') or ''
+        script_hash = hashlib.sha1(script.encode('utf-8')).hexdigest()
+        return row_digest(row[:YOUTUBE_DOC_COLUMN] + [script_hash] + row[YOUTUBE_DOC_COLUMN + 1:])
 
-        # Create the document
-        doc_title = f"YouTube Script - {idea.get('title', 'Untitled')}"
-        doc = self.docs_service.documents().create(body={'title': doc_title}).execute()
-        doc_id = doc.get('documentId')
+    def _youtube_doc_requests(self, pillar):
+        """All text inserts for a script Doc, sent as a single batchUpdate"""
+        youtube_script = pillar['content'].get('youtube_script', '')
+        if not youtube_script:
+            return []
 
-        # Add content to the document
-        requests = [
+        return [
             {
                 'insertText': {
                     'location': {'index': 1},
@@ -241,21 +250,7 @@ class PillarContentSyncer:
             }
         ]
 
-        self.docs_service.documents().batchUpdate(
-            documentId=doc_id,
-            body={'requests': requests}
-        ).execute()
-
-        # Make it publicly viewable (optional - adjust permissions as needed)
-        self.drive_service.permissions().create(
-            fileId=doc_id,
-            body={'type': 'anyone', 'role': 'reader'}
-        ).execute()
-
-        doc_url = f"https://docs.google.com/document/d/{doc_id}"
-        return doc_url
-
-    def _format_pillar_row(self, pillar, date):
+    def _format_pillar_row(self, pillar, date, youtube_doc_url=''):
         """Format a pillar into a sheet row - EXACT 34-column structure"""
 
         idea = pillar['idea']
@@ -263,20 +258,17 @@ class PillarContentSyncer:
         real_data = pillar['real_data']
         hook_framework = pillar.get('hook_framework', {})
 
-        # Create Google Doc with YouTube script
-        print(f"      Creating Google Doc for YouTube script...")
-        youtube_doc_url = self._create_youtube_doc(pillar)
-
         # Get content
-        linkedin_article = remove_emojis(content.get('linkedin_article', ''))
+        linkedin_article = content.get('linkedin_article', '')
 
         # Format Twitter thread
         twitter_thread = content.get('twitter_thread', {})
         tweets = twitter_thread.get('tweets', [])
         if isinstance(tweets, list):
-            thread_text = '\n\n'.join([f"Tweet {i+1}: {remove_emojis(tweet.get('text', ''))}" for i, tweet in enumerate(tweets)])
+            texts = sanitize_row([tweet.get('text', '') for tweet in tweets])
+            thread_text = '\n\n'.join([f"Tweet {i+1}: {text}" for i, text in enumerate(texts)])
         else:
-            thread_text = remove_emojis(str(tweets))
+            thread_text = sanitize_row([str(tweets)])[0]
 
         # Get individual posts
         short_posts = content.get('short_posts', [])
@@ -288,7 +280,7 @@ class PillarContentSyncer:
             for post in short_posts:
                 if isinstance(post, dict):
                     platform = post.get('platform', '').lower()
-                    text = remove_emojis(post.get('post', ''))
+                    text = post.get('post', '')
                     if 'instagram' in platform:
                         instagram_post = text
                     elif 'threads' in platform:
@@ -309,7 +301,8 @@ class PillarContentSyncer:
         time_savings = examples[0].get('business_value', '') if examples else ''
 
         # Tech stack
-        tech_stack = ", ".join(set([ex.get('tech', '') for ex in examples if isinstance(ex, dict) and ex.get('tech')]))
+        # Deduplicated in example order, so the row (and its digest) is the same every run
+        tech_stack = ", ".join(dict.fromkeys(ex.get('tech', '') for ex in examples if isinstance(ex, dict) and ex.get('tech')))
 
         # Generate hook variations (5 variations)
         title = idea.get('title', '')
@@ -338,165 +331,48 @@ class PillarContentSyncer:
         # Hook format reference
         hook_ref = hook_framework.get('description', 'Transformation story')
 
-        return [
+        # One sanitize pass over the whole row, as in sync_to_google_sheets
+        return sanitize_row([
             pillar.get('id', ''),  # Pillar ID
-            remove_emojis(title),
-            remove_emojis(idea.get('category', '')),
-            remove_emojis(idea.get('hook_type', '')),
-            remove_emojis(idea.get('audience', '')),
-            remove_emojis(idea.get('urgency', '')),
+            title,
+            idea.get('category', ''),
+            idea.get('hook_type', ''),
+            idea.get('audience', ''),
+            idea.get('urgency', ''),
             idea.get('created_date', date),
-            remove_emojis(examples_text),
-            remove_emojis(stats_text),
+            examples_text,
+            stats_text,
             youtube_doc_url,  # Google Doc URL!
             linkedin_article,
             thread_text,
             instagram_post,
             threads_post,
             single_tweet,
-            remove_emojis(business_value),
-            remove_emojis(time_savings),
-            remove_emojis(tech_stack),
+            business_value,
+            time_savings,
+            tech_stack,
             'Ready',
             '',  # Notes
-            remove_emojis(hook_a),
-            remove_emojis(hook_b),
-            remove_emojis(hook_c),
-            remove_emojis(hook_d),
-            remove_emojis(hook_e),
-            remove_emojis(contrast_1),
-            remove_emojis(contrast_2),
-            remove_emojis(contrast_3),
-            remove_emojis(stat_var_1),
-            remove_emojis(stat_var_2),
-            remove_emojis(stat_var_3),
-            remove_emojis(story_1),
-            remove_emojis(story_2),
-            remove_emojis(hook_ref)
-        ]
-
-    def _create_sheet_tab(self, tab_name):
-        """Create a new sheet tab"""
-
-        request = {
-            'addSheet': {
-                'properties': {
-                    'title': tab_name
-                }
-            }
-        }
-
-        self.sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=self.spreadsheet_id,
-            body={'requests': [request]}
-        ).execute()
-
-    def _check_sheet_exists(self, tab_name):
-        """Check if a sheet tab exists"""
-        try:
-            spreadsheet = self.sheets_service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
-            ).execute()
-
-            for sheet in spreadsheet.get('sheets', []):
-                if sheet['properties']['title'] == tab_name:
-                    return True
-            return False
-        except Exception as e:
-            print(f"   ⚠️  Error checking sheet: {e}")
-            return False
-
-    def _get_existing_data(self, tab_name):
-        """Get existing data from sheet"""
-        try:
-            result = self.sheets_service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{tab_name}!A:Z"
-            ).execute()
-            return result.get('values', [])
-        except Exception as e:
-            return []
-
-    def _format_sheet(self, tab_name, num_rows, num_cols):
-        """Format the sheet for better readability"""
-
-        # Get sheet ID
-        spreadsheet = self.sheets_service.spreadsheets().get(
-            spreadsheetId=self.spreadsheet_id
-        ).execute()
-
-        sheet_id = None
-        for sheet in spreadsheet.get('sheets', []):
-            if sheet['properties']['title'] == tab_name:
-                sheet_id = sheet['properties']['sheetId']
-                break
-
-        if sheet_id is None:
-            print("   ⚠️  Could not find sheet ID for formatting")
-            return
-
-        requests = []
-
-        # 1. Freeze header row
-        requests.append({
-            'updateSheetProperties': {
-                'properties': {
-                    'sheetId': sheet_id,
-                    'gridProperties': {
-                        'frozenRowCount': 1
-                    }
-                },
-                'fields': 'gridProperties.frozenRowCount'
-            }
-        })
-
-        # 2. Bold header row
-        requests.append({
-            'repeatCell': {
-                'range': {
-                    'sheetId': sheet_id,
-                    'startRowIndex': 0,
-                    'endRowIndex': 1
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                        'textFormat': {
-                            'foregroundColor': {'red': 1, 'green': 1, 'blue': 1},
-                            'fontSize': 10,
-                            'bold': True
-                        }
-                    }
-                },
-                'fields': 'userEnteredFormat(backgroundColor,textFormat)'
-            }
-        })
-
-        # 3. Auto-resize columns
-        requests.append({
-            'autoResizeDimensions': {
-                'dimensions': {
-                    'sheetId': sheet_id,
-                    'dimension': 'COLUMNS',
-                    'startIndex': 0,
-                    'endIndex': num_cols
-                }
-            }
-        })
-
-        try:
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body={'requests': requests}
-            ).execute()
-            print("   ✅ Sheet formatted successfully")
-        except Exception as e:
-            print(f"   ⚠️  Some formatting may have failed: {e}")
+            hook_a,
+            hook_b,
+            hook_c,
+            hook_d,
+            hook_e,
+            contrast_1,
+            contrast_2,
+            contrast_3,
+            stat_var_1,
+            stat_var_2,
+            stat_var_3,
+            story_1,
+            story_2,
+            hook_ref
+        ], raw_columns=[THREAD_COLUMN])
 
 
 def main():
     syncer = PillarContentSyncer()
-    result = syncer.generate_and_sync()
+    result = syncer.generate_and_sync(upsert='--upsert' in sys.argv[1:])
 
     print("\n" + "="*100)
     print("🎉 READY TO USE!")
@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Sheets Sync Engine - Append-only row sync with locally cached tab state
+Caches each tab's sheet ID and row high-water mark so a sync is one
+values.append plus one batchUpdate that formats only the new rows, instead
+of re-reading spreadsheet metadata and the whole tab on every run.
+Rows synced through sync_rows() carry a stable key, and a local hash index
+lets re-runs skip (or update in place) rows that were already pushed.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sync.google_api import SheetsBatchWriter
+
+UPDATED_RANGE_PATTERN = re.compile(r"![A-Z]+(\d+)(?::[A-Z]+(\d+))?$")
+
+ROW_KEY_HEADER = 'Row Key'
+
+
+def quote_tab(tab_name: str) -> str:
+    """A1-notation sheet name, quoted so names with spaces parse"""
+    return "'" + tab_name.replace("'", "''") + "'"
+
+
+def column_letter(index: int) -> str:
+    """A1 column letter for a 0-based column index"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def row_key(values: Iterable) -> str:
+    """Stable identity hash for a row, from its key column values"""
+    payload = json.dumps([str(v) for v in values], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def row_digest(row: Sequence, ignore_columns: Iterable[int] = ()) -> str:
+    """Content hash of a row, used to detect rows that changed since they were pushed"""
+    ignored = set(ignore_columns)
+    payload = json.dumps([str(v) for i, v in enumerate(row) if i not in ignored], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def header_format_requests(sheet_id: int, num_cols: int) -> List[Dict]:
+    """Freeze, style and auto-size the header row"""
+    return [
+        {
+            'updateSheetProperties': {
+                'properties': {
+                    'sheetId': sheet_id,
+                    'gridProperties': {
+                        'frozenRowCount': 1
+                    }
+                },
+                'fields': 'gridProperties.frozenRowCount'
+            }
+        },
+        {
+            'repeatCell': {
+                'range': {
+                    'sheetId': sheet_id,
+                    'startRowIndex': 0,
+                    'endRowIndex': 1
+                },
+                'cell': {
+                    'userEnteredFormat': {
+                        'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
+                        'textFormat': {
+                            'foregroundColor': {'red': 1, 'green': 1, 'blue': 1},
+                            'fontSize': 10,
+                            'bold': True
+                        }
+                    }
+                },
+                'fields': 'userEnteredFormat(backgroundColor,textFormat)'
+            }
+        },
+        {
+            'autoResizeDimensions': {
+                'dimensions': {
+                    'sheetId': sheet_id,
+                    'dimension': 'COLUMNS',
+                    'startIndex': 0,
+                    'endIndex': num_cols
+                }
+            }
+        }
+    ]
+
+
+def approval_format_requests(sheet_id: int, column: int) -> List[Dict]:
+    """Green background on approved rows; open-ended so appended rows are covered"""
+    return [{
+        'addConditionalFormatRule': {
+            'rule': {
+                'ranges': [{
+                    'sheetId': sheet_id,
+                    'startRowIndex': 1,
+                    'startColumnIndex': column,
+                    'endColumnIndex': column + 1
+                }],
+                'booleanRule': {
+                    'condition': {
+                        'type': 'TEXT_CONTAINS',
+                        'values': [{'userEnteredValue': '✅'}]
+                    },
+                    'format': {
+                        'backgroundColor': {'red': 0.85, 'green': 1, 'blue': 0.85}
+                    }
+                }
+            },
+            'index': 0
+        }
+    }]
+
+
+def row_format_request(sheet_id: int, start_row: int, end_row: int, num_cols: int) -> Dict:
+    """Top-align and clip the given data rows (0-based, end exclusive)"""
+    return {
+        'repeatCell': {
+            'range': {
+                'sheetId': sheet_id,
+                'startRowIndex': start_row,
+                'endRowIndex': end_row,
+                'startColumnIndex': 0,
+                'endColumnIndex': num_cols
+            },
+            'cell': {
+                'userEnteredFormat': {
+                    'verticalAlignment': 'TOP',
+                    'wrapStrategy': 'CLIP'
+                }
+            },
+            'fields': 'userEnteredFormat(verticalAlignment,wrapStrategy)'
+        }
+    }
+
+
+class RowHashIndex:
+    """SQLite index of pushed rows: row key -> (sheet row number, content digest)"""
+
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_file))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " spreadsheet_id TEXT, tab TEXT, row_key TEXT, row_number INTEGER, digest TEXT,"
+            " PRIMARY KEY (spreadsheet_id, tab, row_key))"
+        )
+        self.conn.commit()
+
+    def entries(self, spreadsheet_id: str, tab: str) -> Dict[str, Tuple[int, str]]:
+        cursor = self.conn.execute(
+            "SELECT row_key, row_number, digest FROM rows WHERE spreadsheet_id = ? AND tab = ?",
+            (spreadsheet_id, tab)
+        )
+        return {key: (row_number, digest) for key, row_number, digest in cursor}
+
+    def record(self, spreadsheet_id: str, tab: str, entries: Iterable[Tuple[str, int, str]]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO rows (spreadsheet_id, tab, row_key, row_number, digest)"
+            " VALUES (?, ?, ?, ?, ?)",
+            [(spreadsheet_id, tab, key, row_number, digest) for key, row_number, digest in entries]
+        )
+        self.conn.commit()
+
+    def clear(self, spreadsheet_id: str, tab: Optional[str] = None):
+        if tab is None:
+            self.conn.execute("DELETE FROM rows WHERE spreadsheet_id = ?", (spreadsheet_id,))
+        else:
+            self.conn.execute("DELETE FROM rows WHERE spreadsheet_id = ? AND tab = ?", (spreadsheet_id, tab))
+        self.conn.commit()
+
+
+class SheetsSyncEngine:
+    """Append rows to spreadsheet tabs using cached sheet IDs and row counts"""
+
+    def __init__(self, sheets_service, spreadsheet_id: str, state_file: Path,
+                 index_file: Optional[Path] = None, service_factory: Optional[Callable] = None):
+        """
+        Args:
+            sheets_service: Sheets client; may be None when service_factory is given
+            spreadsheet_id: Target spreadsheet
+            state_file: JSON file caching sheet IDs and row counts per spreadsheet
+            index_file: Row hash index (defaults to sheets_row_index.db next to state_file)
+            service_factory: Builds the client on the first API call, so cached
+                             state can be read without credentials or network
+        """
+        self._sheets_service = sheets_service
+        self.service_factory = service_factory
+        self.spreadsheet_id = spreadsheet_id
+        self.state_file = Path(state_file)
+        self.state = self._load_state()
+        self.index_file = Path(index_file) if index_file else self.state_file.with_name('sheets_row_index.db')
+        self._row_index = None
+
+    @property
+    def sheets_service(self):
+        if self._sheets_service is None and self.service_factory is not None:
+            self._sheets_service = self.service_factory()
+        return self._sheets_service
+
+    @property
+    def row_index(self) -> RowHashIndex:
+        if self._row_index is None:
+            self._row_index = RowHashIndex(self.index_file)
+        return self._row_index
+
+    def _load_state(self) -> Dict:
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    state = json.load(f)
+                return state.get(self.spreadsheet_id, {})
+            except Exception as e:
+                print(f"   ⚠️  Ignoring unreadable sync state: {e}")
+        return {}
+
+    def _save_state(self):
+        all_state = {}
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    all_state = json.load(f)
+            except Exception:
+                all_state = {}
+        all_state[self.spreadsheet_id] = self.state
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(all_state, f, indent=2)
+        tmp_file.replace(self.state_file)
+
+    def invalidate(self, tab_name: Optional[str] = None):
+        """Drop cached state for one tab (or all tabs)"""
+        if tab_name is None:
+            self.state = {}
+        else:
+            self.state.pop(tab_name, None)
+        self._save_state()
+
+    def tab_state(self, tab_name: str) -> Dict:
+        """
+        Cached sheet ID and row high-water mark for a tab
+
+        On a cache miss this costs one filtered metadata read (plus an
+        addSheet if the tab is missing) and a single-row header check.
+        """
+        tab = self.state.get(tab_name)
+        if tab and tab['rows'] is not None:
+            return tab
+
+        if tab is None:
+            spreadsheet = self.sheets_service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
+            ).execute()
+
+            # Cache every tab's ID while we have the metadata
+            for sheet in spreadsheet.get('sheets', []):
+                properties = sheet['properties']
+                self.state.setdefault(properties['title'], {'sheet_id': properties['sheetId'], 'rows': None})
+
+        if tab_name not in self.state:
+            print(f"   📝 Creating '{tab_name}' tab (first time)...")
+            response = self.sheets_service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': [{'addSheet': {'properties': {'title': tab_name}}}]}
+            ).execute()
+            sheet_id = response['replies'][0]['addSheet']['properties']['sheetId']
+            self.state[tab_name] = {'sheet_id': sheet_id, 'rows': 0}
+        elif self.state[tab_name]['rows'] is None:
+            header = self.sheets_service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{quote_tab(tab_name)}!1:1"
+            ).execute()
+            # Exact count is learned from the next append; only emptiness matters here
+            self.state[tab_name]['rows'] = 1 if header.get('values') else 0
+
+        self._save_state()
+        return self.state[tab_name]
+
+    def cached_rows(self, tab_name: str) -> Optional[int]:
+        """Row high-water mark from the local tab cache (no API call; None if unknown)"""
+        return self.state.get(tab_name, {}).get('rows')
+
+    def append_rows(self, tab_name: str, headers: List[str], rows: List[List],
+                    first_run_requests: Optional[Callable[[int], List[Dict]]] = None,
+                    writer: Optional[SheetsBatchWriter] = None) -> Dict:
+        """
+        Append rows to a tab, writing headers first if the tab is empty
+
+        Args:
+            tab_name: Sheet tab title
+            headers: Header row, written only when the tab has no rows yet
+            rows: Data rows to append
+            first_run_requests: Optional builder for extra formatting requests
+                                (given the sheet ID) sent with the header formatting
+            writer: Queue formatting on this writer instead of sending it now
+
+        Returns:
+            Dictionary with 'first_run', 'rows_written', 'start_row', 'total_rows'
+        """
+        cached = self.state.get(tab_name, {}).get('rows') is not None
+        tab = self.tab_state(tab_name)
+
+        try:
+            first_run, values, response = self._append(tab_name, tab, headers, rows)
+        except Exception as e:
+            if not cached:
+                raise
+            # The tab may have been renamed, cleared or deleted since it was cached
+            print(f"   ⚠️  Cached state for '{tab_name}' looks stale ({e}); refreshing")
+            self.invalidate(tab_name)
+            tab = self.tab_state(tab_name)
+            first_run, values, response = self._append(tab_name, tab, headers, rows)
+
+        if not values:
+            return {'first_run': False, 'rows_written': 0, 'start_row': None, 'total_rows': tab['rows']}
+
+        start_row, end_row = self._parse_updated_range(response, tab['rows'] or 0, len(values))
+
+        # One batchUpdate: header formatting on first run, then the new data rows only
+        sheet_id = tab['sheet_id']
+        requests = []
+        if first_run:
+            requests.extend(header_format_requests(sheet_id, len(headers)))
+            if first_run_requests:
+                requests.extend(first_run_requests(sheet_id))
+        data_start = start_row if not first_run else start_row + 1
+        if data_start <= end_row:
+            requests.append(row_format_request(sheet_id, data_start - 1, end_row, len(headers)))
+
+        if writer is not None:
+            writer.queue_requests(requests)
+        elif requests:
+            writer = SheetsBatchWriter(self.sheets_service, self.spreadsheet_id)
+            writer.queue_requests(requests)
+            self._flush(writer)
+
+        tab['rows'] = end_row
+        self._save_state()
+
+        return {
+            'first_run': first_run,
+            'rows_written': len(rows),
+            'start_row': start_row,
+            'total_rows': end_row
+        }
+
+    def synced_keys(self, tab_name: str) -> Dict[str, Tuple[int, str]]:
+        """Row keys already pushed to a tab, mapped to (row number, digest)"""
+        return self.row_index.entries(self.spreadsheet_id, tab_name)
+
+    def sync_rows(self, tab_name: str, headers: List[str], rows: List[List],
+                  key_columns: Sequence[int], upsert: bool = False,
+                  volatile_columns: Sequence[int] = (),
+                  first_run_requests: Optional[Callable[[int], List[Dict]]] = None,
+                  row_digests: Optional[Sequence[Optional[str]]] = None) -> Dict:
+        """
+        Idempotent sync: append unseen rows, skip (or update in place) pushed ones
+
+        Each row gets a trailing 'Row Key' column hashed from its key columns,
+        so the sheet itself records which rows came from which content.
+
+        Args:
+            tab_name: Sheet tab title
+            headers: Header row (without the Row Key column)
+            rows: Data rows
+            key_columns: Column indexes that identify a row across runs
+            upsert: Rewrite rows whose content changed, by row number
+            volatile_columns: Column indexes ignored when detecting changes
+            first_run_requests: See append_rows
+            row_digests: Precomputed content digests, one per row (None entries
+                         fall back to hashing the row minus volatile_columns)
+
+        Returns:
+            Dictionary with 'first_run', 'rows_written', 'rows_updated',
+            'rows_skipped' and 'total_rows'
+        """
+        headers = list(headers) + [ROW_KEY_HEADER]
+        tab = self.tab_state(tab_name)
+        if not tab['rows']:
+            # Empty or new tab: anything indexed for it is gone
+            self.row_index.clear(self.spreadsheet_id, tab_name)
+
+        synced = self.synced_keys(tab_name)
+        if not synced and tab['rows']:
+            synced = self._rebuild_index(tab_name, len(headers) - 1)
+
+        # Last occurrence wins when a batch repeats a key
+        batch = {}
+        for i, row in enumerate(rows):
+            key = row_key(row[c] for c in key_columns)
+            digest = row_digests[i] if row_digests and row_digests[i] else row_digest(row, volatile_columns)
+            batch[key] = (list(row) + [key], digest)
+
+        new_rows, updates, skipped = [], [], 0
+        for key, (row, digest) in batch.items():
+            if key not in synced:
+                new_rows.append((key, row, digest))
+            elif upsert and synced[key][1] != digest:
+                updates.append((key, row, digest))
+            else:
+                skipped += 1
+
+        # In-place updates and formatting are coalesced into one call each
+        writer = SheetsBatchWriter(self.sheets_service, self.spreadsheet_id)
+        for key, row, _ in updates:
+            writer.queue_values(f"{quote_tab(tab_name)}!A{synced[key][0]}", [row])
+
+        result = self.append_rows(tab_name, headers, [row for _, row, _ in new_rows],
+                                  first_run_requests=first_run_requests, writer=writer)
+        self._flush(writer)
+
+        if updates:
+            self.row_index.record(self.spreadsheet_id, tab_name,
+                                  [(key, synced[key][0], digest) for key, _, digest in updates])
+        if new_rows:
+            first_data_row = result['start_row'] + (1 if result['first_run'] else 0)
+            self.row_index.record(self.spreadsheet_id, tab_name, [
+                (key, first_data_row + offset, digest)
+                for offset, (key, _, digest) in enumerate(new_rows)
+            ])
+
+        return {
+            'first_run': result['first_run'],
+            'rows_written': result['rows_written'],
+            'rows_updated': len(updates),
+            'rows_skipped': skipped,
+            'total_rows': result['total_rows']
+        }
+
+    def _rebuild_index(self, tab_name: str, key_column: int) -> Dict[str, Tuple[int, str]]:
+        """Recover the hash index from the sheet's Row Key column (one column read)"""
+        letter = column_letter(key_column)
+        response = self.sheets_service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{quote_tab(tab_name)}!{letter}2:{letter}"
+        ).execute()
+
+        # Digest is unknown, so upserts rewrite these rows once
+        entries = [
+            (values[0], row_number, '')
+            for row_number, values in enumerate(response.get('values', []), 2)
+            if values and values[0]
+        ]
+        if entries:
+            print(f"   🔁 Rebuilt row index for '{tab_name}' from {len(entries)} keyed rows")
+            self.row_index.record(self.spreadsheet_id, tab_name, entries)
+        return {key: (row_number, digest) for key, row_number, digest in entries}
+
+    @staticmethod
+    def _flush(writer: SheetsBatchWriter):
+        """Flush queued writes; value writes must land, formatting is best effort"""
+        try:
+            writer.flush()
+        except Exception as e:
+            if writer.value_ranges:
+                raise
+            print(f"   ⚠️  Some formatting may have failed: {e}")
+            writer.requests.clear()
+
+    def _append(self, tab_name: str, tab: Dict, headers: List[str], rows: List[List]):
+        """Single values.append of the new rows (with headers if the tab is empty)"""
+        first_run = not tab['rows']
+        values = [headers] + rows if first_run else rows
+        if not values:
+            return first_run, values, {}
+
+        response = self.sheets_service.spreadsheets().values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{quote_tab(tab_name)}!A1",
+            valueInputOption='USER_ENTERED',
+            insertDataOption='INSERT_ROWS',
+            body={'values': values}
+        ).execute()
+        return first_run, values, response
+
+    @staticmethod
+    def _parse_updated_range(response: Dict, known_rows: int, count: int):
+        """1-based (start, end) rows written by values.append"""
+        updated_range = response.get('updates', {}).get('updatedRange', '')
+        match = UPDATED_RANGE_PATTERN.search(updated_range)
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2) or start)
+            return start, end
+        return known_rows + 1, known_rows + count
@@ -6,67 +6,60 @@ Uses existing Google OAuth credentials
 """
 
 import json
-import pickle
-import re
+import sys
 from pathlib import Path
-from googleapiclient.discovery import build
 from datetime import datetime
 
-def remove_emojis(text):
-    """Remove all emojis from text"""
-    if not text:
-        return text
-
-    # Remove emojis using regex
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"
-        "\U0001F300-\U0001F5FF"
-        "\U0001F680-\U0001F6FF"
-        "\U0001F1E0-\U0001F1FF"
-        "\U00002702-\U000027B0"
-        "\U000024C2-\U0001F251"
-        "\U0001F900-\U0001F9FF"
-        "\U0001FA00-\U0001FAFF"
-        "]+",
-        flags=re.UNICODE
-    )
-
-    # Common text emojis to remove
-    text_emojis = ['✅', '❌', '🎯', '📊', '🔥', '💡', '⚡', '🚀', '✨', '📝', '🎉', '🎬', '📡', '📋', '📈', '🔗', '🎨', '🗑️', '⏳', '⚠️']
-
-    text = emoji_pattern.sub('', text)
-    for emoji in text_emojis:
-        text = text.replace(emoji, '')
-
-    # Clean up extra spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sync.outbox import Outbox, OutboxContext, flush, operation_id
+from utils.remove_emojis import sanitize_row
 
 class GoogleSheetsSyncer:
     """Sync content to Google Sheets"""
 
-    def __init__(self):
+    def __init__(self, sheets_service=None, spreadsheet_id=None, outbox=None):
+        """
+        Args:
+            sheets_service: Pre-built Sheets service (e.g. FakeSheetsService);
+                            built from the stored OAuth token on first flush when omitted
+            spreadsheet_id: Target spreadsheet; read from google_sheets_results.json when omitted
+            outbox: Outbox journal for queued writes (defaults to data/outbox.jsonl)
+        """
         self.agents_dir = Path(__file__).parent
         self.token_file = self.agents_dir.parent / 'data' / 'google_token.pickle'
 
-        # Load credentials
-        with open(self.token_file, 'rb') as token:
-            self.creds = pickle.load(token)
-
-        # Initialize services
-        self.sheets_service = build('sheets', 'v4', credentials=self.creds)
-        self.docs_service = build('docs', 'v1', credentials=self.creds)
-
-        # Load Google Sheets results to get spreadsheet ID
-        results_file = self.agents_dir.parent / 'data' / 'google_sheets_results.json'
-        with open(results_file, 'r') as f:
-            results = json.load(f)
-            self.spreadsheet_id = results['spreadsheet_id']
-            self.spreadsheet_url = results['spreadsheet_url']
-
-    def sync_content(self, content_file=None):
-        """Sync content from final_content_output.json to Google Sheets - Single Content tab"""
+        if spreadsheet_id is None:
+            # Load Google Sheets results to get spreadsheet ID
+            results_file = self.agents_dir.parent / 'data' / 'google_sheets_results.json'
+            with open(results_file, 'r') as f:
+                results = json.load(f)
+                spreadsheet_id = results['spreadsheet_id']
+                self.spreadsheet_url = results['spreadsheet_url']
+        else:
+            self.spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
+        self.spreadsheet_id = spreadsheet_id
+
+        # Writes are journaled first, then flushed; unreachable APIs leave them queued.
+        # Shared, rate-limited clients are built on the first flush that needs them,
+        # so an offline run still journals its writes.
+        self.outbox = outbox or Outbox()
+        self.outbox_context = OutboxContext(
+            token_file=self.token_file,
+            sheets=sheets_service,
+            state_file=self.agents_dir.parent / 'data' / 'sheets_sync_state.json'
+        )
+
+        # Sheet IDs and row counts are cached locally between runs
+        self.sync_engine = self.outbox_context.engine(self.spreadsheet_id)
+
+    def sync_content(self, content_file=None, upsert=False):
+        """
+        Sync content from final_content_output.json to Google Sheets - Single Content tab
+
+        Args:
+            content_file: Content JSON (defaults to generators/final_content_output.json)
+            upsert: Update previously synced rows whose content changed, instead of skipping them
+        """
 
         print("\n" + "="*100)
         print("📊 SYNCING CONTENT TO GOOGLE SHEETS")
@@ -92,16 +85,6 @@ class GoogleSheetsSyncer:
         tab_name = "Content"
         today = datetime.now().strftime('%Y-%m-%d')
 
-        # Check if Content tab exists
-        sheet_exists = self._check_sheet_exists(tab_name)
-
-        if not sheet_exists:
-            print(f"\n📝 Creating 'Content' tab (first time)...")
-            try:
-                self._create_sheet_tab(tab_name)
-            except Exception as e:
-                print(f"   ⚠️  Could not create tab: {e}")
-
         # Prepare rows for sheet
         print(f"\n🔄 Preparing {len(content_pieces)} rows for {today}...")
 
@@ -125,47 +108,46 @@ class GoogleSheetsSyncer:
             'Status'
         ]
 
-        # Get existing row count to append
-        existing_data = self._get_existing_data(tab_name)
+        rows = [self._format_row(piece, today) for piece in content_pieces]
 
-        if not existing_data or len(existing_data) == 0:
-            # First time - add headers
-            rows = [headers]
-            print(f"   ✅ First run - adding headers")
-        else:
-            # Append mode - no headers
-            rows = []
-            print(f"   ✅ Appending to existing {len(existing_data)-1} rows")
-
-        for piece in content_pieces:
-            row = self._format_row(piece, today)
-            rows.append(row)
-
-        # Write to sheet
+        # Journal the write, then flush: one append plus one batchUpdate formatting only the new rows.
+        # Rows are keyed on date + title + trend URL, so re-runs skip pushed pieces.
         print(f"\n📤 Writing to Google Sheets...")
-
-        if not existing_data or len(existing_data) == 0:
-            # First time - write from A1
-            range_name = f"{tab_name}!A1"
+        payload = {
+            'spreadsheet_id': self.spreadsheet_id,
+            'tab': tab_name,
+            'headers': headers,
+            'rows': rows,
+            'key_columns': [0, 1, 4],
+            'upsert': upsert,
+            'approval_column': 13
+        }
+        already_synced = (self.outbox.get(operation_id('sheets.sync_rows', payload)) or {}).get('status') == 'done'
+        op_id = self.outbox.enqueue('sheets.sync_rows', payload)
+        flush(self.outbox, self.outbox_context)
+
+        op = self.outbox.get(op_id) or {'status': 'done'}  # compacted: completed long ago
+        queued = op['status'] == 'pending'
+        if already_synced:
+            # An identical earlier run already pushed every row; report them as skipped
+            result = {'rows_skipped': len(rows), 'total_rows': self.sync_engine.cached_rows(tab_name)}
         else:
-            # Append - start after existing data
-            next_row = len(existing_data) + 1
-            range_name = f"{tab_name}!A{next_row}"
-
-        self.sheets_service.spreadsheets().values().update(
-            spreadsheetId=self.spreadsheet_id,
-            range=range_name,
-            valueInputOption='USER_ENTERED',
-            body={'values': rows}
-        ).execute()
-
-        total_rows = (len(existing_data) if existing_data else 0) + len(rows)
-        print(f"   ✅ Wrote {len(rows)} new rows (total: {total_rows} rows)")
-
-        # Format the sheet (only on first run or when needed)
-        if not existing_data or len(existing_data) == 0:
-            print(f"\n🎨 Formatting sheet...")
-            self._format_sheet(tab_name, total_rows, len(headers))
+            result = op.get('result') or {}
+        rows_written = result.get('rows_written', 0)
+        total_rows = result.get('total_rows')
+
+        if queued:
+            print(f"   📮 Queued {len(rows)} rows in the outbox; run 'python sync/outbox.py flush' when online")
+        elif op['status'] == 'dead':
+            print(f"   ❌ Sheets write failed permanently: {op.get('error')}")
+        else:
+            if result.get('first_run'):
+                print(f"   ✅ First run - added headers and formatted sheet")
+            print(f"   ✅ Wrote {rows_written} new rows (total: {total_rows} rows)")
+            if result.get('rows_updated'):
+                print(f"   ✅ Updated {result['rows_updated']} changed rows in place")
+            if result.get('rows_skipped'):
+                print(f"   ⏭️  Skipped {result['rows_skipped']} rows already in the sheet")
 
         # Print summary
         print("\n" + "="*100)
@@ -177,8 +159,11 @@ class GoogleSheetsSyncer:
 
         print(f"\n📝 Tab: {tab_name}")
         print(f"   Date: {today}")
-        print(f"   New rows added: {len(rows)}")
-        print(f"   Total rows: {total_rows}")
+        if queued:
+            print(f"   Rows queued: {len(rows)}")
+        else:
+            print(f"   New rows added: {rows_written}")
+            print(f"   Total rows: {total_rows}")
 
         print(f"\n🎯 Content Status:")
         auto_approved = sum(1 for p in content_pieces if p.get('auto_approved'))
@@ -189,53 +174,14 @@ class GoogleSheetsSyncer:
             'spreadsheet_url': self.spreadsheet_url,
             'tab_name': tab_name,
             'date': today,
-            'rows_written': len(rows),
+            'rows_written': rows_written,
+            'rows_updated': result.get('rows_updated', 0),
+            'rows_skipped': result.get('rows_skipped', 0),
+            'rows_queued': len(rows) if queued else 0,
             'total_rows': total_rows,
             'auto_approved': auto_approved
         }
 
-    def _create_sheet_tab(self, tab_name):
-        """Create a new sheet tab"""
-
-        request = {
-            'addSheet': {
-                'properties': {
-                    'title': tab_name
-                }
-            }
-        }
-
-        self.sheets_service.spreadsheets().batchUpdate(
-            spreadsheetId=self.spreadsheet_id,
-            body={'requests': [request]}
-        ).execute()
-
-    def _check_sheet_exists(self, tab_name):
-        """Check if a sheet tab exists"""
-        try:
-            spreadsheet = self.sheets_service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
-            ).execute()
-
-            for sheet in spreadsheet.get('sheets', []):
-                if sheet['properties']['title'] == tab_name:
-                    return True
-            return False
-        except Exception as e:
-            print(f"   ⚠️  Error checking sheet: {e}")
-            return False
-
-    def _get_existing_data(self, tab_name):
-        """Get existing data from sheet"""
-        try:
-            result = self.sheets_service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{tab_name}!A:Z"
-            ).execute()
-            return result.get('values', [])
-        except Exception as e:
-            return []
-
     def _format_row(self, piece, date):
         """Format a content piece into a sheet row"""
 
@@ -262,127 +208,26 @@ class GoogleSheetsSyncer:
                 ex = examples[0]
                 personal_text = f"{personal['title']}\n\nExample: {ex['title']}\n{ex['description']}"
 
-        return [
+        # Every text cell gets the same emoji/whitespace cleanup
+        return sanitize_row([
             date,  # Date column first
-            remove_emojis(trend.get('title', '')),
+            trend.get('title', ''),
             'Daily',  # Content Type
-            remove_emojis(trend.get('source', '')),
-            remove_emojis(trend.get('url', '')),
-            remove_emojis(personal_text),
-            remove_emojis(hook1),
-            remove_emojis(hook2),
-            remove_emojis(stat1),
-            remove_emojis(stat2),
-            remove_emojis(stat3),
-            remove_emojis(piece.get('framework', '')),
-            remove_emojis(', '.join(piece.get('platforms', []))),
-            remove_emojis(piece.get('fusion_strength', '')),
+            trend.get('source', ''),
+            trend.get('url', ''),
+            personal_text,
+            hook1,
+            hook2,
+            stat1,
+            stat2,
+            stat3,
+            piece.get('framework', ''),
+            ', '.join(piece.get('platforms', [])),
+            piece.get('fusion_strength', ''),
             f"{score.get('total', 0)}/100",
             'YES' if piece.get('auto_approved') else 'NO',
             'Ready' if piece.get('auto_approved') else 'Review'
-        ]
-
-    def _format_sheet(self, tab_name, num_rows, num_cols):
-        """Format the sheet for better readability"""
-
-        # Get sheet ID
-        spreadsheet = self.sheets_service.spreadsheets().get(
-            spreadsheetId=self.spreadsheet_id
-        ).execute()
-
-        sheet_id = None
-        for sheet in spreadsheet.get('sheets', []):
-            if sheet['properties']['title'] == tab_name:
-                sheet_id = sheet['properties']['sheetId']
-                break
-
-        if sheet_id is None:
-            print("   ⚠️  Could not find sheet ID for formatting")
-            return
-
-        requests = []
-
-        # 1. Freeze header row
-        requests.append({
-            'updateSheetProperties': {
-                'properties': {
-                    'sheetId': sheet_id,
-                    'gridProperties': {
-                        'frozenRowCount': 1
-                    }
-                },
-                'fields': 'gridProperties.frozenRowCount'
-            }
-        })
-
-        # 2. Bold header row
-        requests.append({
-            'repeatCell': {
-                'range': {
-                    'sheetId': sheet_id,
-                    'startRowIndex': 0,
-                    'endRowIndex': 1
-                },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                        'textFormat': {
-                            'foregroundColor': {'red': 1, 'green': 1, 'blue': 1},
-                            'fontSize': 10,
-                            'bold': True
-                        }
-                    }
-                },
-                'fields': 'userEnteredFormat(backgroundColor,textFormat)'
-            }
-        })
-
-        # 3. Auto-resize columns
-        requests.append({
-            'autoResizeDimensions': {
-                'dimensions': {
-                    'sheetId': sheet_id,
-                    'dimension': 'COLUMNS',
-                    'startIndex': 0,
-                    'endIndex': num_cols
-                }
-            }
-        })
-
-        # 4. Color-code by approval status
-        # Green for auto-approved (column M = index 13)
-        requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
-                        'sheetId': sheet_id,
-                        'startRowIndex': 1,
-                        'endRowIndex': num_rows,
-                        'startColumnIndex': 13,
-                        'endColumnIndex': 14
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'TEXT_CONTAINS',
-                            'values': [{'userEnteredValue': '✅'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 0.85, 'green': 1, 'blue': 0.85}
-                        }
-                    }
-                },
-                'index': 0
-            }
-        })
-
-        try:
-            self.sheets_service.spreadsheets().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body={'requests': requests}
-            ).execute()
-            print("   ✅ Sheet formatted successfully")
-        except Exception as e:
-            print(f"   ⚠️  Some formatting may have failed: {e}")
+        ])
 
 
 def main():
@@ -390,11 +235,15 @@ def main():
 
     syncer = GoogleSheetsSyncer()
 
+    args = sys.argv[1:]
+    upsert = '--upsert' in args
+    args = [a for a in args if a != '--upsert']
+
     content_file = None
-    if len(sys.argv) > 1:
-        content_file = Path(sys.argv[1])
+    if args:
+        content_file = Path(args[0])
 
-    result = syncer.sync_content(content_file)
+    result = syncer.sync_content(content_file, upsert=upsert)
 
     print("\n" + "="*100)
     print("🎉 READY TO POST!")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only Sheets sync engine, run against FakeSheetsService
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from sync.fake_google_services import FakeSheetsService
+from sync.sheets_sync_engine import SheetsSyncEngine
+
+HEADERS = ['Date', 'Title', 'Body']
+KEY_COLUMNS = [0, 1]
+
+
+def _engine(tmp_path, service):
+    return SheetsSyncEngine(service, 'sheet1', tmp_path / 'sheets_sync_state.json')
+
+
+def _rows(*titles, body='text'):
+    return [['2025-01-01', title, f"{title} {body}"] for title in titles]
+
+
+def _data_range_formats(service):
+    """(start, end) row indexes of the repeatCell requests formatting data rows"""
+    return [
+        (r['repeatCell']['range']['startRowIndex'], r['repeatCell']['range']['endRowIndex'])
+        for r in service.formatting
+        if 'repeatCell' in r and r['repeatCell']['range'].get('startRowIndex', 0) > 0
+    ]
+
+
+def test_append_rows_uses_cached_tab_state(tmp_path):
+    service = FakeSheetsService()
+    service.add_tab('Content')
+    engine = _engine(tmp_path, service)
+
+    first = engine.append_rows('Content', HEADERS, _rows('a', 'b'))
+    assert first == {'first_run': True, 'rows_written': 2, 'start_row': 1, 'total_rows': 3}
+
+    # A later process reuses the cached sheet ID and high-water mark
+    service.calls.clear()
+    service.formatting.clear()
+    second = _engine(tmp_path, service).append_rows('Content', HEADERS, _rows('c'))
+
+    assert second == {'first_run': False, 'rows_written': 1, 'start_row': 4, 'total_rows': 4}
+    assert service.call_count() == 2
+    assert service.call_count('values.append') == 1
+    assert service.call_count('spreadsheets.batchUpdate') == 1
+    # Only the new row is formatted
+    assert _data_range_formats(service) == [(3, 4)]
+
+
+def test_sync_rows_one_append_and_one_batch_update_per_run(tmp_path):
+    service = FakeSheetsService()
+    engine = _engine(tmp_path, service)
+    engine.sync_rows('Content', HEADERS, _rows('a', 'b'), key_columns=KEY_COLUMNS)
+
+    service.calls.clear()
+    service.formatting.clear()
+    result = engine.sync_rows('Content', HEADERS, _rows('a', 'b', 'c'), key_columns=KEY_COLUMNS)
+
+    assert result['rows_written'] == 1
+    assert result['rows_skipped'] == 2
+    assert result['total_rows'] == 4
+    assert service.call_count('values.append') == 1
+    assert service.call_count('spreadsheets.batchUpdate') == 1
+    assert _data_range_formats(service) == [(3, 4)]
+    assert [row[1] for row in service.tabs['Content']['rows'][1:]] == ['a', 'b', 'c']
+
+
+def test_sync_rows_repeat_run_skips_every_row(tmp_path):
+    service = FakeSheetsService()
+    engine = _engine(tmp_path, service)
+    engine.sync_rows('Content', HEADERS, _rows('a', 'b'), key_columns=KEY_COLUMNS)
+
+    service.calls.clear()
+    result = engine.sync_rows('Content', HEADERS, _rows('a', 'b'), key_columns=KEY_COLUMNS)
+
+    assert result == {'first_run': False, 'rows_written': 0, 'rows_updated': 0,
+                      'rows_skipped': 2, 'total_rows': 3}
+    assert service.calls == []
+    assert len(service.tabs['Content']['rows']) == 3
+
+
+def test_sync_rows_upsert_rewrites_only_the_changed_row(tmp_path):
+    service = FakeSheetsService()
+    engine = _engine(tmp_path, service)
+    engine.sync_rows('Content', HEADERS, _rows('a', 'b', 'c'), key_columns=KEY_COLUMNS)
+
+    service.calls.clear()
+    rows = _rows('a', 'b', 'c')
+    rows[1][2] = 'b rewritten'
+    result = engine.sync_rows('Content', HEADERS, rows, key_columns=KEY_COLUMNS, upsert=True)
+
+    assert result['rows_updated'] == 1
+    assert result['rows_skipped'] == 2
+    assert result['rows_written'] == 0
+    assert [name for name, _ in service.calls] == ['values.batchUpdate']
+    (update,) = service.calls[0][1]['body']['data']
+    assert update['range'] == "'Content'!A3"
+    sheet_rows = service.tabs['Content']['rows']
+    assert [row[2] for row in sheet_rows[1:]] == ['a text', 'b rewritten', 'c text']
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+JSON Snapshot Cache - Binary snapshots of parsed JSON files
+Large framework files are parsed once and stored as pickles keyed on the
+source file's mtime and size. Later processes load the snapshot instead of
+re-parsing the JSON; a changed source invalidates its snapshot automatically.
+"""
+
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("json_snapshot")
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIRNAME = Path(".cache") / "snapshots"
+
+
+def snapshot_path(source: Path, cache_dir: Optional[Path] = None) -> Path:
+    """Location of the snapshot for a source file"""
+    source = Path(source)
+    cache_dir = Path(cache_dir) if cache_dir else source.parent / SNAPSHOT_DIRNAME
+    return cache_dir / f"{source.name}.pickle"
+
+
+def _source_key(source: Path, normalizer: Optional[Callable]) -> tuple:
+    stat = source.stat()
+    normalizer_name = getattr(normalizer, "__qualname__", None)
+    return (SNAPSHOT_VERSION, stat.st_mtime_ns, stat.st_size, normalizer_name)
+
+
+def load_json(source: Path,
+              normalizer: Optional[Callable[[Any], Any]] = None,
+              cache_dir: Optional[Path] = None) -> Any:
+    """
+    Load a JSON file through its binary snapshot
+
+    Args:
+        source: JSON file to load
+        normalizer: Optional function applied to the parsed data before it is
+                    snapshotted, so normalization is also paid only once
+        cache_dir: Snapshot directory (defaults to <source dir>/.cache/snapshots)
+
+    Returns:
+        Parsed (and normalized) data
+    """
+    source = Path(source)
+    key = _source_key(source, normalizer)
+    snapshot = snapshot_path(source, cache_dir)
+
+    if snapshot.exists():
+        try:
+            with open(snapshot, 'rb') as f:
+                # The key is pickled separately so stale snapshots are
+                # rejected without unpickling the data
+                if pickle.load(f) == key:
+                    return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot {snapshot}: {e}")
+
+    with open(source, 'r') as f:
+        data = json.load(f)
+    if normalizer:
+        data = normalizer(data)
+
+    _write_snapshot(snapshot, key, data)
+    return data
+
+
+def _write_snapshot(snapshot: Path, key: tuple, data: Any):
+    try:
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot.with_name(f"{snapshot.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(snapshot)
+    except OSError as e:
+        logger.warning(f"Could not write snapshot {snapshot}: {e}")